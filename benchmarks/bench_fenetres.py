@@ -0,0 +1,104 @@
+"""
+Benchmark des backends fenetres Linux: Xlib/EWMH natif vs wmctrl.
+
+Lance un Xvfb local (optionnel), cree N fenetres et publie une
+_NET_CLIENT_LIST minimale sur la racine (pas besoin de gestionnaire de
+fenetres), puis mesure list_windows() sur chaque backend.
+
+Usage:
+    python benchmarks/bench_fenetres.py --xvfb --fenetres 200 --iterations 50
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+
+def _start_xvfb(display_num):
+    """Demarre Xvfb sur :display_num et attend qu'il accepte les connexions."""
+    if not shutil.which("Xvfb"):
+        sys.exit("Xvfb introuvable. Installez avec: sudo apt install xvfb")
+    proc = subprocess.Popen(
+        ["Xvfb", f":{display_num}", "-screen", "0", "1920x1080x24", "-nolisten", "tcp"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    os.environ["DISPLAY"] = f":{display_num}"
+    from Xlib import display, error
+    for _ in range(50):
+        try:
+            display.Display().close()
+            return proc
+        except error.DisplayError:
+            time.sleep(0.1)
+    proc.kill()
+    sys.exit("Xvfb n'a pas demarre")
+
+
+def _create_windows(count):
+    """Cree `count` fenetres titrees et publie _NET_CLIENT_LIST sur la racine."""
+    from Xlib import X, Xatom, display
+
+    d = display.Display()
+    root = d.screen().root
+    utf8 = d.intern_atom("UTF8_STRING")
+    windows = []
+    for i in range(count):
+        win = root.create_window(
+            10 + i % 50, 10 + i % 40, 200, 100, 0,
+            d.screen().root_depth, X.InputOutput, X.CopyFromParent,
+        )
+        win.set_wm_name(f"Fenetre {i}")
+        win.change_property(d.intern_atom("_NET_WM_NAME"), utf8, 8, f"Fenetre {i}".encode())
+        win.change_property(d.intern_atom("_NET_WM_PID"), Xatom.CARDINAL, 32, [os.getpid()])
+        win.set_wm_class("bench", "Bench")
+        win.map()
+        windows.append(win.id)
+    root.change_property(d.intern_atom("_NET_CLIENT_LIST"), Xatom.WINDOW, 32, windows)
+    d.sync()
+    return d
+
+
+def _measure(fn, iterations):
+    """Retourne la duree moyenne d'un appel en millisecondes."""
+    fn()  # chauffe (connexion, atomes)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) * 1000 / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--xvfb", action="store_true", help="demarrer un Xvfb dedie")
+    parser.add_argument("--display", type=int, default=99, help="numero d'ecran Xvfb")
+    parser.add_argument("--fenetres", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    xvfb = _start_xvfb(args.display) if args.xvfb else None
+    try:
+        keep_alive = _create_windows(args.fenetres)
+        from mon_mcp import _platform_linux as backend
+
+        count = len(backend._xlib_list_windows())
+        print(f"{count} fenetres visibles via Xlib, {args.iterations} iterations")
+        xlib_ms = _measure(backend._xlib_list_windows, args.iterations)
+        print(f"  xlib   : {xlib_ms:8.2f} ms/appel")
+        if shutil.which("wmctrl"):
+            wmctrl_ms = _measure(backend._wmctrl_list_windows, args.iterations)
+            print(f"  wmctrl : {wmctrl_ms:8.2f} ms/appel  (x{wmctrl_ms / xlib_ms:.1f})")
+        else:
+            print("  wmctrl : non installe, comparaison ignoree")
+        keep_alive.close()
+    finally:
+        if xvfb:
+            xvfb.terminate()
+            xvfb.wait()
+
+
+if __name__ == "__main__":
+    main()
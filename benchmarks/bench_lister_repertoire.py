@@ -0,0 +1,83 @@
+"""
+Benchmark de lister_repertoire sur un repertoire genere (100k entrees par defaut).
+
+Compare l'ancienne implementation (iterdir + is_dir/stat/is_file par entree,
+JSON indente, sans pagination) a la version scandir paginee.
+
+Usage:
+    python benchmarks/bench_lister_repertoire.py --entrees 100000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from mon_mcp.tools.fichiers import _format_size, lister_repertoire
+
+
+def _ancienne_implementation(chemin):
+    """Reproduction de lister_repertoire avant le passage a scandir."""
+    path = Path(chemin)
+    entries = []
+    for entry in sorted(path.iterdir(), key=lambda e: (not e.is_dir(), e.name.lower())):
+        stat = entry.stat()
+        entries.append({
+            "nom": entry.name,
+            "type": "dossier" if entry.is_dir() else "fichier",
+            "taille": _format_size(stat.st_size) if entry.is_file() else "-",
+            "modifie": datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S"),
+        })
+    return json.dumps({
+        "repertoire": str(path.resolve()),
+        "nombre_elements": len(entries),
+        "contenu": entries,
+    }, ensure_ascii=False, indent=2)
+
+
+def _generer(dossier, nombre):
+    """Cree `nombre` entrees (1 dossier pour 20 fichiers)."""
+    for i in range(nombre):
+        if i % 20 == 0:
+            os.mkdir(os.path.join(dossier, f"dossier_{i:07d}"))
+        else:
+            with open(os.path.join(dossier, f"fichier_{i:07d}.txt"), "wb") as f:
+                f.write(b"x" * (i % 512))
+
+
+def _mesurer(label, fn, iterations):
+    fn()  # chauffe (cache dentries)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        out = fn()
+    ms = (time.perf_counter() - start) * 1000 / iterations
+    print(f"  {label:<34} {ms:9.1f} ms  ({len(out) / 1024:8.0f} Ko de sortie)")
+    return ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--entrees", type=int, default=100_000)
+    parser.add_argument("--iterations", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as dossier:
+        print(f"Generation de {args.entrees} entrees dans {dossier}...")
+        _generer(dossier, args.entrees)
+
+        ancien = _mesurer("ancienne (iterdir, tout)", lambda: _ancienne_implementation(dossier),
+                          args.iterations)
+        _mesurer("scandir, tout (limite=0)", lambda: lister_repertoire(dossier, limite=0),
+                 args.iterations)
+        page = _mesurer("scandir, premiere page (1000)", lambda: lister_repertoire(dossier),
+                        args.iterations)
+        _mesurer("scandir, tri par taille, page", lambda: lister_repertoire(dossier, tri="taille"),
+                 args.iterations)
+        print(f"Gain premiere page: x{ancien / page:.1f}")
+
+
+if __name__ == "__main__":
+    main()
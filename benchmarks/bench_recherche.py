@@ -0,0 +1,281 @@
+"""
+Benchmark de rechercher_fichiers sur un corpus genere et reproductible.
+
+Le corpus (graine fixe) melange petits et gros fichiers texte, du bruit
+binaire, des documents profondement imbriques et un dossier node_modules.
+Deux termes y sont places: un rare (~0,1 % des fichiers) et un frequent
+(~10 %). Mesures: recherche par nom (avec et sans tri), par contenu sans
+index pour plusieurs niveaux de parallelisme, construction de l'index de
+contenu puis recherche avec index. Debits en fichiers/s et Mo/s.
+
+Usage:
+    python benchmarks/bench_recherche.py --fichiers 10000
+    python benchmarks/bench_recherche.py --fichiers 1000000 --taille-max 16000 --dossier /tmp/corpus
+    python benchmarks/bench_recherche.py --sortie avant.json
+    sudo python benchmarks/bench_recherche.py --cache-froid   # Linux: vide le cache disque
+    python benchmarks/bench_recherche.py --reference avant.json   # code 1 si regression
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+from mon_mcp import config
+from mon_mcp.tools import index_recherche
+from mon_mcp.tools.recherche import MAX_SEARCH_SIZE, rechercher_fichiers
+
+TERME_RARE = "aiguille_introuvable"
+TERME_FREQUENT = "budget_previsionnel"
+
+MOTS = (
+    "rapport projet client facture reunion compte rendu analyse donnees serveur fichier "
+    "recherche index tableau synthese annexe contrat livraison planning equipe version "
+    "import export module fonction classe test resultat erreur journal sauvegarde"
+).split()
+
+# Repartition des tailles: (proportion, taille min, taille max) en octets
+# (~12 Ko en moyenne: ~120 Mo pour 10k fichiers, ~12 Go pour 1M sans --taille-max)
+TAILLES = [(0.85, 100, 4_000), (0.14, 4_000, 64_000), (0.01, 64_000, 1_000_000)]
+
+PROPORTION_BINAIRE = 0.05
+
+
+def _taille(rng: random.Random, taille_max: int) -> int:
+    tirage = rng.random()
+    for proportion, bas, haut in TAILLES:
+        if tirage < proportion:
+            return min(taille_max, rng.randint(bas, haut))
+        tirage -= proportion
+    return min(taille_max, TAILLES[-1][2])
+
+
+def _generer(dossier: str, nombre: int, profondeur: int, graine: int, taille_max: int) -> dict:
+    """Cree le corpus et retourne son manifeste (parametres, volume)."""
+    rng = random.Random(graine)
+    texte = " ".join(rng.choice(MOTS) + ("\n" if rng.random() < 0.1 else "")
+                     for _ in range(400_000)).encode()
+    bruit = rng.randbytes(4 * 1024 * 1024)
+
+    # Arborescence: dossiers a profondeur variable, ~50 fichiers par dossier
+    dossiers = []
+    for i in range(max(1, nombre // 50)):
+        niveaux = [f"{rng.choice(MOTS)}_{rng.randint(0, 99)}"
+                   for _ in range(rng.randint(1, profondeur))]
+        dossiers.append(os.path.join(dossier, *niveaux))
+    dossiers.append(os.path.join(dossier, "node_modules", "paquet"))
+    for d in set(dossiers):
+        os.makedirs(d, exist_ok=True)
+
+    octets = 0
+    octets_texte = 0
+    for i in range(nombre):
+        cible = dossiers[i % len(dossiers)]
+        taille = _taille(rng, taille_max)
+        if rng.random() < PROPORTION_BINAIRE:
+            debut = rng.randrange(len(bruit) - min(taille, len(bruit) - 1))
+            contenu = b"\x00" + bruit[debut:debut + taille]
+            nom = f"{rng.choice(MOTS)}_{i:07d}.bin"
+        else:
+            debut = rng.randrange(len(texte) - taille) if taille < len(texte) else 0
+            contenu = texte[debut:debut + taille]
+            if i % 1000 == 7:
+                contenu += f"\n{TERME_RARE}\n".encode()
+            if i % 10 == 3:
+                contenu = f"{TERME_FREQUENT}\n".encode() + contenu
+            nom = f"{rng.choice(MOTS)}_{rng.choice(MOTS)}_{i:07d}.txt"
+            if len(contenu) <= MAX_SEARCH_SIZE:
+                octets_texte += len(contenu)
+        with open(os.path.join(cible, nom), "wb") as f:
+            f.write(contenu)
+        octets += len(contenu)
+
+    return {"fichiers": nombre, "profondeur": profondeur, "graine": graine,
+            "taille_max": taille_max, "octets": octets, "octets_texte": octets_texte}
+
+
+def _corpus(dossier: str, nombre: int, profondeur: int, graine: int, taille_max: int) -> dict:
+    """Reutilise le corpus du dossier s'il a ete genere avec les memes parametres."""
+    manifeste_path = os.path.join(dossier, ".corpus.json")
+    parametres = {"fichiers": nombre, "profondeur": profondeur, "graine": graine,
+                  "taille_max": taille_max}
+    try:
+        with open(manifeste_path, encoding="utf-8") as f:
+            manifeste = json.load(f)
+        if all(manifeste.get(k) == v for k, v in parametres.items()):
+            print(f"Corpus existant reutilise: {dossier}")
+            return manifeste
+    except (OSError, ValueError, KeyError):
+        pass
+    if os.path.isdir(dossier):
+        shutil.rmtree(dossier)
+    os.makedirs(dossier)
+    print(f"Generation de {nombre} fichiers dans {dossier} (graine {graine})...")
+    start = time.perf_counter()
+    manifeste = _generer(dossier, nombre, profondeur, graine, taille_max)
+    print(f"  {time.perf_counter() - start:.1f} s, {manifeste['octets'] / 1024 ** 2:.0f} Mo")
+    with open(manifeste_path, "w", encoding="utf-8") as f:
+        json.dump(manifeste, f)
+    return manifeste
+
+
+def _vider_cache() -> None:
+    """Vide le cache disque du noyau (Linux, root) pour mesurer des lectures a froid."""
+    os.sync()
+    with open("/proc/sys/vm/drop_caches", "w") as f:
+        f.write("3\n")
+
+
+def _mesurer(label: str, fn, iterations: int, fichiers: int, octets: int = 0,
+             preparer=None) -> dict:
+    """
+    Duree mediane apres une execution de chauffe, avec les debits.
+    iterations=0: une seule execution mesuree, sans chauffe (ex: construction d'index).
+    preparer: appele avant chaque execution mesuree, hors chronometre (ex: _vider_cache).
+    """
+    durees = []
+    if iterations > 0 and preparer is None:
+        fn()
+    for _ in range(max(1, iterations)):
+        if preparer is not None:
+            preparer()
+        start = time.perf_counter()
+        sortie = fn()
+        durees.append(time.perf_counter() - start)
+    duree = statistics.median(durees)
+    mesure = {"duree_ms": round(duree * 1000, 1), "fichiers_s": round(fichiers / duree)}
+    ligne = f"  {label:<40} {duree * 1000:9.1f} ms  {fichiers / duree:10.0f} fichiers/s"
+    if octets:
+        mesure["mo_s"] = round(octets / 1024 ** 2 / duree, 1)
+        ligne += f"  {mesure['mo_s']:8.1f} Mo/s"
+    try:
+        resultats = json.loads(sortie).get("nombre_resultats")
+    except (TypeError, ValueError, AttributeError):
+        resultats = None
+    if resultats is not None:
+        ligne += f"  ({resultats} resultats)"
+    print(ligne)
+    return mesure
+
+
+def _executer(dossier: str, manifeste: dict, iterations: int, threads: list[int],
+              cache_froid: bool = False) -> dict:
+    n = manifeste["fichiers"]
+    octets = manifeste["octets_texte"]
+    mesures = {}
+
+    def chercher(**options):
+        options.setdefault("max_resultats", 10 ** 9)
+        return lambda: rechercher_fichiers(dossier, **options)
+
+    print("Par nom:")
+    mesures["nom"] = _mesurer("motif *rapport*", chercher(motif="*rapport*"), iterations, n)
+    mesures["nom_tri"] = _mesurer("tous, 50 plus gros (tas)",
+                                  chercher(tri="plus_gros", max_resultats=50), iterations, n)
+
+    print("Par contenu, sans index:")
+    for t in threads:
+        mesures[f"contenu_rare_t{t}"] = _mesurer(
+            f"terme rare, {t} thread(s)",
+            chercher(contenu=TERME_RARE, utiliser_index=False, threads=t), iterations, n, octets)
+    if cache_froid:
+        # Le parallelisme recouvre surtout les lectures disque: visible a froid
+        for t in threads:
+            mesures[f"contenu_rare_froid_t{t}"] = _mesurer(
+                f"terme rare, cache froid, {t} thread(s)",
+                chercher(contenu=TERME_RARE, utiliser_index=False, threads=t),
+                iterations, n, octets, preparer=_vider_cache)
+    t = threads[-1]
+    mesures["contenu_frequent"] = _mesurer(
+        f"terme frequent, {t} thread(s)",
+        chercher(contenu=TERME_FREQUENT, utiliser_index=False, threads=t), iterations, n, octets)
+    mesures["contenu_premiers"] = _mesurer(
+        "terme frequent, 10 premiers",
+        chercher(contenu=TERME_FREQUENT, utiliser_index=False, threads=t, max_resultats=10),
+        iterations, n)
+
+    print("Avec index de contenu:")
+    mesures["index_construction"] = _mesurer(
+        "construction", lambda: index_recherche.indexer_dossier(dossier, reconstruire=True),
+        0, n, octets)
+    mesures["index_mise_a_jour"] = _mesurer(
+        "mise a jour sans changement", lambda: index_recherche.indexer_dossier(dossier), 1, n)
+    mesures["index_rare"] = _mesurer("terme rare", chercher(contenu=TERME_RARE, threads=t),
+                                     iterations, n)
+    mesures["index_frequent"] = _mesurer("terme frequent",
+                                         chercher(contenu=TERME_FREQUENT, threads=t), iterations, n)
+    return mesures
+
+
+def _comparer(mesures: dict, reference: dict, tolerance: float) -> list[str]:
+    """Mesures plus lentes que la reference au-dela de la tolerance."""
+    regressions = []
+    for nom, mesure in mesures.items():
+        avant = reference.get(nom)
+        if not avant or not avant.get("duree_ms"):
+            continue
+        ratio = mesure["duree_ms"] / avant["duree_ms"]
+        if ratio > 1 + tolerance:
+            regressions.append(
+                f"{nom}: {avant['duree_ms']} ms -> {mesure['duree_ms']} ms (x{ratio:.2f})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--fichiers", type=int, default=10_000)
+    parser.add_argument("--profondeur", type=int, default=8, help="profondeur max des dossiers")
+    parser.add_argument("--graine", type=int, default=42)
+    parser.add_argument("--taille-max", type=int, default=1_000_000,
+                        help="taille max d'un fichier en octets (ex: 16000 pour 1M fichiers)")
+    parser.add_argument("--dossier",
+                        help="dossier du corpus, conserve et reutilise (defaut: temporaire)")
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--threads", default="1,4,16", help="parallelismes mesures (ex: 1,4,16)")
+    parser.add_argument("--sortie", help="ecrit les mesures dans ce fichier JSON")
+    parser.add_argument("--reference", help="fichier JSON d'une execution precedente a comparer")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="ralentissement accepte (0.25 = 25 %%)")
+    parser.add_argument("--cache-froid", action="store_true",
+                        help="mesure aussi le contenu cache disque vide (Linux, root)")
+    args = parser.parse_args()
+    threads = [int(t) for t in args.threads.split(",") if t.strip()]
+
+    temporaire = tempfile.mkdtemp(prefix="bench_recherche_")
+    # Index de contenu du benchmark hors du dossier personnel
+    config.INDEX_DIR = os.path.join(temporaire, "index")
+    try:
+        dossier = args.dossier or os.path.join(temporaire, "corpus")
+        manifeste = _corpus(os.path.abspath(dossier), args.fichiers, args.profondeur, args.graine,
+                            args.taille_max)
+        mesures = _executer(os.path.abspath(dossier), manifeste, args.iterations, threads,
+                            args.cache_froid)
+    finally:
+        shutil.rmtree(temporaire, ignore_errors=True)
+
+    resultat = {"corpus": manifeste, "mesures": mesures}
+    if args.sortie:
+        with open(args.sortie, "w", encoding="utf-8") as f:
+            json.dump(resultat, f, indent=2)
+        print(f"Mesures ecrites dans {args.sortie}")
+    if args.reference:
+        with open(args.reference, encoding="utf-8") as f:
+            reference = json.load(f)
+        if reference.get("corpus", {}).get("fichiers") != manifeste["fichiers"]:
+            print("Attention: la reference a ete mesuree sur un corpus different")
+        regressions = _comparer(mesures, reference.get("mesures", {}), args.tolerance)
+        if regressions:
+            print("Regressions:")
+            for ligne in regressions:
+                print(f"  {ligne}")
+            sys.exit(1)
+        print("Aucune regression")
+
+
+if __name__ == "__main__":
+    main()
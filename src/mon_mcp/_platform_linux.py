@@ -1,7 +1,12 @@
-"""Backend Linux - pynput, pyperclip, notifypy, wmctrl."""
+"""Backend Linux - pynput, pyperclip, notifypy, python-xlib (repli wmctrl)."""
 
+import ctypes
+import ctypes.util
+import os
+import select
 import shutil
 import subprocess
+import threading
 import time
 
 
@@ -9,10 +14,16 @@ import time
 # SOURIS
 # =============================================================================
 
+_mouse = None
+
+
 def _get_mouse():
-    """Lazy init du controleur souris pynput."""
-    from pynput.mouse import Controller
-    return Controller()
+    """Lazy init du controleur souris pynput (reutilise entre les appels)."""
+    global _mouse
+    if _mouse is None:
+        from pynput.mouse import Controller
+        _mouse = Controller()
+    return _mouse
 
 
 def get_cursor_pos():
@@ -42,14 +53,34 @@ def mouse_scroll(clicks):
     m.scroll(0, clicks)
 
 
+def mouse_button(x, y, button="left", pressed=True):
+    """Enfonce ou relache un bouton de la souris a une position donnee."""
+    from pynput.mouse import Button
+    m = _get_mouse()
+    m.position = (int(x), int(y))
+    btn = {"left": Button.left, "right": Button.right, "middle": Button.middle}.get(
+        button, Button.left
+    )
+    if pressed:
+        m.press(btn)
+    else:
+        m.release(btn)
+
+
 # =============================================================================
 # CLAVIER
 # =============================================================================
 
+_keyboard = None
+
+
 def _get_keyboard():
-    """Lazy init du controleur clavier pynput."""
-    from pynput.keyboard import Controller
-    return Controller()
+    """Lazy init du controleur clavier pynput (reutilise entre les appels)."""
+    global _keyboard
+    if _keyboard is None:
+        from pynput.keyboard import Controller
+        _keyboard = Controller()
+    return _keyboard
 
 
 KEY_MAP = None
@@ -73,6 +104,7 @@ def _get_key_map():
         "home": Key.home, "end": Key.end,
         "pageup": Key.page_up, "pagedown": Key.page_down,
         "ctrl": Key.ctrl, "alt": Key.alt, "shift": Key.shift,
+        "win": Key.cmd,
         "insert": Key.insert,
         "f1": Key.f1, "f2": Key.f2, "f3": Key.f3, "f4": Key.f4,
         "f5": Key.f5, "f6": Key.f6, "f7": Key.f7, "f8": Key.f8,
@@ -89,6 +121,93 @@ def type_text(text, interval=0.05):
         time.sleep(interval)
 
 
+# Caracteres de controle tapes par le keysym de leur touche
+_CONTROL_KEYSYMS = {"\n": "Return", "\r": "Return", "\t": "Tab", "\b": "BackSpace"}
+
+# Pause laissee aux applications pour lire les evenements avant de modifier
+# la disposition du clavier
+KEYMAP_SETTLE_DELAY = 0.05
+
+
+def _char_keysym(char):
+    """Keysym X d'un caractere (Latin-1 direct, sinon keysym Unicode)."""
+    from Xlib import XK
+    if char in _CONTROL_KEYSYMS:
+        return XK.string_to_keysym(_CONTROL_KEYSYMS[char])
+    code = ord(char)
+    if 0x20 <= code <= 0x7E or 0xA0 <= code <= 0xFF:
+        return code
+    return 0x01000000 | code
+
+
+def type_text_bulk(text):
+    """
+    Tape tout le texte en un lot d'evenements XTest envoyes en un aller-retour.
+
+    Les caracteres absents de la disposition du clavier (ou accessibles
+    seulement avec AltGr) sont associes temporairement a des keycodes libres,
+    restaures a la fin.
+
+    Returns:
+        Nombre de caracteres injectes (moins que len(text) en cas d'erreur).
+    """
+    from Xlib import XK, X
+    from Xlib.ext import xtest
+
+    d = _get_display()
+    if not d.has_extension("XTEST"):
+        raise RuntimeError("extension XTEST indisponible")
+    min_keycode = d.display.info.min_keycode
+    mapping = d.get_keyboard_mapping(min_keycode, d.display.info.max_keycode - min_keycode + 1)
+    free = [min_keycode + i for i, keysyms in enumerate(mapping) if not any(keysyms)]
+    shift = d.keysym_to_keycode(XK.XK_Shift_L)
+    scratch = {}
+    used = set()
+    typed = 0
+    try:
+        for char in text:
+            keysym = _char_keysym(char)
+            keycode = d.keysym_to_keycode(keysym)
+            with_shift = False
+            if keycode and d.keycode_to_keysym(keycode, 0) != keysym:
+                with_shift = d.keycode_to_keysym(keycode, 1) == keysym
+                if not with_shift:
+                    keycode = 0
+            if not keycode:
+                keycode = scratch.get(keysym)
+                if keycode is None:
+                    if not free:
+                        raise RuntimeError(f"aucun keycode libre pour taper '{char}'")
+                    if len(scratch) == len(free):
+                        # Keycodes temporaires epuises: les evenements en attente
+                        # doivent etre lus avant de les reassigner
+                        d.sync()
+                        time.sleep(KEYMAP_SETTLE_DELAY)
+                        scratch.clear()
+                    keycode = free[len(scratch)]
+                    scratch[keysym] = keycode
+                    used.add(keycode)
+                    d.change_keyboard_mapping(keycode, [(keysym, keysym)])
+            if with_shift:
+                xtest.fake_input(d, X.KeyPress, shift)
+            xtest.fake_input(d, X.KeyPress, keycode)
+            xtest.fake_input(d, X.KeyRelease, keycode)
+            if with_shift:
+                xtest.fake_input(d, X.KeyRelease, shift)
+            typed += 1
+    except Exception:
+        if typed == 0:
+            raise
+    finally:
+        d.sync()
+        if used:
+            time.sleep(KEYMAP_SETTLE_DELAY)
+            for keycode in used:
+                d.change_keyboard_mapping(keycode, [(X.NoSymbol, X.NoSymbol)])
+            d.sync()
+    return typed
+
+
 def press_key(key_name):
     """Appuie sur une touche ou combinaison (ex: 'ctrl+c')."""
     from pynput.keyboard import KeyCode
@@ -122,6 +241,89 @@ def press_key(key_name):
             raise ValueError(f"Touche inconnue: {key_name}")
 
 
+def _resolve_key(key_name):
+    """Convertit un nom de touche ('enter', 'a', 'vk:65') en touche pynput."""
+    from pynput.keyboard import Key, KeyCode
+    key_map = _get_key_map()
+    lower = key_name.lower()
+    if lower in key_map:
+        return key_map[lower]
+    if key_name.startswith("vk:"):
+        return KeyCode.from_vk(int(key_name[3:]))
+    if len(key_name) == 1:
+        return KeyCode.from_char(key_name)
+    if hasattr(Key, lower):
+        return getattr(Key, lower)
+    raise ValueError(f"Touche inconnue: {key_name}")
+
+
+def key_action(key_name, pressed=True):
+    """Enfonce ou relache une seule touche."""
+    kb = _get_keyboard()
+    key = _resolve_key(key_name)
+    if pressed:
+        kb.press(key)
+    else:
+        kb.release(key)
+
+
+# =============================================================================
+# ENREGISTREMENT DES ENTREES
+# =============================================================================
+
+_KEY_ALIASES = {"esc": "escape", "page_up": "pageup", "page_down": "pagedown", "cmd": "win"}
+
+
+def _key_to_name(key):
+    """Convertit une touche pynput en nom compatible avec press_key/key_action."""
+    char = getattr(key, "char", None)
+    if char:
+        return char
+    name = getattr(key, "name", None)
+    if name:
+        for suffix in ("_l", "_r", "_gr"):
+            if name.endswith(suffix):
+                name = name[: -len(suffix)]
+                break
+        return _KEY_ALIASES.get(name, name)
+    return f"vk:{key.vk}"
+
+
+def start_input_recorder(on_event):
+    """
+    Demarre l'ecoute souris + clavier (listeners pynput).
+
+    on_event est appele depuis les threads d'ecoute avec:
+    ("move", x, y), ("button", x, y, bouton, enfonce), ("scroll", x, y, dy)
+    ou ("key", nom, enfonce).
+
+    Returns:
+        Une fonction sans argument qui arrete l'ecoute.
+    """
+    from pynput import keyboard, mouse
+
+    def on_click(x, y, button, pressed):
+        on_event("button", int(x), int(y), button.name, pressed)
+
+    mouse_listener = mouse.Listener(
+        on_move=lambda x, y: on_event("move", int(x), int(y)),
+        on_click=on_click,
+        on_scroll=lambda x, y, dx, dy: on_event("scroll", int(x), int(y), dy),
+    )
+    keyboard_listener = keyboard.Listener(
+        on_press=lambda key: on_event("key", _key_to_name(key), True),
+        on_release=lambda key: on_event("key", _key_to_name(key), False),
+    )
+    mouse_listener.start()
+    keyboard_listener.start()
+
+    def stop():
+        mouse_listener.stop()
+        keyboard_listener.stop()
+
+    return stop
+
+
 # =============================================================================
 # PRESSE-PAPIER
 # =============================================================================
@@ -155,42 +357,173 @@ def send_notification(title, message, duration="short"):
 # FENETRES
 # =============================================================================
 
-def list_windows():
-    """Liste les fenetres ouvertes via wmctrl."""
-    wmctrl_path = shutil.which("wmctrl")
-    if not wmctrl_path:
+# Connexion X persistante (python-xlib), ouverte au premier appel
+_display = None
+
+
+def _get_display():
+    """Lazy init de la connexion Xlib (reutilisee entre les appels)."""
+    global _display
+    if _display is None:
+        from Xlib import display
+        _display = display.Display()
+    return _display
+
+
+def _reset_display():
+    """Ferme la connexion Xlib (apres une erreur de connexion)."""
+    global _display
+    if _display is not None:
+        try:
+            _display.close()
+        except Exception:
+            pass
+    _display = None
+
+
+def _get_property(d, win, name):
+    """Lit une propriete X d'une fenetre (None si absente)."""
+    from Xlib import X
+    prop = win.get_full_property(d.intern_atom(name), X.AnyPropertyType)
+    return prop.value if prop is not None else None
+
+
+def _window_title(d, win):
+    """Titre UTF-8 (_NET_WM_NAME) avec repli sur WM_NAME."""
+    title = _get_property(d, win, "_NET_WM_NAME")
+    if title is None:
+        title = win.get_wm_name()
+    if isinstance(title, bytes):
+        title = title.decode("utf-8", errors="replace")
+    return title or ""
+
+
+def _xlib_client_list(d):
+    """Retourne (root, ids des fenetres clientes, id de la fenetre active)."""
+    root = d.screen().root
+    ids = _get_property(d, root, "_NET_CLIENT_LIST")
+    if ids is None:
+        raise RuntimeError("_NET_CLIENT_LIST indisponible (gestionnaire de fenetres non EWMH)")
+    active = _get_property(d, root, "_NET_ACTIVE_WINDOW")
+    return root, list(ids), active[0] if active else None
+
+
+def _xlib_window_info(d, root, wid, active_id):
+    """Construit la description d'une fenetre a partir de ses proprietes EWMH."""
+    win = d.create_resource_object("window", wid)
+    geom = win.get_geometry()
+    origin = root.translate_coords(win, 0, 0)
+    states = _get_property(d, win, "_NET_WM_STATE") or []
+    hidden = d.intern_atom("_NET_WM_STATE_HIDDEN") in states
+    pid = _get_property(d, win, "_NET_WM_PID")
+    wm_class = win.get_wm_class()
+    return {
+        "titre": _window_title(d, win),
+        "position": f"({origin.x}, {origin.y})",
+        "taille": f"{geom.width}x{geom.height}",
+        "visible": not hidden,
+        "minimisee": hidden,
+        "active": wid == active_id,
+        "id": f"0x{wid:08x}",
+        "pid": int(pid[0]) if pid else None,
+        "classe": wm_class[1] if wm_class else "",
+    }
+
+
+def _xlib_list_windows():
+    """Liste les fenetres en lisant directement _NET_CLIENT_LIST."""
+    from Xlib import error
+    d = _get_display()
+    root, ids, active_id = _xlib_client_list(d)
+    windows = []
+    for wid in ids:
+        try:
+            windows.append(_xlib_window_info(d, root, wid, active_id))
+        except error.XError:
+            continue  # fenetre fermee entre-temps
+    return windows
+
+
+def _xlib_focus_window(title):
+    """Active la premiere fenetre dont le titre contient `title` (_NET_ACTIVE_WINDOW)."""
+    from Xlib import X, error
+    from Xlib.protocol import event
+
+    d = _get_display()
+    root, ids, _ = _xlib_client_list(d)
+    needle = title.lower()
+    for wid in ids:
+        win = d.create_resource_object("window", wid)
+        try:
+            win_title = _window_title(d, win)
+        except error.XError:
+            continue
+        if needle in win_title.lower():
+            msg = event.ClientMessage(
+                window=win,
+                client_type=d.intern_atom("_NET_ACTIVE_WINDOW"),
+                data=(32, [2, X.CurrentTime, 0, 0, 0]),
+            )
+            root.send_event(
+                msg, event_mask=X.SubstructureRedirectMask | X.SubstructureNotifyMask
+            )
+            d.flush()
+            return win_title
+    raise LookupError(f"Aucune fenetre trouvee avec: '{title}'")
+
+
+def _xlib_call(fn, *args):
+    """
+    Appelle un helper Xlib; leve ImportError/OSError/RuntimeError si le
+    backend natif est indisponible (pour basculer sur wmctrl).
+    """
+    from Xlib import error
+    try:
+        return fn(*args)
+    except (error.DisplayError, error.ConnectionClosedError) as e:
+        _reset_display()
+        raise OSError(str(e)) from e
+
+
+def _require_wmctrl():
+    """Verifie la presence de wmctrl (backend de repli)."""
+    if not shutil.which("wmctrl"):
         raise RuntimeError(
             "wmctrl non installe. Installez avec: sudo apt install wmctrl"
         )
 
+
+def _wmctrl_list_windows():
+    """Liste les fenetres ouvertes via wmctrl."""
+    _require_wmctrl()
     result = subprocess.run(
-        ["wmctrl", "-l", "-G"], capture_output=True, text=True, timeout=5
+        ["wmctrl", "-l", "-G", "-p", "-x"], capture_output=True, text=True, timeout=5
     )
     windows = []
     for line in result.stdout.strip().split("\n"):
         if not line:
             continue
-        parts = line.split(None, 8)
-        if len(parts) >= 9:
+        # id bureau pid x y largeur hauteur classe hote titre
+        parts = line.split(None, 9)
+        if len(parts) >= 10:
+            pid = int(parts[2])
             windows.append({
-                "titre": parts[8],
+                "titre": parts[9],
                 "position": f"({parts[3]}, {parts[4]})",
                 "taille": f"{parts[5]}x{parts[6]}",
                 "visible": True,
                 "minimisee": False,
                 "active": False,
+                "id": parts[0],
+                "pid": pid or None,
+                "classe": parts[7].split(".")[-1],
             })
     return windows
 
 
-def focus_window(title):
+def _wmctrl_focus_window(title):
     """Active une fenetre par titre via wmctrl."""
-    wmctrl_path = shutil.which("wmctrl")
-    if not wmctrl_path:
-        raise RuntimeError(
-            "wmctrl non installe. Installez avec: sudo apt install wmctrl"
-        )
-
+    _require_wmctrl()
     result = subprocess.run(
         ["wmctrl", "-a", title], capture_output=True, text=True, timeout=5
     )
@@ -199,6 +532,124 @@ def focus_window(title):
     return title
 
 
+def list_windows():
+    """Liste les fenetres ouvertes (Xlib/EWMH natif, repli sur wmctrl)."""
+    try:
+        return _xlib_call(_xlib_list_windows)
+    except (ImportError, OSError, RuntimeError):
+        return _wmctrl_list_windows()
+
+
+def focus_window(title):
+    """Active une fenetre par titre (Xlib/EWMH natif, repli sur wmctrl)."""
+    try:
+        return _xlib_call(_xlib_focus_window, title)
+    except LookupError as e:
+        raise RuntimeError(str(e)) from e
+    except (ImportError, OSError, RuntimeError):
+        return _wmctrl_focus_window(title)
+
+
+def watch_windows(on_change):
+    """
+    Surveille les changements de fenetres (PropertyNotify sur la racine).
+
+    on_change() est appele depuis un thread dedie quand _NET_CLIENT_LIST ou
+    _NET_ACTIVE_WINDOW change. Utilise sa propre connexion X.
+
+    Returns:
+        Une fonction sans argument qui arrete la surveillance.
+    """
+    from Xlib import X, display
+
+    d = display.Display()
+    root = d.screen().root
+    client_list = d.intern_atom("_NET_CLIENT_LIST")
+    watched = {client_list, d.intern_atom("_NET_ACTIVE_WINDOW")}
+    if _get_property(d, root, "_NET_CLIENT_LIST") is None:
+        d.close()
+        raise RuntimeError("_NET_CLIENT_LIST indisponible (gestionnaire de fenetres non EWMH)")
+    root.change_attributes(event_mask=X.PropertyChangeMask)
+    d.flush()
+
+    stop_event = threading.Event()
+
+    def run():
+        try:
+            while not stop_event.is_set():
+                readable, _, _ = select.select([d.fileno()], [], [], 0.5)
+                if not readable:
+                    continue
+                changed = False
+                for _ in range(d.pending_events()):
+                    ev = d.next_event()
+                    if ev.type == X.PropertyNotify and ev.atom in watched:
+                        changed = True
+                if changed:
+                    on_change()
+        finally:
+            d.close()
+
+    thread = threading.Thread(target=run, name="mcp-window-watch", daemon=True)
+    thread.start()
+
+    def stop():
+        stop_event.set()
+        thread.join(timeout=2)
+
+    return stop
+
+
+# =============================================================================
+# SURVEILLANCE DE FICHIERS (inotify)
+# =============================================================================
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVE_SELF = 0x00000800
+IN_DELETE_SELF = 0x00000400
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_libc = None
+
+
+def _get_libc():
+    """Lazy init de la libc (inotify_* via ctypes)."""
+    global _libc
+    if _libc is None:
+        _libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    return _libc
+
+
+def wait_file_change(path, timeout, recheck=None):
+    """
+    Bloque jusqu'a une modification, un deplacement ou une suppression du
+    fichier (inotify), ou jusqu'au timeout.
+
+    `recheck` (optionnel) est appele une fois la surveillance en place: s'il
+    retourne True (changement survenu avant la surveillance), retour immediat.
+
+    Returns:
+        True si un evenement a ete recu, False au timeout.
+    """
+    libc = _get_libc()
+    fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+    if fd < 0:
+        raise OSError(ctypes.get_errno(), "inotify_init1 a echoue")
+    try:
+        mask = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVE_SELF | IN_DELETE_SELF
+        if libc.inotify_add_watch(fd, os.fsencode(path), mask) < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch a echoue: {path}")
+        if recheck is not None and recheck():
+            return True
+        readable, _, _ = select.select([fd], [], [], max(0.0, timeout))
+        return bool(readable)
+    finally:
+        os.close(fd)
+
+
 # =============================================================================
 # ECRAN
 # =============================================================================
@@ -17,11 +17,17 @@ get_cursor_pos = _unsupported("get_cursor_pos")
 set_cursor_pos = _unsupported("set_cursor_pos")
 mouse_click = _unsupported("mouse_click")
 mouse_scroll = _unsupported("mouse_scroll")
+mouse_button = _unsupported("mouse_button")
 type_text = _unsupported("type_text")
+type_text_bulk = _unsupported("type_text_bulk")
 press_key = _unsupported("press_key")
+key_action = _unsupported("key_action")
+start_input_recorder = _unsupported("start_input_recorder")
 clipboard_read = _unsupported("clipboard_read")
 clipboard_write = _unsupported("clipboard_write")
 send_notification = _unsupported("send_notification")
 list_windows = _unsupported("list_windows")
 focus_window = _unsupported("focus_window")
+watch_windows = _unsupported("watch_windows")
+wait_file_change = _unsupported("wait_file_change")
 get_virtual_screen_bounds = _unsupported("get_virtual_screen_bounds")
@@ -2,6 +2,8 @@
 
 import ctypes
 import json
+import os
+import threading
 import time
 from ctypes import wintypes
 
@@ -56,6 +58,26 @@ class INPUT(ctypes.Structure):
     _fields_ = [("type", wintypes.DWORD), ("union", INPUT_UNION)]
 
 
+class KBDLLHOOKSTRUCT(ctypes.Structure):
+    _fields_ = [
+        ("vkCode", wintypes.DWORD),
+        ("scanCode", wintypes.DWORD),
+        ("flags", wintypes.DWORD),
+        ("time", wintypes.DWORD),
+        ("dwExtraInfo", ctypes.c_size_t),
+    ]
+
+
+class MSLLHOOKSTRUCT(ctypes.Structure):
+    _fields_ = [
+        ("pt", POINT),
+        ("mouseData", wintypes.DWORD),
+        ("flags", wintypes.DWORD),
+        ("time", wintypes.DWORD),
+        ("dwExtraInfo", ctypes.c_size_t),
+    ]
+
+
 # =============================================================================
 # CONSTANTES
 # =============================================================================
@@ -75,6 +97,31 @@ WHEEL_DELTA = 120
 KEYEVENTF_KEYUP = 0x0002
 KEYEVENTF_UNICODE = 0x0004
 
+# Hooks bas niveau (enregistrement des entrees)
+WH_KEYBOARD_LL = 13
+WH_MOUSE_LL = 14
+WM_QUIT = 0x0012
+WM_KEYDOWN = 0x0100
+WM_KEYUP = 0x0101
+WM_SYSKEYDOWN = 0x0104
+WM_SYSKEYUP = 0x0105
+WM_MOUSEMOVE = 0x0200
+WM_MOUSEWHEEL = 0x020A
+EVENT_SYSTEM_FOREGROUND = 0x0003
+EVENT_SYSTEM_MINIMIZEEND = 0x0017
+EVENT_OBJECT_CREATE = 0x8000
+EVENT_OBJECT_NAMECHANGE = 0x800C
+WINEVENT_OUTOFCONTEXT = 0x0000
+WINEVENT_SKIPOWNPROCESS = 0x0002
+OBJID_WINDOW = 0
+LLKHF_INJECTED = 0x10
+LLMHF_INJECTED = 0x01
+MOUSE_BUTTON_MESSAGES = {
+    0x0201: ("left", True), 0x0202: ("left", False),
+    0x0204: ("right", True), 0x0205: ("right", False),
+    0x0207: ("middle", True), 0x0208: ("middle", False),
+}
+
 VK_CODES = {
     "enter": 0x0D, "return": 0x0D,
     "tab": 0x09,
@@ -107,6 +154,13 @@ SM_CYVIRTUALSCREEN = 79
 SM_XVIRTUALSCREEN = 76
 SM_YVIRTUALSCREEN = 77
 
+# Surveillance de fichiers
+FILE_NOTIFY_CHANGE_FILE_NAME = 0x0001
+FILE_NOTIFY_CHANGE_SIZE = 0x0008
+FILE_NOTIFY_CHANGE_LAST_WRITE = 0x0010
+WAIT_OBJECT_0 = 0
+INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+
 # Clipboard
 CF_UNICODETEXT = 13
 GMEM_MOVEABLE = 0x0002
@@ -146,11 +200,23 @@ def mouse_scroll(clicks):
     user32.mouse_event(MOUSEEVENTF_WHEEL, 0, 0, clicks * WHEEL_DELTA, 0)
 
 
+def mouse_button(x, y, button="left", pressed=True):
+    """Enfonce ou relache un bouton de la souris a une position donnee."""
+    set_cursor_pos(x, y)
+    buttons = {
+        "left": (MOUSEEVENTF_LEFTDOWN, MOUSEEVENTF_LEFTUP),
+        "right": (MOUSEEVENTF_RIGHTDOWN, MOUSEEVENTF_RIGHTUP),
+        "middle": (MOUSEEVENTF_MIDDLEDOWN, MOUSEEVENTF_MIDDLEUP),
+    }
+    down, up = buttons.get(button, buttons["left"])
+    user32.mouse_event(down if pressed else up, 0, 0, 0, 0)
+
+
 def send_input(*inputs):
     """Envoie une ou plusieurs structures INPUT via SendInput."""
     n = len(inputs)
     arr = (INPUT * n)(*inputs)
-    user32.SendInput(n, arr, ctypes.sizeof(INPUT))
+    return user32.SendInput(n, arr, ctypes.sizeof(INPUT))
 
 
 def make_key_input(vk=0, scan=0, flags=0):
@@ -194,6 +260,40 @@ def type_text(text, interval=0.05):
         time.sleep(interval)
 
 
+def type_text_bulk(text):
+    """
+    Tape tout le texte en un seul appel SendInput (evenements UNICODE groupes).
+
+    Returns:
+        Nombre de caracteres entierement injectes (moins que len(text) si
+        SendInput n'a accepte qu'une partie du lot).
+    """
+    # SendInput attend des unites UTF-16: les caracteres hors BMP (emoji)
+    # sont envoyes sous forme de paires de substitution.
+    encoded = text.encode("utf-16-le")
+    inputs = []
+    for i in range(0, len(encoded), 2):
+        code = int.from_bytes(encoded[i:i + 2], "little")
+        inputs.append(make_unicode_input(code, key_up=False))
+        inputs.append(make_unicode_input(code, key_up=True))
+    if not inputs:
+        return 0
+    sent = send_input(*inputs)
+    if sent >= len(inputs):
+        return len(text)
+    if sent % 2:
+        # Relache la touche dont seul l'appui a ete injecte
+        send_input(inputs[sent])
+    units = (sent + 1) // 2
+    typed = 0
+    for char in text:
+        units -= 2 if ord(char) > 0xFFFF else 1
+        if units < 0:
+            break
+        typed += 1
+    return typed
+
+
 def press_key(key_name):
     """Appuie sur une touche ou combinaison (ex: 'ctrl+c')."""
     if "+" in key_name:
@@ -215,6 +315,150 @@ def press_key(key_name):
             raise ValueError(f"Touche inconnue: {key_name}")
 
 
+def key_action(key_name, pressed=True):
+    """Enfonce ou relache une seule touche ('enter', 'a', 'vk:65', caractere Unicode)."""
+    flags = 0 if pressed else KEYEVENTF_KEYUP
+    vk = VK_CODES.get(key_name.lower())
+    if vk is None and key_name.startswith("vk:"):
+        vk = int(key_name[3:])
+    if vk is not None:
+        send_input(make_key_input(vk=vk, flags=flags))
+    elif len(key_name) == 1:
+        send_input(make_unicode_input(ord(key_name), key_up=not pressed))
+    else:
+        raise ValueError(f"Touche inconnue: {key_name}")
+
+
+# =============================================================================
+# ENREGISTREMENT DES ENTREES (hooks bas niveau)
+# =============================================================================
+
+# Instance separee pour ne pas modifier les argtypes partages avec pygetwindow
+_hook_user32 = ctypes.WinDLL("user32", use_last_error=True)
+_hook_user32.CallNextHookEx.argtypes = [
+    wintypes.HHOOK, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM,
+]
+_hook_user32.CallNextHookEx.restype = wintypes.LPARAM
+_hook_user32.SetWindowsHookExW.restype = wintypes.HHOOK
+
+HOOKPROC = ctypes.WINFUNCTYPE(wintypes.LPARAM, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM)
+
+# Nom de touche par code virtuel (premier alias de VK_CODES)
+_VK_NAMES = {}
+for _name, _vk in VK_CODES.items():
+    _VK_NAMES.setdefault(_vk, _name)
+_VK_NAMES.update({0xA0: "shift", 0xA1: "shift", 0xA2: "ctrl", 0xA3: "ctrl",
+                  0xA4: "alt", 0xA5: "alt", 0x5C: "win"})
+
+
+def start_input_recorder(on_event):
+    """
+    Demarre l'ecoute souris + clavier via SetWindowsHookEx (WH_MOUSE_LL / WH_KEYBOARD_LL).
+
+    on_event est appele depuis le thread des hooks avec:
+    ("move", x, y), ("button", x, y, bouton, enfonce), ("scroll", x, y, dy)
+    ou ("key", nom, enfonce). Les evenements injectes (SendInput) sont ignores.
+
+    Returns:
+        Une fonction sans argument qui arrete l'ecoute.
+    """
+    ready = threading.Event()
+    state = {"thread_id": None, "error": None}
+
+    def mouse_proc(n_code, w_param, l_param):
+        if n_code >= 0:
+            info = ctypes.cast(l_param, ctypes.POINTER(MSLLHOOKSTRUCT)).contents
+            if not info.flags & LLMHF_INJECTED:
+                x, y = info.pt.x, info.pt.y
+                if w_param == WM_MOUSEMOVE:
+                    on_event("move", x, y)
+                elif w_param == WM_MOUSEWHEEL:
+                    delta = ctypes.c_short(info.mouseData >> 16).value
+                    on_event("scroll", x, y, delta // WHEEL_DELTA)
+                elif w_param in MOUSE_BUTTON_MESSAGES:
+                    button, pressed = MOUSE_BUTTON_MESSAGES[w_param]
+                    on_event("button", x, y, button, pressed)
+        return _hook_user32.CallNextHookEx(None, n_code, w_param, l_param)
+
+    def keyboard_proc(n_code, w_param, l_param):
+        if n_code >= 0:
+            info = ctypes.cast(l_param, ctypes.POINTER(KBDLLHOOKSTRUCT)).contents
+            if not info.flags & LLKHF_INJECTED:
+                name = _VK_NAMES.get(info.vkCode, f"vk:{info.vkCode}")
+                if w_param in (WM_KEYDOWN, WM_SYSKEYDOWN):
+                    on_event("key", name, True)
+                elif w_param in (WM_KEYUP, WM_SYSKEYUP):
+                    on_event("key", name, False)
+        return _hook_user32.CallNextHookEx(None, n_code, w_param, l_param)
+
+    # Les callbacks restent references par la closure du thread tant qu'il tourne
+    mouse_cb = HOOKPROC(mouse_proc)
+    keyboard_cb = HOOKPROC(keyboard_proc)
+
+    def run():
+        state["thread_id"] = kernel32.GetCurrentThreadId()
+        module = kernel32.GetModuleHandleW(None)
+        hooks = [
+            _hook_user32.SetWindowsHookExW(WH_MOUSE_LL, mouse_cb, module, 0),
+            _hook_user32.SetWindowsHookExW(WH_KEYBOARD_LL, keyboard_cb, module, 0),
+        ]
+        if not all(hooks):
+            state["error"] = f"SetWindowsHookEx a echoue (code {ctypes.get_last_error()})"
+            for hook in hooks:
+                if hook:
+                    _hook_user32.UnhookWindowsHookEx(hook)
+            ready.set()
+            return
+        ready.set()
+        msg = wintypes.MSG()
+        while _hook_user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+            _hook_user32.TranslateMessage(ctypes.byref(msg))
+            _hook_user32.DispatchMessageW(ctypes.byref(msg))
+        for hook in hooks:
+            _hook_user32.UnhookWindowsHookEx(hook)
+
+    thread = threading.Thread(target=run, name="mcp-input-hooks", daemon=True)
+    thread.start()
+    ready.wait(5)
+    if state["error"]:
+        raise RuntimeError(state["error"])
+
+    def stop():
+        if state["thread_id"]:
+            _hook_user32.PostThreadMessageW(state["thread_id"], WM_QUIT, 0, 0)
+        thread.join(timeout=2)
+
+    return stop
+
+
+def wait_file_change(path, timeout, recheck=None):
+    """
+    Bloque jusqu'a une modification dans le dossier du fichier
+    (FindFirstChangeNotification), ou jusqu'au timeout.
+
+    `recheck` (optionnel) est appele une fois la surveillance en place: s'il
+    retourne True (changement survenu avant la surveillance), retour immediat.
+
+    Returns:
+        True si une notification a ete recue, False au timeout.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    kernel32.FindFirstChangeNotificationW.restype = wintypes.HANDLE
+    handle = kernel32.FindFirstChangeNotificationW(
+        directory, False,
+        FILE_NOTIFY_CHANGE_FILE_NAME | FILE_NOTIFY_CHANGE_SIZE | FILE_NOTIFY_CHANGE_LAST_WRITE,
+    )
+    if not handle or handle == INVALID_HANDLE_VALUE:
+        raise OSError(f"FindFirstChangeNotification a echoue: {directory}")
+    try:
+        if recheck is not None and recheck():
+            return True
+        result = kernel32.WaitForSingleObject(handle, int(max(0.0, timeout) * 1000))
+        return result == WAIT_OBJECT_0
+    finally:
+        kernel32.FindCloseChangeNotification(handle)
+
+
 def clipboard_read():
     """Lit le texte du presse-papier Windows."""
     if not user32.OpenClipboard(0):
@@ -266,6 +510,15 @@ def send_notification(title, message, duration="short"):
     toast.show()
 
 
+def _window_pid_class(hwnd):
+    """Retourne (pid, nom de classe) d'une fenetre Win32."""
+    pid = wintypes.DWORD()
+    user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+    buf = ctypes.create_unicode_buffer(256)
+    user32.GetClassNameW(hwnd, buf, 256)
+    return pid.value or None, buf.value
+
+
 def list_windows():
     """Liste les fenetres ouvertes via pygetwindow."""
     import pygetwindow as gw
@@ -273,6 +526,7 @@ def list_windows():
     result = []
     for win in windows:
         if win.title:
+            pid, class_name = _window_pid_class(win._hWnd)
             result.append({
                 "titre": win.title,
                 "position": f"({win.left}, {win.top})",
@@ -280,6 +534,9 @@ def list_windows():
                 "visible": win.visible,
                 "minimisee": win.isMinimized,
                 "active": win.isActive,
+                "id": f"0x{win._hWnd:08x}",
+                "pid": pid,
+                "classe": class_name,
             })
     return result
 
@@ -295,3 +552,69 @@ def focus_window(title):
         win.restore()
     win.activate()
     return win.title
+
+
+WINEVENTPROC = ctypes.WINFUNCTYPE(
+    None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+    wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD,
+)
+_hook_user32.SetWinEventHook.restype = wintypes.HANDLE
+
+
+def watch_windows(on_change):
+    """
+    Surveille la creation, destruction, activation et le renommage des
+    fenetres de premier niveau via SetWinEventHook.
+
+    on_change() est appele depuis le thread du hook.
+
+    Returns:
+        Une fonction sans argument qui arrete la surveillance.
+    """
+    ready = threading.Event()
+    state = {"thread_id": None, "error": None}
+
+    def proc(h_hook, event, hwnd, id_object, id_child, thread, time_ms):
+        if id_object == OBJID_WINDOW and id_child == 0 and hwnd:
+            on_change()
+
+    callback = WINEVENTPROC(proc)
+    flags = WINEVENT_OUTOFCONTEXT | WINEVENT_SKIPOWNPROCESS
+
+    def run():
+        state["thread_id"] = kernel32.GetCurrentThreadId()
+        hooks = [
+            _hook_user32.SetWinEventHook(
+                EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_MINIMIZEEND, None, callback, 0, 0, flags
+            ),
+            _hook_user32.SetWinEventHook(
+                EVENT_OBJECT_CREATE, EVENT_OBJECT_NAMECHANGE, None, callback, 0, 0, flags
+            ),
+        ]
+        if not all(hooks):
+            state["error"] = f"SetWinEventHook a echoue (code {ctypes.get_last_error()})"
+            for hook in hooks:
+                if hook:
+                    _hook_user32.UnhookWinEvent(hook)
+            ready.set()
+            return
+        ready.set()
+        msg = wintypes.MSG()
+        while _hook_user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+            _hook_user32.TranslateMessage(ctypes.byref(msg))
+            _hook_user32.DispatchMessageW(ctypes.byref(msg))
+        for hook in hooks:
+            _hook_user32.UnhookWinEvent(hook)
+
+    thread = threading.Thread(target=run, name="mcp-window-watch", daemon=True)
+    thread.start()
+    ready.wait(5)
+    if state["error"]:
+        raise RuntimeError(state["error"])
+
+    def stop():
+        if state["thread_id"]:
+            _hook_user32.PostThreadMessageW(state["thread_id"], WM_QUIT, 0, 0)
+        thread.join(timeout=2)
+
+    return stop
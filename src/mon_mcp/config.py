@@ -0,0 +1,14 @@
+"""
+Reglages partages par les outils.
+
+INDEX_DIR: dossier des index persistants (index de contenu SQLite et index
+des chemins), ~/.mon_mcp/index par defaut ou le dossier de la variable
+MON_MCP_INDEX_DIR. Les modules le relisent a chaque acces, de sorte qu'une
+reaffectation (tests, benchmark) s'applique a tous les index.
+"""
+
+import os
+
+INDEX_DIR = os.environ.get("MON_MCP_INDEX_DIR") or os.path.join(
+    os.path.expanduser("~"), ".mon_mcp", "index"
+)
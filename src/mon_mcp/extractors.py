@@ -0,0 +1,272 @@
+"""
+Extraction du texte des documents pour la recherche de contenu et l'index.
+
+Un extracteur par extension (register_extractor permet d'en ajouter):
+- .xlsx/.xlsm: openpyxl en lecture seule, sinon XML de l'archive;
+- .docx: python-docx, sinon XML de l'archive;
+- .pptx: XML des diapositives et des notes, lu en flux dans l'archive;
+- .pdf: pypdf, sinon chaines des operateurs de texte des flux (PDF simples).
+
+Le texte extrait est mis en cache (LRU) par chemin, taille et date de
+modification: une recherche repetee ne relit pas les documents inchanges.
+"""
+
+import os
+import re
+import threading
+import zipfile
+import zlib
+from collections import OrderedDict
+from xml.etree.ElementTree import iterparse
+
+# A changer quand le texte extrait change: les index de contenu relisent
+# alors les documents concernes
+EXTRACTION_VERSION = "1"
+
+# Documents plus gros ignores (les formats Office sont compresses)
+MAX_EXTRACT_SIZE = 50 * 1024 * 1024
+
+# Taille max du cache de texte extrait (caracteres)
+CACHE_MAX_CHARS = 32_000_000
+
+_extractors: dict = {}
+_cache: OrderedDict[str, tuple[int, int, str]] = OrderedDict()
+_cache_chars = 0
+_cache_lock = threading.Lock()
+
+
+def register_extractor(extensions, extractor) -> None:
+    """
+    Associe une fonction extracteur(chemin) -> texte a une ou plusieurs extensions.
+
+    L'extracteur peut lever une exception pour un document illisible.
+    """
+    if isinstance(extensions, str):
+        extensions = [extensions]
+    for ext in extensions:
+        _extractors[ext.lower()] = extractor
+
+
+def has_extractor(path: str) -> bool:
+    """Vrai si le texte du fichier est obtenu par un extracteur (et non lu tel quel)."""
+    return os.path.splitext(path)[1].lower() in _extractors
+
+
+def _xml_text(f, separators: dict[str, str], text_tags=("t",)) -> list[str]:
+    """
+    Texte des elements `text_tags` d'un flux XML, parcouru en flux.
+
+    `separators` associe un nom d'element (sans espace de noms) au separateur
+    ajoute a sa fermeture (ex: "p" -> saut de ligne).
+    """
+    parts = []
+    for _, elem in iterparse(f, events=("end",)):
+        tag = elem.tag.rpartition("}")[2]
+        if tag in text_tags:
+            if elem.text:
+                parts.append(elem.text)
+        elif tag in separators:
+            parts.append(separators[tag])
+            elem.clear()
+    return parts
+
+
+def _natural_key(name: str) -> list:
+    """Tri naturel: slide2 avant slide10."""
+    return [int(p) if p.isdigit() else p for p in re.split(r"(\d+)", name)]
+
+
+def _extract_pptx(path: str) -> str:
+    """Texte des diapositives puis des notes, dans l'ordre."""
+    parts = []
+    with zipfile.ZipFile(path) as zf:
+        names = zf.namelist()
+        for folder in ("ppt/slides/", "ppt/notesSlides/"):
+            members = [
+                n for n in names
+                if n.startswith(folder) and n.endswith(".xml") and n.count("/") == 2
+            ]
+            for name in sorted(members, key=_natural_key):
+                with zf.open(name) as f:
+                    parts.extend(_xml_text(f, {"p": "\n", "br": "\n"}))
+                parts.append("\n")
+    return "".join(parts)
+
+
+def _extract_docx_xml(path: str) -> str:
+    """Texte du corps d'un .docx lu dans l'archive (sans python-docx)."""
+    with zipfile.ZipFile(path) as zf, zf.open("word/document.xml") as f:
+        return "".join(_xml_text(f, {"p": "\n", "tab": "\t", "br": "\n", "tc": "\t"}))
+
+
+def _extract_docx(path: str) -> str:
+    """Paragraphes et cellules de tableaux d'un .docx."""
+    try:
+        import docx
+    except ImportError:
+        return _extract_docx_xml(path)
+    document = docx.Document(path)
+    lines = [p.text for p in document.paragraphs]
+    for table in document.tables:
+        for row in table.rows:
+            lines.append("\t".join(cell.text for cell in row.cells))
+    return "\n".join(lines)
+
+
+def _extract_xlsx_xml(path: str) -> str:
+    """Textes partages et valeurs des cellules d'un classeur lu dans l'archive."""
+    parts = []
+    with zipfile.ZipFile(path) as zf:
+        names = zf.namelist()
+        if "xl/sharedStrings.xml" in names:
+            with zf.open("xl/sharedStrings.xml") as f:
+                parts.extend(_xml_text(f, {"si": "\n"}))
+        sheets = [n for n in names if n.startswith("xl/worksheets/") and n.endswith(".xml")]
+        for name in sorted(sheets, key=_natural_key):
+            with zf.open(name) as f:
+                for _, elem in iterparse(f, events=("end",)):
+                    tag = elem.tag.rpartition("}")[2]
+                    if tag == "c":
+                        # Les cellules de type "s" renvoient aux textes partages
+                        if elem.get("t") != "s":
+                            parts.extend(
+                                child.text for child in elem.iter()
+                                if child.text and child.tag.rpartition("}")[2] in ("v", "t")
+                            )
+                            parts.append("\t")
+                        elem.clear()
+                    elif tag == "row":
+                        parts.append("\n")
+                        elem.clear()
+    return "".join(parts)
+
+
+def _extract_xlsx(path: str) -> str:
+    """Valeurs des cellules de toutes les feuilles, une ligne par rangee."""
+    try:
+        import openpyxl
+    except ImportError:
+        return _extract_xlsx_xml(path)
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        lines = []
+        for ws in wb.worksheets:
+            lines.append(ws.title)
+            for row in ws.iter_rows(values_only=True):
+                values = [str(v) for v in row if v is not None]
+                if values:
+                    lines.append("\t".join(values))
+        return "\n".join(lines)
+    finally:
+        wb.close()
+
+
+_PDF_STREAM_RE = re.compile(rb"stream\r?\n(.*?)\r?\nendstream", re.DOTALL)
+_PDF_TEXT_RE = re.compile(
+    rb"\[((?:[^\]\\]|\\.)*)\]\s*TJ"          # [(chaine) -250 (chaine)] TJ
+    rb"|\(((?:[^)\\]|\\.)*)\)\s*(?:Tj|'|\")"  # (chaine) Tj
+    rb"|(T\*|Td|TD|ET)(?![A-Za-z])",         # changements de ligne
+    re.DOTALL,
+)
+_PDF_STRING_RE = re.compile(rb"\(((?:[^)\\]|\\.)*)\)", re.DOTALL)
+_PDF_ESCAPE_RE = re.compile(rb"\\([0-7]{1,3}|.)", re.DOTALL)
+_PDF_ESCAPES = {b"n": b"\n", b"r": b"\r", b"t": b"\t", b"b": b"\b", b"f": b"\f"}
+
+
+def _pdf_unescape(s: bytes) -> bytes:
+    """Decode les sequences d'echappement d'une chaine litterale PDF."""
+    def repl(m):
+        c = m.group(1)
+        if c.isdigit():
+            return bytes([int(c, 8) & 0xFF])
+        return _PDF_ESCAPES.get(c, c if c != b"\n" else b"")
+    return _PDF_ESCAPE_RE.sub(repl, s)
+
+
+def _extract_pdf_streams(path: str) -> str:
+    """
+    Chaines des operateurs de texte (Tj, TJ) des flux d'un PDF.
+
+    Suffisant pour les PDF a polices standard (ex: generes par creer_pdf);
+    les polices composites (chaines hexadecimales) ne sont pas decodees.
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    parts = []
+    for m in _PDF_STREAM_RE.finditer(raw):
+        data = m.group(1)
+        try:
+            data = zlib.decompress(data)
+        except zlib.error:
+            pass
+        for t in _PDF_TEXT_RE.finditer(data):
+            if t.group(1) is not None:
+                parts.extend(_pdf_unescape(s) for s in _PDF_STRING_RE.findall(t.group(1)))
+            elif t.group(2) is not None:
+                parts.append(_pdf_unescape(t.group(2)))
+            else:
+                parts.append(b"\n")
+    return b"".join(parts).decode("latin-1")
+
+
+def _extract_pdf(path: str) -> str:
+    """Texte des pages d'un PDF."""
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        return _extract_pdf_streams(path)
+    reader = PdfReader(path)
+    return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+
+register_extractor((".xlsx", ".xlsm"), _extract_xlsx)
+register_extractor(".docx", _extract_docx)
+register_extractor(".pptx", _extract_pptx)
+register_extractor(".pdf", _extract_pdf)
+
+
+def extract_text(path: str, st: os.stat_result | None = None) -> str | None:
+    """
+    Texte d'un document, via le cache si le fichier n'a pas change.
+
+    Args:
+        path: Chemin du document
+        st: Resultat de stat deja obtenu (evite un appel systeme)
+
+    Returns:
+        Le texte, ou None si l'extension n'a pas d'extracteur, si le fichier
+        est trop gros ou illisible (corrompu, chiffre...).
+    """
+    global _cache_chars
+    extractor = _extractors.get(os.path.splitext(path)[1].lower())
+    if extractor is None:
+        return None
+    try:
+        st = st or os.stat(path)
+    except OSError:
+        return None
+    if st.st_size > MAX_EXTRACT_SIZE:
+        return None
+
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached is not None and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            _cache.move_to_end(path)
+            return cached[2]
+
+    try:
+        text = extractor(path)
+    except Exception:
+        return None
+
+    with _cache_lock:
+        old = _cache.pop(path, None)
+        if old is not None:
+            _cache_chars -= len(old[2])
+        if len(text) <= CACHE_MAX_CHARS:
+            _cache[path] = (st.st_size, st.st_mtime_ns, text)
+            _cache_chars += len(text)
+            while _cache_chars > CACHE_MAX_CHARS:
+                _, (_, _, evicted) = _cache.popitem(last=False)
+                _cache_chars -= len(evicted)
+    return text
@@ -11,7 +11,9 @@ Ce serveur permet de :
 - Envoyer des notifications
 - Lire/ecrire le presse-papier
 - Lancer des applications et ouvrir des URLs
-- Rechercher des fichiers par nom et contenu
+- Rechercher des fichiers par nom et contenu (index de contenu optionnel)
+- Retrouver un fichier par quelques mots de son nom (index des chemins)
+- Calculer des empreintes, trouver les doublons, comparer des dossiers
 - Extraire du texte par OCR
 - Manipuler des fichiers Excel et CSV
 - Executer du code et des commandes (Python, shell, scripts)
@@ -19,8 +21,10 @@ Ce serveur permet de :
 - Stocker du contexte entre les appels (variables de session)
 - Telecharger et extraire du contenu web
 - Generer des documents (Word, PowerPoint, PDF)
+- Enregistrer et rejouer des sessions souris/clavier
+- Attendre une condition a l'ecran (fenetre, pixel, texte, changement)
 
-Compatible Windows et Linux. 58 outils.
+Compatible Windows et Linux. 84 outils.
 """
 
 import importlib.util
@@ -39,6 +43,7 @@ from mon_mcp.tools import capture, clavier, souris, fenetres  # noqa: E402
 from mon_mcp.tools import fichiers, systeme, notification, clipboard  # noqa: E402
 from mon_mcp.tools import lanceur, recherche, ocr, excel  # noqa: E402
 from mon_mcp.tools import execution, workspace, web, documents, context  # noqa: E402
+from mon_mcp.tools import enregistrement, attente, hachage, index_recherche, index_chemins  # noqa: E402
 
 capture.register_tools(mcp)
 clavier.register_tools(mcp)
@@ -57,6 +62,11 @@ workspace.register_tools(mcp)
 web.register_tools(mcp)
 documents.register_tools(mcp)
 context.register_tools(mcp)
+enregistrement.register_tools(mcp)
+attente.register_tools(mcp)
+hachage.register_tools(mcp)
+index_recherche.register_tools(mcp)
+index_chemins.register_tools(mcp)
 
 
 # =============================================================================
@@ -89,7 +99,10 @@ def ping() -> str:
             if importlib.util.find_spec(module) is None:
                 missing.append(name)
     elif sys.platform == "linux":
-        for module, name in [("pynput", "pynput"), ("pyperclip", "pyperclip"), ("notifypy", "notify-py")]:
+        for module, name in [
+            ("pynput", "pynput"), ("pyperclip", "pyperclip"),
+            ("notifypy", "notify-py"), ("Xlib", "python-xlib"),
+        ]:
             if importlib.util.find_spec(module) is None:
                 missing.append(name)
 
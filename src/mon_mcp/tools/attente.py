@@ -0,0 +1,270 @@
+"""
+Module d'attente de conditions a l'ecran.
+
+Remplace les boucles de captures cote client: la condition est verifiee
+localement a haute frequence avec des tests peu couteux (empreinte CRC de la
+region, pixel isole) et l'outil ne repond que lorsqu'elle est remplie ou
+que le timeout expire. L'attente d'une fenetre est dans fenetres.py
+(attendre_fenetre, basee sur le registre des fenetres).
+
+Outils: attendre_pixel, attendre_changement, attendre_texte_ecran
+"""
+
+import json
+import time
+import zlib
+from contextlib import contextmanager
+
+# Duree max d'attente acceptee (secondes)
+MAX_WAIT = 300.0
+
+# Intervalle minimum entre deux verifications (secondes)
+MIN_INTERVAL = 0.01
+
+
+@contextmanager
+def _screen_grabber():
+    """Ouvre une session mss et fournit grab(monitor) -> octets BGRA bruts."""
+    import mss
+
+    with mss.mss() as sct:
+        yield lambda monitor: sct.grab(monitor).bgra
+
+
+def _parse_color(couleur: str) -> tuple[int, int, int]:
+    """Convertit '#RRGGBB' (ou 'RRGGBB') en tuple (r, g, b)."""
+    value = couleur.strip().lstrip("#")
+    if len(value) != 6:
+        raise ValueError(f"Couleur invalide: '{couleur}' (format attendu: #RRGGBB)")
+    return int(value[0:2], 16), int(value[2:4], 16), int(value[4:6], 16)
+
+
+def _region(x: int, y: int, largeur: int, hauteur: int) -> dict:
+    """Construit un dict de region mss (largeur/hauteur 0 = ecran principal)."""
+    if largeur <= 0 or hauteur <= 0:
+        import mss
+        with mss.mss() as sct:
+            return dict(sct.monitors[1])
+    return {"left": x, "top": y, "width": largeur, "height": hauteur}
+
+
+def _wait_until(check, timeout: float, intervalle: float) -> tuple[bool, int, float]:
+    """
+    Appelle check() jusqu'a ce qu'il renvoie True ou que le timeout expire.
+
+    Les verifications sont cadencees sur une echeance monotone.
+
+    Returns:
+        (condition remplie, nombre de verifications, duree en secondes).
+    """
+    timeout = min(max(0.0, timeout), MAX_WAIT)
+    intervalle = max(MIN_INTERVAL, intervalle)
+    start = time.monotonic()
+    deadline = start + timeout
+    checks = 0
+    next_check = start
+    while True:
+        checks += 1
+        if check():
+            return True, checks, round(time.monotonic() - start, 3)
+        now = time.monotonic()
+        if now >= deadline:
+            return False, checks, round(now - start, 3)
+        next_check = max(next_check + intervalle, now)
+        time.sleep(max(0.0, min(next_check, deadline) - now))
+
+
+def attendre_pixel(
+    x: int,
+    y: int,
+    couleur: str,
+    tolerance: int = 10,
+    different: bool = False,
+    timeout: float = 10.0,
+    intervalle: float = 0.05,
+) -> str:
+    """
+    Attend qu'un pixel de l'ecran prenne (ou quitte) une couleur donnee.
+
+    Args:
+        x: Position X du pixel
+        y: Position Y du pixel
+        couleur: Couleur attendue au format "#RRGGBB"
+        tolerance: Ecart max par canal (0-255, defaut: 10)
+        different: Si True, attend que le pixel NE soit PLUS de cette couleur
+        timeout: Duree max d'attente en secondes (defaut: 10, max: 300)
+        intervalle: Delai entre deux verifications en secondes (defaut: 0.05)
+
+    Returns:
+        JSON avec condition_remplie, couleur finale, duree et nombre de verifications.
+    """
+    try:
+        target = _parse_color(couleur)
+    except ValueError as e:
+        return json.dumps({"erreur": str(e)}, ensure_ascii=False)
+
+    monitor = {"left": x, "top": y, "width": 1, "height": 1}
+    last = {"rgb": None}
+
+    try:
+        with _screen_grabber() as grab:
+            def check():
+                b, g, r = grab(monitor)[:3]
+                last["rgb"] = (r, g, b)
+                matches = all(abs(c - t) <= tolerance for c, t in zip((r, g, b), target))
+                return matches != different
+
+            ok, checks, duree = _wait_until(check, timeout, intervalle)
+    except Exception as e:
+        return json.dumps({"erreur": str(e)}, ensure_ascii=False)
+
+    return json.dumps({
+        "condition_remplie": ok,
+        "couleur_actuelle": "#{:02x}{:02x}{:02x}".format(*last["rgb"]) if last["rgb"] else None,
+        "duree_secondes": duree,
+        "verifications": checks,
+    }, ensure_ascii=False)
+
+
+def attendre_changement(
+    x: int = 0,
+    y: int = 0,
+    largeur: int = 0,
+    hauteur: int = 0,
+    mode: str = "changement",
+    stabilite: float = 1.0,
+    timeout: float = 30.0,
+    intervalle: float = 0.1,
+) -> str:
+    """
+    Attend qu'une region de l'ecran change, ou qu'elle cesse de changer.
+
+    Args:
+        x: Position X de la region
+        y: Position Y de la region
+        largeur: Largeur de la region (0 = ecran principal entier)
+        hauteur: Hauteur de la region (0 = ecran principal entier)
+        mode: "changement" (differe de l'etat initial) ou "stable" (plus aucun
+              changement pendant `stabilite` secondes, ex: fin d'une barre de progression)
+        stabilite: Duree sans changement requise en mode "stable" (defaut: 1.0)
+        timeout: Duree max d'attente en secondes (defaut: 30, max: 300)
+        intervalle: Delai entre deux verifications en secondes (defaut: 0.1)
+
+    Returns:
+        JSON avec condition_remplie, duree et nombre de verifications.
+    """
+    if mode not in ("changement", "stable"):
+        return json.dumps(
+            {"erreur": f"Mode inconnu: {mode}. Modes: changement, stable"}, ensure_ascii=False
+        )
+
+    try:
+        monitor = _region(x, y, largeur, hauteur)
+        with _screen_grabber() as grab:
+            state = {"empreinte": zlib.crc32(grab(monitor)), "depuis": time.monotonic()}
+
+            def check():
+                empreinte = zlib.crc32(grab(monitor))
+                now = time.monotonic()
+                if mode == "changement":
+                    return empreinte != state["empreinte"]
+                if empreinte != state["empreinte"]:
+                    state["empreinte"] = empreinte
+                    state["depuis"] = now
+                    return False
+                return now - state["depuis"] >= stabilite
+
+            ok, checks, duree = _wait_until(check, timeout, intervalle)
+    except Exception as e:
+        return json.dumps({"erreur": str(e)}, ensure_ascii=False)
+
+    return json.dumps({
+        "condition_remplie": ok,
+        "mode": mode,
+        "region": f"({monitor['left']}, {monitor['top']}) {monitor['width']}x{monitor['height']}",
+        "duree_secondes": duree,
+        "verifications": checks,
+    }, ensure_ascii=False)
+
+
+def attendre_texte_ecran(
+    texte: str,
+    x: int = 0,
+    y: int = 0,
+    largeur: int = 0,
+    hauteur: int = 0,
+    langue: str = "fra+eng",
+    timeout: float = 30.0,
+    intervalle: float = 0.25,
+) -> str:
+    """
+    Attend qu'un texte apparaisse dans une region de l'ecran (OCR).
+
+    L'OCR n'est relance que lorsque l'empreinte de la region a change.
+
+    Args:
+        texte: Texte a attendre (insensible a la casse)
+        x: Position X de la region
+        y: Position Y de la region
+        largeur: Largeur de la region (0 = ecran principal entier)
+        hauteur: Hauteur de la region (0 = ecran principal entier)
+        langue: Langue(s) Tesseract (defaut: "fra+eng")
+        timeout: Duree max d'attente en secondes (defaut: 30, max: 300)
+        intervalle: Delai entre deux verifications en secondes (defaut: 0.25)
+
+    Returns:
+        JSON avec condition_remplie, duree, verifications et nombre d'OCR effectues.
+    """
+    try:
+        import pytesseract
+        from PIL import Image
+    except ImportError:
+        return json.dumps(
+            {"erreur": "pytesseract et Pillow requis. pip install pytesseract Pillow"},
+            ensure_ascii=False,
+        )
+
+    if not texte.strip():
+        return json.dumps(
+            {"erreur": "Le texte a attendre ne peut pas etre vide."}, ensure_ascii=False
+        )
+
+    needle = texte.strip().lower()
+
+    try:
+        monitor = _region(x, y, largeur, hauteur)
+        size = (monitor["width"], monitor["height"])
+        state = {"empreinte": None, "ocr": 0}
+
+        with _screen_grabber() as grab:
+            def check():
+                raw = grab(monitor)
+                empreinte = zlib.crc32(raw)
+                if empreinte == state["empreinte"]:
+                    return False
+                state["empreinte"] = empreinte
+                state["ocr"] += 1
+                img = Image.frombytes("RGB", size, raw, "raw", "BGRX")
+                return needle in pytesseract.image_to_string(img, lang=langue).lower()
+
+            ok, checks, duree = _wait_until(check, timeout, intervalle)
+    except pytesseract.TesseractNotFoundError:
+        return json.dumps(
+            {"erreur": "Tesseract n'est pas installe ou pas dans le PATH."}, ensure_ascii=False
+        )
+    except Exception as e:
+        return json.dumps({"erreur": str(e)}, ensure_ascii=False)
+
+    return json.dumps({
+        "condition_remplie": ok,
+        "texte": texte,
+        "duree_secondes": duree,
+        "verifications": checks,
+        "ocr_effectues": state["ocr"],
+    }, ensure_ascii=False)
+
+
+def register_tools(mcp):
+    mcp.add_tool(attendre_pixel)
+    mcp.add_tool(attendre_changement)
+    mcp.add_tool(attendre_texte_ecran)
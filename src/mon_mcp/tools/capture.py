@@ -32,6 +32,31 @@ def _capture_region(monitor, max_size=None):
         return resolution, img_b64
 
 
+# Taille de la miniature en niveaux de gris utilisee comme signature d'ecran
+SIGNATURE_SIZE = (64, 36)
+
+
+def _screen_signature(monitor=None) -> bytes:
+    """
+    Helper: capture une region (defaut: ecran principal) et retourne une
+    miniature en niveaux de gris, comparable avec _signature_difference.
+    """
+    import mss
+    from PIL import Image
+
+    with mss.mss() as sct:
+        screenshot = sct.grab(monitor or sct.monitors[1])
+        img = Image.frombytes("RGB", screenshot.size, screenshot.bgra, "raw", "BGRX")
+    return img.convert("L").resize(SIGNATURE_SIZE, Image.Resampling.BILINEAR).tobytes()
+
+
+def _signature_difference(a: bytes, b: bytes) -> float:
+    """Ecart moyen (0.0 = identique, 1.0 = oppose) entre deux signatures d'ecran."""
+    if len(a) != len(b) or not a:
+        return 1.0
+    return sum(abs(x - y) for x, y in zip(a, b)) / (255 * len(a))
+
+
 def capture_ecrans() -> str:
     """
     Capture tous les ecrans de l'ordinateur.
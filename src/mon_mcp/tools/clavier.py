@@ -1,22 +1,73 @@
 """Outils MCP pour le controle du clavier."""
 
-from mon_mcp.platform_api import type_text as _type_text, press_key as _press_key
+import time
 
+from mon_mcp.platform_api import (
+    type_text as _type_text,
+    type_text_bulk as _type_text_bulk,
+    press_key as _press_key,
+    clipboard_read,
+    clipboard_write,
+)
 
-def ecrire_texte(texte: str, intervalle: float = 0.05) -> str:
+# Delai laisse a l'application pour lire le presse-papier avant sa restauration
+PASTE_RESTORE_DELAY = 0.3
+
+TYPING_MODES = ("caractere", "rapide", "coller")
+
+
+def _paste_text(texte: str):
+    """Colle le texte via le presse-papier puis restaure le contenu precedent."""
+    try:
+        previous = clipboard_read()
+    except Exception:
+        previous = None
+
+    clipboard_write(texte)
+    try:
+        _press_key("ctrl+v")
+        time.sleep(PASTE_RESTORE_DELAY)
+    finally:
+        if previous is not None:
+            clipboard_write(previous)
+
+
+def ecrire_texte(texte: str, intervalle: float = 0.05, mode: str = "caractere") -> str:
     """
     Ecrit du texte au clavier (simule la frappe).
     Supporte tous les caracteres Unicode (majuscules, accents, symboles).
 
     Args:
         texte: Le texte a ecrire
-        intervalle: Delai entre chaque caractere en secondes (defaut: 0.05)
+        intervalle: Delai entre chaque caractere en secondes (defaut: 0.05, mode "caractere")
+        mode: "caractere" (frappe lente, compatible partout), "rapide" (tout le texte
+              en un seul lot d'evenements) ou "coller" (via le presse-papier, restaure
+              ensuite) (defaut: "caractere")
 
     Returns:
         Confirmation.
     """
+    if mode not in TYPING_MODES:
+        return f"Erreur: mode inconnu '{mode}'. Modes: {', '.join(TYPING_MODES)}"
+
     try:
-        _type_text(texte, intervalle)
+        if mode == "coller":
+            _paste_text(texte)
+        elif mode == "rapide":
+            try:
+                typed = _type_text_bulk(texte)
+            except NotImplementedError:
+                raise
+            except Exception:
+                typed = 0
+            if typed < len(texte):
+                # Lot refuse en tout ou partie (entree bloquee...): seule la suite
+                # est tapee caractere par caractere, sans doubler le debut.
+                _type_text(texte[typed:], intervalle)
+                return (f"Texte ecrit: '{texte}' (mode rapide: {typed}/{len(texte)} caracteres, "
+                        f"suite en frappe caractere)")
+        else:
+            _type_text(texte, intervalle)
         return f"Texte ecrit: '{texte}'"
     except Exception as e:
         return f"Erreur: {str(e)}"
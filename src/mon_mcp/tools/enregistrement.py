@@ -0,0 +1,330 @@
+"""
+Module d'enregistrement et de rejeu des entrees utilisateur (souris + clavier).
+
+Les evenements sont horodates et stockes dans un journal JSON compact
+(gzip si le fichier se termine par .gz). Le rejeu passe par la couche
+plateforme, a vitesse reelle ou acceleree, avec verification optionnelle
+de points de controle (signatures d'ecran).
+
+Outils: demarrer_enregistrement, point_controle_enregistrement,
+        arreter_enregistrement, rejouer_enregistrement
+"""
+
+import base64
+import gzip
+import json
+import os
+import sys
+import threading
+import time
+
+from mon_mcp.platform_api import (
+    key_action,
+    mouse_button,
+    mouse_scroll,
+    set_cursor_pos,
+    start_input_recorder,
+)
+from mon_mcp.tools.capture import _screen_signature, _signature_difference
+
+FORMAT_VERSION = 1
+
+# Intervalle minimum entre deux deplacements enregistres (secondes)
+MIN_MOVE_INTERVAL = 0.01
+
+# Session d'enregistrement en cours
+_recording: dict | None = None
+_recording_lock = threading.Lock()
+
+
+def _on_event(kind, *args):
+    """Callback des listeners: ajoute un evenement compact au journal courant."""
+    with _recording_lock:
+        rec = _recording
+        if rec is None or rec["fin"] is not None:
+            return
+        t = time.monotonic() - rec["debut"]
+        if kind == "move":
+            if t - rec["dernier_mouvement"] < MIN_MOVE_INTERVAL:
+                return
+            rec["dernier_mouvement"] = t
+            rec["evenements"].append([round(t, 3), "m", *args])
+        elif kind == "button":
+            x, y, button, pressed = args
+            rec["evenements"].append([round(t, 3), "b", x, y, button, int(pressed)])
+        elif kind == "scroll":
+            rec["evenements"].append([round(t, 3), "s", *args])
+        elif kind == "key":
+            name, pressed = args
+            rec["evenements"].append([round(t, 3), "k", name, int(pressed)])
+
+
+def _save_log(fichier: str, log: dict):
+    """Ecrit le journal (JSON compact, gzip si .gz)."""
+    data = json.dumps(log, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    if fichier.endswith(".gz"):
+        data = gzip.compress(data)
+    with open(fichier, "wb") as f:
+        f.write(data)
+
+
+def _load_log(fichier: str) -> dict:
+    """Lit un journal ecrit par _save_log."""
+    with open(fichier, "rb") as f:
+        data = f.read()
+    if data[:2] == b"\x1f\x8b":
+        data = gzip.decompress(data)
+    log = json.loads(data.decode("utf-8"))
+    if log.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Version de journal non supportee: {log.get('version')}")
+    return log
+
+
+def _replay(evenements: list, vitesse: float, verifier: bool, seuil: float) -> dict:
+    """
+    Rejoue les evenements selon leur horodatage divise par la vitesse.
+
+    Les deplacements deja en retard sur le suivant sont fusionnes, et les
+    touches/boutons restes enfonces sont relaches en cas d'interruption.
+    """
+    start = time.monotonic()
+    rejoues = 0
+    points_controle = []
+    pressed_keys = set()
+    pressed_buttons = {}
+    interrompu = None
+
+    try:
+        for i, event in enumerate(evenements):
+            t, kind = event[0], event[1]
+            target = start + t / vitesse
+            delay = target - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+            if kind == "m":
+                nxt = evenements[i + 1] if i + 1 < len(evenements) else None
+                if nxt and nxt[1] == "m" and start + nxt[0] / vitesse <= time.monotonic():
+                    continue
+                set_cursor_pos(event[2], event[3])
+            elif kind == "b":
+                _, _, x, y, button, pressed = event
+                mouse_button(x, y, button, bool(pressed))
+                if pressed:
+                    pressed_buttons[button] = (x, y)
+                else:
+                    pressed_buttons.pop(button, None)
+            elif kind == "s":
+                set_cursor_pos(event[2], event[3])
+                mouse_scroll(event[4])
+            elif kind == "k":
+                _, _, name, pressed = event
+                key_action(name, bool(pressed))
+                if pressed:
+                    pressed_keys.add(name)
+                else:
+                    pressed_keys.discard(name)
+            elif kind == "c":
+                if not verifier:
+                    continue
+                _, _, nom, signature = event
+                difference = _signature_difference(
+                    base64.b64decode(signature), _screen_signature()
+                )
+                ok = difference <= seuil
+                points_controle.append({
+                    "nom": nom,
+                    "difference": round(difference, 4),
+                    "ok": ok,
+                })
+                if not ok:
+                    interrompu = f"Point de controle '{nom}' different ({difference:.1%})"
+                    break
+                continue
+            rejoues += 1
+    finally:
+        for name in pressed_keys:
+            try:
+                key_action(name, False)
+            except Exception:
+                pass
+        for button, (x, y) in pressed_buttons.items():
+            try:
+                mouse_button(x, y, button, False)
+            except Exception:
+                pass
+
+    return {
+        "evenements_rejoues": rejoues,
+        "duree_secondes": round(time.monotonic() - start, 3),
+        "points_controle": points_controle,
+        "interrompu": interrompu,
+    }
+
+
+def demarrer_enregistrement() -> str:
+    """
+    Demarre l'enregistrement des entrees souris et clavier de l'utilisateur.
+
+    Returns:
+        Confirmation ou erreur si un enregistrement est deja en cours.
+    """
+    global _recording
+    with _recording_lock:
+        if _recording is not None:
+            return json.dumps(
+                {"erreur": "Un enregistrement est deja en cours."}, ensure_ascii=False
+            )
+        rec = {
+            "debut": time.monotonic(),
+            "dernier_mouvement": -MIN_MOVE_INTERVAL,
+            "evenements": [],
+            "stop": None,
+            "fin": None,
+        }
+        _recording = rec
+    try:
+        rec["stop"] = start_input_recorder(_on_event)
+    except Exception as e:
+        with _recording_lock:
+            _recording = None
+        return json.dumps({"erreur": str(e)}, ensure_ascii=False)
+
+    return json.dumps({
+        "enregistrement": "demarre",
+        "info": "Utilisez arreter_enregistrement(fichier) pour sauvegarder.",
+    }, ensure_ascii=False)
+
+
+def point_controle_enregistrement(nom: str = "") -> str:
+    """
+    Ajoute un point de controle (signature de l'ecran principal) a l'enregistrement.
+
+    Args:
+        nom: Nom du point de controle (defaut: numero d'ordre)
+
+    Returns:
+        Confirmation avec le nom du point de controle.
+    """
+    if _recording is None or _recording["fin"] is not None:
+        return json.dumps({"erreur": "Aucun enregistrement en cours."}, ensure_ascii=False)
+
+    try:
+        signature = base64.b64encode(_screen_signature()).decode("ascii")
+    except Exception as e:
+        return json.dumps({"erreur": f"Capture impossible: {e}"}, ensure_ascii=False)
+
+    with _recording_lock:
+        rec = _recording
+        if rec is None or rec["fin"] is not None:
+            return json.dumps({"erreur": "Aucun enregistrement en cours."}, ensure_ascii=False)
+        events = rec["evenements"]
+        nom = nom or f"point_{sum(1 for e in events if e[1] == 'c') + 1}"
+        t = time.monotonic() - rec["debut"]
+        events.append([round(t, 3), "c", nom, signature])
+
+    return json.dumps({"point_controle": nom, "temps": round(t, 3)}, ensure_ascii=False)
+
+
+def arreter_enregistrement(fichier: str) -> str:
+    """
+    Arrete l'enregistrement en cours et sauvegarde le journal.
+
+    Args:
+        fichier: Chemin du journal a creer (.json, ou .json.gz pour compresser)
+
+    Returns:
+        JSON avec le fichier, le nombre d'evenements et la duree.
+    """
+    global _recording
+    with _recording_lock:
+        rec = _recording
+        if rec is None:
+            return json.dumps({"erreur": "Aucun enregistrement en cours."}, ensure_ascii=False)
+        stop, rec["stop"] = rec["stop"], None
+
+    # Un enregistrement arrete mais non sauvegarde est conserve: un nouvel
+    # appel (autre fichier) retente la sauvegarde
+    if rec["fin"] is None:
+        try:
+            if stop:
+                stop()
+        finally:
+            rec["fin"] = time.monotonic()
+
+    duree = round(rec["fin"] - rec["debut"], 3)
+    log = {
+        "version": FORMAT_VERSION,
+        "plateforme": sys.platform,
+        "duree": duree,
+        "evenements": rec["evenements"],
+    }
+
+    try:
+        fichier = os.path.abspath(fichier)
+        os.makedirs(os.path.dirname(fichier), exist_ok=True)
+        _save_log(fichier, log)
+    except Exception as e:
+        return json.dumps({
+            "erreur": str(e),
+            "info": "Enregistrement conserve: rappelez arreter_enregistrement (autre fichier).",
+        }, ensure_ascii=False)
+
+    with _recording_lock:
+        if _recording is rec:
+            _recording = None
+
+    return json.dumps({
+        "fichier": fichier,
+        "evenements": len(rec["evenements"]),
+        "points_controle": sum(1 for e in rec["evenements"] if e[1] == "c"),
+        "duree_secondes": duree,
+        "taille_octets": os.path.getsize(fichier),
+    }, ensure_ascii=False)
+
+
+def rejouer_enregistrement(
+    fichier: str,
+    vitesse: float = 1.0,
+    verifier: bool = False,
+    seuil: float = 0.05,
+) -> str:
+    """
+    Rejoue un enregistrement d'entrees souris et clavier.
+
+    Args:
+        fichier: Chemin du journal cree par arreter_enregistrement
+        vitesse: Facteur de vitesse (1.0 = temps reel, 2.0 = deux fois plus vite, max: 50)
+        verifier: Compare l'ecran aux points de controle et s'arrete en cas d'ecart
+        seuil: Ecart maximum tolere pour un point de controle (0.0 a 1.0, defaut: 0.05)
+
+    Returns:
+        JSON avec le nombre d'evenements rejoues, la duree et les points de controle.
+    """
+    if _recording is not None:
+        return json.dumps(
+            {"erreur": "Arretez l'enregistrement en cours avant de rejouer."}, ensure_ascii=False
+        )
+
+    if vitesse <= 0:
+        return json.dumps({"erreur": "La vitesse doit etre positive."}, ensure_ascii=False)
+    vitesse = min(vitesse, 50.0)
+
+    fichier = os.path.abspath(fichier)
+    if not os.path.isfile(fichier):
+        return json.dumps({"erreur": f"Journal introuvable: {fichier}"}, ensure_ascii=False)
+
+    try:
+        log = _load_log(fichier)
+        result = _replay(log["evenements"], vitesse, verifier, seuil)
+    except Exception as e:
+        return json.dumps({"erreur": str(e)}, ensure_ascii=False)
+
+    return json.dumps({"fichier": fichier, "vitesse": vitesse, **result}, ensure_ascii=False)
+
+
+def register_tools(mcp):
+    mcp.add_tool(demarrer_enregistrement)
+    mcp.add_tool(point_controle_enregistrement)
+    mcp.add_tool(arreter_enregistrement)
+    mcp.add_tool(rejouer_enregistrement)
@@ -1,8 +1,81 @@
 """Outils MCP pour la gestion des fenetres."""
 
 import json
+import re
+import threading
+import time
 
-from mon_mcp.platform_api import list_windows, focus_window as _focus_window
+from mon_mcp.platform_api import list_windows, focus_window as _focus_window, watch_windows
+
+# Age max de la liste en cache (secondes). Les evenements du gestionnaire de
+# fenetres invalident le cache immediatement; le TTL couvre ce qu'ils ne
+# signalent pas (ex: changement de titre sous Linux).
+WINDOW_CACHE_TTL = 1.0
+
+# Intervalle de re-verification d'attendre_fenetre sans evenements (secondes)
+WINDOW_POLL_INTERVAL = 0.25
+
+# Registre des fenetres: liste en cache + surveillance des evenements
+_registry = {
+    "fenetres": None,
+    "horodatage": 0.0,
+    "generation": 0,
+    "surveillance": None,  # None = pas encore tente, False = indisponible
+}
+_registry_changed = threading.Condition()
+
+
+def _invalidate_windows():
+    """Callback des evenements fenetres: marque le cache perime et reveille les attentes."""
+    with _registry_changed:
+        _registry["fenetres"] = None
+        _registry["generation"] += 1
+        _registry_changed.notify_all()
+
+
+def _ensure_watch():
+    """Demarre la surveillance des evenements fenetres au premier usage."""
+    if _registry["surveillance"] is not None:
+        return
+    try:
+        _registry["surveillance"] = watch_windows(_invalidate_windows)
+    except Exception:
+        _registry["surveillance"] = False
+
+
+def _get_windows(max_age: float = WINDOW_CACHE_TTL) -> list[dict]:
+    """Retourne la liste des fenetres depuis le cache, rafraichie si perimee."""
+    _ensure_watch()
+    with _registry_changed:
+        windows = _registry["fenetres"]
+        if windows is not None and time.monotonic() - _registry["horodatage"] <= max_age:
+            return windows
+        generation = _registry["generation"]
+    windows = list_windows()
+    with _registry_changed:
+        # Un evenement survenu pendant la lecture peut la rendre perimee: ne
+        # la mettre en cache que si aucune invalidation n'a eu lieu entre-temps
+        if _registry["generation"] == generation:
+            _registry["fenetres"] = windows
+            _registry["horodatage"] = time.monotonic()
+    return windows
+
+
+def _window_filter(titre: str = "", pid: int = 0, classe: str = ""):
+    """Construit un predicat fenetre -> bool (titre = regex insensible a la casse)."""
+    pattern = re.compile(titre, re.IGNORECASE) if titre else None
+    classe_lower = classe.lower()
+
+    def match(win: dict) -> bool:
+        if pattern and not pattern.search(win.get("titre", "")):
+            return False
+        if pid and win.get("pid") != pid:
+            return False
+        if classe_lower and classe_lower not in (win.get("classe") or "").lower():
+            return False
+        return True
+
+    return match
 
 
 def liste_fenetres() -> str:
@@ -13,7 +86,7 @@ def liste_fenetres() -> str:
         La liste des fenetres avec leur titre et position.
     """
     try:
-        windows = list_windows()
+        windows = _get_windows()
         return json.dumps(windows, ensure_ascii=False, indent=2)
     except Exception as e:
         return f"Erreur: {str(e)}"
@@ -31,12 +104,89 @@ def focus_fenetre(titre: str) -> str:
     """
     try:
         activated = _focus_window(titre)
+        _invalidate_windows()
         return f"Fenetre '{activated}' activee"
     except Exception as e:
         return f"Erreur: {str(e)}"
 
 
+def chercher_fenetres(titre: str = "", pid: int = 0, classe: str = "") -> str:
+    """
+    Recherche des fenetres dans le registre (cache) par titre, processus ou classe.
+
+    Args:
+        titre: Expression reguliere sur le titre, insensible a la casse (ex: "rapport.*word")
+        pid: Identifiant du processus proprietaire (0 = ignore)
+        classe: Partie du nom de classe de la fenetre (ex: "firefox", "Notepad")
+
+    Returns:
+        JSON avec les fenetres correspondantes.
+    """
+    try:
+        match = _window_filter(titre, pid, classe)
+    except re.error as e:
+        return f"Erreur: expression reguliere invalide: {e}"
+
+    try:
+        found = [w for w in _get_windows() if match(w)]
+        return json.dumps({"total": len(found), "fenetres": found}, ensure_ascii=False)
+    except Exception as e:
+        return f"Erreur: {str(e)}"
+
+
+def attendre_fenetre(titre: str = "", pid: int = 0, classe: str = "", timeout: float = 10.0) -> str:
+    """
+    Attend qu'une fenetre correspondant aux criteres apparaisse.
+
+    Reveille sur les evenements du gestionnaire de fenetres quand ils sont
+    disponibles, sinon re-verifie periodiquement.
+
+    Args:
+        titre: Expression reguliere sur le titre, insensible a la casse
+        pid: Identifiant du processus proprietaire (0 = ignore)
+        classe: Partie du nom de classe de la fenetre
+        timeout: Duree max d'attente en secondes (defaut: 10, max: 300)
+
+    Returns:
+        JSON avec les fenetres trouvees, ou trouve=False apres le timeout.
+    """
+    if not (titre or pid or classe):
+        return "Erreur: precisez au moins un critere (titre, pid ou classe)"
+
+    try:
+        match = _window_filter(titre, pid, classe)
+    except re.error as e:
+        return f"Erreur: expression reguliere invalide: {e}"
+
+    timeout = min(max(0.0, timeout), 300.0)
+    start = time.monotonic()
+    deadline = start + timeout
+
+    try:
+        while True:
+            generation = _registry["generation"]
+            max_age = WINDOW_CACHE_TTL if _registry["surveillance"] else WINDOW_POLL_INTERVAL
+            found = [w for w in _get_windows(max_age) if match(w)]
+            remaining = deadline - time.monotonic()
+            if found or remaining <= 0:
+                return json.dumps({
+                    "trouve": bool(found),
+                    "attente_secondes": round(time.monotonic() - start, 3),
+                    "fenetres": found,
+                }, ensure_ascii=False)
+            wait = remaining if _registry["surveillance"] else WINDOW_POLL_INTERVAL
+            with _registry_changed:
+                _registry_changed.wait_for(
+                    lambda: _registry["generation"] != generation,
+                    min(wait, remaining, WINDOW_CACHE_TTL),
+                )
+    except Exception as e:
+        return f"Erreur: {str(e)}"
+
+
 def register_tools(mcp):
     """Enregistre les outils fenetres sur l'instance MCP."""
     mcp.add_tool(liste_fenetres)
     mcp.add_tool(focus_fenetre)
+    mcp.add_tool(chercher_fenetres)
+    mcp.add_tool(attendre_fenetre)
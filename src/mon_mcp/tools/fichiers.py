@@ -1,12 +1,27 @@
 """Outils MCP pour la gestion de fichiers."""
 
+import base64
+import codecs
+import errno
+import hashlib
 import json
+import mmap
 import os
-import sys
 import shutil
+import stat
+import sys
+import threading
+import time
+import uuid
+import zipfile
+from bisect import bisect_left
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
+from mon_mcp.platform_api import wait_file_change
+
 # Chemins systeme proteges contre la suppression
 if sys.platform == "win32":
     PROTECTED_PATHS = {
@@ -23,6 +38,97 @@ else:
 
 MAX_READ_SIZE = 10 * 1024 * 1024  # 10 MB
 
+# Lecture binaire (lire_binaire): portion max et signatures de types connus
+MAX_BINARY_READ = 1024 * 1024  # 1 MB
+MAGIC_NUMBERS = (
+    (0, b"\x89PNG\r\n\x1a\n", "image/png"),
+    (0, b"\xff\xd8\xff", "image/jpeg"),
+    (0, b"GIF87a", "image/gif"),
+    (0, b"GIF89a", "image/gif"),
+    (0, b"BM", "image/bmp"),
+    (0, b"II*\x00", "image/tiff"),
+    (0, b"MM\x00*", "image/tiff"),
+    (0, b"%PDF-", "application/pdf"),
+    (0, b"PK\x03\x04", "application/zip"),
+    (0, b"PK\x05\x06", "application/zip"),
+    (0, b"\x1f\x8b", "application/gzip"),
+    (0, b"BZh", "application/x-bzip2"),
+    (0, b"\xfd7zXZ\x00", "application/x-xz"),
+    (0, b"7z\xbc\xaf\x27\x1c", "application/x-7z-compressed"),
+    (0, b"Rar!\x1a\x07", "application/vnd.rar"),
+    (0, b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", "application/x-ole-storage"),
+    (0, b"SQLite format 3\x00", "application/vnd.sqlite3"),
+    (0, b"\x7fELF", "application/x-elf"),
+    (0, b"MZ", "application/x-msdownload"),
+    (0, b"OggS", "audio/ogg"),
+    (0, b"fLaC", "audio/flac"),
+    (0, b"ID3", "audio/mpeg"),
+    (0, b"\x1aE\xdf\xa3", "video/webm"),
+    (4, b"ftyp", "video/mp4"),
+    (0, b"wOFF", "font/woff"),
+    (0, b"wOF2", "font/woff2"),
+    (0, b"\xef\xbb\xbf", "text/plain; charset=utf-8-sig"),
+    (0, b"\xff\xfe", "text/plain; charset=utf-16-le"),
+    (0, b"\xfe\xff", "text/plain; charset=utf-16-be"),
+)
+# Tailles d'en-tete DIB des variantes BMP (BITMAPCOREHEADER a BITMAPV5HEADER)
+BMP_DIB_HEADER_SIZES = {12, 16, 40, 52, 56, 64, 108, 124}
+# Conteneurs zip reconnus par le nom de leur premiere entree
+ZIP_SUBTYPES = (
+    ("word/", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"),
+    ("xl/", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    ("ppt/", "application/vnd.openxmlformats-officedocument.presentationml.presentation"),
+    ("[Content_Types].xml", "application/vnd.openxmlformats-officedocument"),
+)
+
+# Index de lignes creux: nombre de sauts de ligne avant chaque bloc de 1 MB
+LINE_INDEX_BLOCK = 1024 * 1024
+LINE_INDEX_CACHE_SIZE = 32
+
+# Cache des index de lignes par chemin: (mtime_ns, taille, index)
+_line_index_cache: OrderedDict = OrderedDict()
+_line_index_lock = threading.Lock()
+
+# Suivi de fichiers (suivre_fichier): chemin -> {"inode": (dev, ino), "offset": int},
+# les fichiers suivis le moins recemment sont oublies au-dela de la limite
+MAX_FOLLOWED_FILES = 256
+_follow_state: OrderedDict[str, dict] = OrderedDict()
+_follow_lock = threading.Lock()
+
+# Intervalle de re-verification quand la notification systeme est indisponible
+FOLLOW_POLL_INTERVAL = 0.2
+
+# Moteur de copie
+COPY_BUFFER_SIZE = 8 * 1024 * 1024  # tampon du repli userspace
+COPY_CHUNK_SIZE = 1024 * 1024 * 1024  # par appel copy_file_range/sendfile
+COPY_WORKERS = min(32, (os.cpu_count() or 4) * 2)
+FICLONE = 0x40049409  # ioctl Linux de clonage (reflink: btrfs, xfs, ...)
+# Modes d'ecriture et sessions d'ecriture par morceaux (id -> etat)
+WRITE_MODES = ("ecraser", "ajouter")
+MAX_WRITE_SESSIONS = 32
+# Une session sans activite depuis ce delai est fermee et son temporaire supprime
+WRITE_SESSION_IDLE_TIMEOUT = 600.0
+_write_sessions: dict[str, dict] = {}
+_write_sessions_lock = threading.Lock()
+
+# Suppression: nombre max de sous-arborescences supprimees en parallele
+DELETE_WORKERS = min(16, (os.cpu_count() or 4) * 2)
+
+# Operations par lot: nom -> champs requis (alias anglais acceptes)
+BATCH_OPERATIONS = {
+    "copier": ("source", "destination"),
+    "deplacer": ("source", "destination"),
+    "supprimer": ("chemin",),
+    "creer_repertoire": ("chemin",),
+}
+BATCH_ALIASES = {"copy": "copier", "move": "deplacer", "delete": "supprimer",
+                 "mkdir": "creer_repertoire"}
+MAX_BATCH_OPERATIONS = 10000
+
+# Erreurs signifiant "methode non supportee ici", on passe a la suivante
+_COPY_FALLBACK_ERRNOS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP,
+                         errno.ENOTTY, errno.EBADF, errno.EPERM}
+
 
 def _is_protected_path(chemin: str) -> bool:
     """Verifie si un chemin est protege."""
@@ -51,16 +157,148 @@ def _format_size(size_bytes: int) -> str:
     return f"{size_bytes:.1f} Po"
 
 
-def lire_fichier(chemin: str, encodage: str = "utf-8") -> str:
+def _line_index(path: Path, mm: mmap.mmap, stat: os.stat_result) -> list[int]:
+    """
+    Retourne l'index creux des lignes d'un fichier (cache par mtime + taille).
+
+    index[i] = nombre de sauts de ligne avant l'octet i * LINE_INDEX_BLOCK;
+    le dernier element est le total de sauts de ligne du fichier.
     """
-    Lit le contenu d'un fichier texte.
+    key = str(path.resolve())
+    with _line_index_lock:
+        cached = _line_index_cache.get(key)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            _line_index_cache.move_to_end(key)
+            return cached[2]
+
+    index = [0]
+    total = 0
+    for start in range(0, stat.st_size, LINE_INDEX_BLOCK):
+        total += mm[start:start + LINE_INDEX_BLOCK].count(b"\n")
+        index.append(total)
+
+    with _line_index_lock:
+        _line_index_cache[key] = (stat.st_mtime_ns, stat.st_size, index)
+        _line_index_cache.move_to_end(key)
+        while len(_line_index_cache) > LINE_INDEX_CACHE_SIZE:
+            _line_index_cache.popitem(last=False)
+    return index
+
+
+def _line_offset(mm: mmap.mmap, index: list[int], line: int) -> int:
+    """Offset du debut de la ligne `line` (1-based), ou -1 si au-dela de la fin."""
+    skip = line - 1
+    if skip <= 0:
+        return 0
+    if skip > index[-1]:
+        return -1
+    # Bloc contenant le skip-ieme saut de ligne
+    block = bisect_left(index, skip) - 1
+    pos = block * LINE_INDEX_BLOCK
+    for _ in range(skip - index[block]):
+        pos = mm.find(b"\n", pos) + 1
+    return pos
+
+
+def _skip_lines(mm: mmap.mmap, start: int, count: int, limit: int) -> int:
+    """Avance de `count` lignes depuis `start` sans depasser `limit` octets."""
+    end = start
+    stop = min(len(mm), start + limit)
+    for _ in range(count):
+        nxt = mm.find(b"\n", end, stop)
+        if nxt < 0:
+            return stop
+        end = nxt + 1
+    return end
+
+
+def _tail_offset(mm: mmap.mmap, count: int) -> int:
+    """Offset du debut des `count` dernieres lignes."""
+    pos = len(mm)
+    if pos and mm[pos - 1:pos] == b"\n":
+        pos -= 1
+    for _ in range(count):
+        pos = mm.rfind(b"\n", 0, pos)
+        if pos < 0:
+            return 0
+    return pos + 1
+
+
+def _read_range(
+    path: Path,
+    encodage: str,
+    debut_ligne: int,
+    nb_lignes: int,
+    debut_octet: int,
+    nb_octets: int,
+    dernieres_lignes: int,
+) -> dict:
+    """Lit une portion de fichier via mmap (octets, lignes ou fin de fichier)."""
+    stat = path.stat()
+    result = {"fichier": str(path.resolve()), "taille": _format_size(stat.st_size)}
+    if stat.st_size == 0:
+        return {**result, "contenu": "", "tronque": False}
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        size = len(mm)
+        if debut_octet >= 0:
+            start = min(debut_octet, size)
+            length = min(nb_octets or MAX_READ_SIZE, MAX_READ_SIZE)
+            end = min(size, start + length)
+            result.update({"debut_octet": start, "fin_octet": end})
+        elif dernieres_lignes > 0:
+            start = _tail_offset(mm, dernieres_lignes)
+            end = size
+            if end - start > MAX_READ_SIZE:
+                start = end - MAX_READ_SIZE
+            result.update({"dernieres_lignes": dernieres_lignes, "debut_octet": start})
+        else:
+            index = _line_index(path, mm, stat)
+            total = index[-1] + (0 if mm[size - 1:size] == b"\n" else 1)
+            start = _line_offset(mm, index, debut_ligne)
+            if start < 0:
+                return {**result, "lignes": total, "contenu": "", "tronque": False}
+            end = _skip_lines(mm, start, nb_lignes or total, MAX_READ_SIZE)
+            result.update({"debut_ligne": debut_ligne, "lignes": total})
+
+        chunk = mm[start:end]
+
+    content = chunk.decode(encodage, errors="replace")
+    if "debut_ligne" in result:
+        result["fin_ligne"] = debut_ligne + chunk.count(b"\n") - (1 if chunk.endswith(b"\n") else 0)
+    result["contenu"] = content
+    result["tronque"] = end - start >= MAX_READ_SIZE
+    return result
+
+
+def lire_fichier(
+    chemin: str,
+    encodage: str = "utf-8",
+    debut_ligne: int = 0,
+    nb_lignes: int = 0,
+    debut_octet: int = -1,
+    nb_octets: int = 0,
+    dernieres_lignes: int = 0,
+) -> str:
+    """
+    Lit le contenu d'un fichier texte, en entier ou par portion.
+
+    Les lectures partielles passent par mmap et un index de lignes en cache:
+    elles fonctionnent sur des fichiers de plusieurs Go (portion max: 10 MB).
 
     Args:
         chemin: Chemin du fichier a lire
         encodage: Encodage du fichier (defaut: utf-8)
+        debut_ligne: Premiere ligne a lire, a partir de 1 (0 = fichier entier)
+        nb_lignes: Nombre de lignes a lire depuis debut_ligne (0 = jusqu'a la fin)
+        debut_octet: Offset en octets du debut de lecture (-1 = non utilise)
+        nb_octets: Nombre d'octets a lire depuis debut_octet (0 = jusqu'a 10 MB)
+        dernieres_lignes: Lit seulement les N dernieres lignes (mode tail)
 
     Returns:
-        Le contenu du fichier ou un message d'erreur.
+        JSON (lecture entiere ou partielle) avec le fichier, sa taille, le
+        nombre total de lignes quand il est connu, le contenu et "tronque";
+        les lectures partielles ajoutent les bornes lues. Message d'erreur sinon.
     """
     try:
         path = Path(chemin)
@@ -69,27 +307,307 @@ def lire_fichier(chemin: str, encodage: str = "utf-8") -> str:
         if not path.is_file():
             return f"Erreur: '{chemin}' n'est pas un fichier"
 
+        if debut_ligne > 0 or debut_octet >= 0 or dernieres_lignes > 0:
+            result = _read_range(
+                path, encodage, debut_ligne, nb_lignes, debut_octet, nb_octets, dernieres_lignes
+            )
+            return json.dumps(result, ensure_ascii=False)
+
         size = path.stat().st_size
         if size > MAX_READ_SIZE:
             return (
                 f"Erreur: le fichier fait {_format_size(size)} "
-                f"(limite: {_format_size(MAX_READ_SIZE)})"
+                f"(limite: {_format_size(MAX_READ_SIZE)}). "
+                f"Utilisez debut_ligne/nb_lignes, debut_octet/nb_octets ou dernieres_lignes."
             )
 
         content = path.read_text(encoding=encodage)
         return json.dumps({
             "fichier": str(path.resolve()),
             "taille": _format_size(size),
-            "lignes": content.count("\n") + 1,
+            "lignes": content.count("\n") + (1 if content[-1:] not in ("", "\n") else 0),
             "contenu": content,
+            "tronque": False,
         }, ensure_ascii=False)
     except UnicodeDecodeError:
-        return f"Erreur: impossible de lire '{chemin}' avec l'encodage {encodage} (fichier binaire ?)"
+        return (
+            f"Erreur: impossible de lire '{chemin}' avec l'encodage {encodage} "
+            f"(fichier binaire ? utilisez lire_binaire)"
+        )
     except Exception as e:
         return f"Erreur: {str(e)}"
 
 
-def ecrire_fichier(chemin: str, contenu: str, encodage: str = "utf-8") -> str:
+def _is_bmp(head: bytes) -> bool:
+    """En-tete BMP: "BM" suivi d'une en-tete DIB de taille connue (offset 14)."""
+    return len(head) >= 18 and int.from_bytes(head[14:18], "little") in BMP_DIB_HEADER_SIZES
+
+
+def _is_pe(head: bytes) -> bool:
+    """Executable MZ dont l'offset e_lfanew (0x3C) pointe sur la signature "PE\\0\\0"."""
+    if len(head) < 64:
+        return False
+    pe_offset = int.from_bytes(head[0x3C:0x40], "little")
+    if not 64 <= pe_offset < 0x10000:
+        return False
+    # Signature au-dela de l'echantillon lu: on s'en tient a l'offset plausible
+    return pe_offset + 4 > len(head) or head[pe_offset:pe_offset + 4] == b"PE\0\0"
+
+
+# Signatures courtes confirmees par la structure de l'en-tete
+MAGIC_VALIDATORS = {"image/bmp": _is_bmp, "application/x-msdownload": _is_pe}
+
+
+def _zip_subtype(path: str | None, head: bytes) -> str | None:
+    """
+    Type d'une archive zip d'apres les noms de ses entrees (repertoire central):
+    documents Office (OOXML), ou contenu de l'entree "mimetype" (EPUB,
+    OpenDocument). Sans archive lisible, seuls les noms presents dans
+    l'echantillon sont examines.
+    """
+    names = None
+    if path is not None:
+        try:
+            with zipfile.ZipFile(path) as zf:
+                names = zf.namelist()
+                if "mimetype" in names:
+                    declared = zf.read("mimetype")[:100].decode("ascii", "replace").strip()
+                    if declared.startswith("application/"):
+                        return declared
+        except (OSError, zipfile.BadZipFile):
+            names = None
+    for prefix, subtype in ZIP_SUBTYPES:
+        if names is None:
+            if prefix.encode("ascii") in head:
+                return subtype
+        elif any(name.startswith(prefix) for name in names):
+            return subtype
+    return None
+
+
+def _detect_type(head: bytes, path: str | None = None) -> str:
+    """
+    Devine le type d'un fichier a partir de ses premiers octets (nombre
+    magique); `path` permet de lire la liste des entrees d'une archive zip.
+    """
+    for offset, magic, mime in MAGIC_NUMBERS:
+        if head[offset:offset + len(magic)] == magic:
+            validator = MAGIC_VALIDATORS.get(mime)
+            if validator is not None and not validator(head):
+                continue
+            if mime == "application/zip":
+                return _zip_subtype(path, head) or mime
+            return mime
+    if head[:4] == b"RIFF":
+        return {b"WAVE": "audio/wav", b"WEBP": "image/webp", b"AVI ": "video/x-msvideo"}.get(
+            head[8:12], "application/octet-stream")
+    if not head:
+        return "inode/x-empty"
+    if b"\x00" in head:
+        return "application/octet-stream"
+    try:
+        head.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # Un caractere multi-octets coupe en fin d'echantillon reste du texte
+        if e.start < len(head) - 3:
+            return "application/octet-stream"
+    return "text/plain"
+
+
+def _hex_dump(data: bytes, offset: int) -> str:
+    """Formate des octets en vidage hexadecimal (offset, 16 octets, ASCII)."""
+    lines = []
+    for i in range(0, len(data), 16):
+        row = data[i:i + 16]
+        hexa = " ".join(f"{b:02x}" for b in row)
+        text = "".join(chr(b) if 32 <= b < 127 else "." for b in row)
+        lines.append(f"{offset + i:08x}  {hexa:<47}  {text}")
+    return "\n".join(lines)
+
+
+def lire_binaire(
+    chemin: str,
+    debut: int = 0,
+    nb_octets: int = 4096,
+    encodage_sortie: str = "base64",
+) -> str:
+    """
+    Lit une portion d'un fichier binaire (image, archive, executable...) sans
+    charger le fichier entier, et detecte son type par nombre magique.
+
+    Args:
+        chemin: Chemin du fichier
+        debut: Offset de depart en octets (negatif = depuis la fin, ex: -512)
+        nb_octets: Nombre d'octets a lire (defaut: 4096, max: 1 MB; 0 = detection seule)
+        encodage_sortie: "base64" ou "hex" (vidage hexadecimal lisible)
+
+    Returns:
+        JSON avec le type detecte, la taille, la portion lue et son encodage.
+    """
+    if encodage_sortie not in ("base64", "hex"):
+        return f"Erreur: encodage_sortie inconnu '{encodage_sortie}'. Valeurs: base64, hex"
+
+    try:
+        path = Path(chemin)
+        if not path.exists():
+            return f"Erreur: le fichier '{chemin}' n'existe pas"
+        if not path.is_file():
+            return f"Erreur: '{chemin}' n'est pas un fichier"
+
+        size = path.stat().st_size
+        length = min(max(0, nb_octets), MAX_BINARY_READ)
+        if size == 0:
+            head, chunk, start = b"", b"", 0
+        else:
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                size = len(mm)
+                start = max(0, size + debut) if debut < 0 else min(debut, size)
+                head = mm[:512]
+                chunk = mm[start:start + length]
+
+        result = {
+            "fichier": str(path.resolve()),
+            "taille": size,
+            "type": _detect_type(head, str(path)),
+            "debut": start,
+            "nb_octets": len(chunk),
+            "tronque": start + len(chunk) < size,
+            "encodage_sortie": encodage_sortie,
+        }
+        if length:
+            if encodage_sortie == "base64":
+                result["donnees"] = base64.b64encode(chunk).decode("ascii")
+            else:
+                result["donnees"] = _hex_dump(chunk, start)
+        return json.dumps(result, ensure_ascii=False)
+    except Exception as e:
+        return f"Erreur: {str(e)}"
+
+
+def _wait_for_growth(path: str, offset: int, ident: tuple, timeout: float) -> bool:
+    """Attend que le fichier depasse `offset` ou soit remplace (rotation)."""
+    def grown() -> bool:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return False  # rotation en cours: le nouveau fichier n'existe pas encore
+        return (st.st_dev, st.st_ino) != ident or st.st_size != offset
+
+    deadline = time.monotonic() + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        try:
+            # grown() est re-verifie une fois la surveillance en place: une
+            # ecriture survenue juste avant n'est pas manquee
+            changed = wait_file_change(path, remaining, recheck=grown)
+        except (NotImplementedError, OSError):
+            time.sleep(min(FOLLOW_POLL_INTERVAL, remaining))
+            changed = True
+        if not changed:
+            return False
+        if grown():
+            return True
+
+
+def suivre_fichier(
+    chemin: str,
+    timeout: float = 0.0,
+    depuis_debut: bool = False,
+    encodage: str = "utf-8",
+) -> str:
+    """
+    Retourne uniquement ce qui a ete ajoute a un fichier depuis l'appel precedent (tail -f).
+
+    La position est memorisee par fichier; une rotation (nouveau fichier) ou
+    une troncature est detectee et la lecture reprend au debut.
+
+    Args:
+        chemin: Chemin du fichier a suivre (ex: un log)
+        timeout: Attente max de nouvelles donnees en secondes (0 = retour immediat, max: 300)
+        depuis_debut: Au premier appel, lire depuis le debut au lieu de la fin actuelle
+        encodage: Encodage du fichier (defaut: utf-8)
+
+    Returns:
+        JSON avec le contenu ajoute, l'offset courant et un indicateur de rotation.
+    """
+    try:
+        codecs.lookup(encodage)
+    except LookupError:
+        return f"Erreur: encodage inconnu '{encodage}'"
+
+    try:
+        path = Path(chemin)
+        if not path.is_file():
+            return f"Erreur: le fichier '{chemin}' n'existe pas"
+
+        key = str(path.resolve())
+        start_time = time.monotonic()
+        st = os.stat(key)
+        ident = (st.st_dev, st.st_ino)
+        with _follow_lock:
+            state = _follow_state.get(key)
+        rotation = False
+
+        if state is None:
+            offset = 0 if depuis_debut else st.st_size
+        elif state["inode"] != ident or st.st_size < state["offset"]:
+            rotation = True
+            offset = 0
+        else:
+            offset = state["offset"]
+
+        timeout = min(max(0.0, timeout), 300.0)
+        if st.st_size <= offset and timeout > 0:
+            if _wait_for_growth(key, offset, ident, timeout):
+                st = os.stat(key)
+                if (st.st_dev, st.st_ino) != ident or st.st_size < offset:
+                    rotation = True
+                    offset = 0
+                ident = (st.st_dev, st.st_ino)
+
+        with open(key, "rb") as f:
+            f.seek(offset)
+            data = f.read(MAX_READ_SIZE)
+
+        # Ne pas couper un caractere multi-octets: les octets en attente
+        # seront relus au prochain appel.
+        decoder = codecs.getincrementaldecoder(encodage)(errors="replace")
+        content = decoder.decode(data, final=False)
+        consumed = len(data) - len(decoder.getstate()[0])
+        offset += consumed
+        with _follow_lock:
+            _follow_state[key] = {"inode": ident, "offset": offset}
+            _follow_state.move_to_end(key)
+            while len(_follow_state) > MAX_FOLLOWED_FILES:
+                _follow_state.popitem(last=False)
+
+        return json.dumps({
+            "fichier": key,
+            "offset": offset,
+            "nouveaux_octets": consumed,
+            "rotation": rotation,
+            "attente_secondes": round(time.monotonic() - start_time, 3),
+            "contenu": content,
+        }, ensure_ascii=False)
+    except Exception as e:
+        return f"Erreur: {str(e)}"
+
+
+def _temp_path(path: Path) -> Path:
+    """Chemin temporaire cache, dans le meme dossier que la cible (rename atomique)."""
+    return path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+
+
+def ecrire_fichier(
+    chemin: str,
+    contenu: str,
+    encodage: str = "utf-8",
+    mode: str = "ecraser",
+    position: int = -1,
+    atomique: bool = False,
+) -> str:
     """
     Ecrit ou cree un fichier texte.
 
@@ -97,43 +615,451 @@ def ecrire_fichier(chemin: str, contenu: str, encodage: str = "utf-8") -> str:
         chemin: Chemin du fichier a creer/ecrire
         contenu: Contenu a ecrire
         encodage: Encodage du fichier (defaut: utf-8)
+        mode: "ecraser" (remplace le contenu) ou "ajouter" (ecrit a la fin)
+        position: Si >= 0, ecrit le contenu a cet octet sans tronquer le reste
+                  du fichier (ignore le mode)
+        atomique: Ecrit dans un fichier temporaire puis le renomme: la cible
+                  n'est jamais visible a moitie ecrite (mode "ecraser" uniquement)
 
     Returns:
         Confirmation avec la taille du fichier.
     """
+    if mode not in WRITE_MODES:
+        return f"Erreur: mode inconnu '{mode}'. Modes: {', '.join(WRITE_MODES)}"
+    if atomique and (mode != "ecraser" or position >= 0):
+        return "Erreur: l'ecriture atomique n'est possible qu'en mode 'ecraser' sans position"
+
     try:
         path = Path(chemin)
         path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(contenu, encoding=encodage)
+        if position >= 0:
+            data = contenu.encode(encodage)
+            with open(path, "r+b" if path.exists() else "wb") as f:
+                f.seek(position)
+                f.write(data)
+        elif atomique:
+            tmp = _temp_path(path)
+            try:
+                with open(tmp, "w", encoding=encodage) as f:
+                    f.write(contenu)
+                    f.flush()
+                    os.fsync(f.fileno())
+                if path.exists():
+                    shutil.copymode(path, tmp)
+                os.replace(tmp, path)
+            except BaseException:
+                tmp.unlink(missing_ok=True)
+                raise
+        elif mode == "ajouter":
+            with open(path, "a", encoding=encodage) as f:
+                f.write(contenu)
+        else:
+            path.write_text(contenu, encoding=encodage)
         size = path.stat().st_size
         return f"Fichier ecrit: '{path.resolve()}' ({_format_size(size)})"
     except Exception as e:
         return f"Erreur: {str(e)}"
 
 
-def copier_fichier(source: str, destination: str) -> str:
+def ouvrir_ecriture(
+    chemin: str,
+    encodage: str = "utf-8",
+    mode: str = "ecraser",
+    atomique: bool = True,
+) -> str:
+    """
+    Ouvre une session d'ecriture par morceaux, pour produire un gros fichier
+    en plusieurs appels (ajouter_ecriture) puis le valider (valider_ecriture).
+    Une session inactive pendant 10 minutes est annulee.
+
+    Args:
+        chemin: Chemin du fichier a produire
+        encodage: Encodage du fichier (defaut: utf-8)
+        mode: "ecraser" (repart de zero) ou "ajouter" (continue le fichier existant)
+        atomique: Ecrit dans un fichier temporaire renomme a la validation
+                  (defaut: True); sinon les morceaux vont directement dans le fichier
+
+    Returns:
+        JSON avec l'identifiant de session.
+    """
+    if mode not in WRITE_MODES:
+        modes = ", ".join(WRITE_MODES)
+        return json.dumps({"erreur": f"mode inconnu '{mode}'. Modes: {modes}"}, ensure_ascii=False)
+    try:
+        encoder = codecs.getincrementalencoder(encodage)()
+    except LookupError:
+        return json.dumps({"erreur": f"encodage inconnu '{encodage}'"}, ensure_ascii=False)
+
+    _expire_write_sessions()
+    with _write_sessions_lock:
+        if len(_write_sessions) >= MAX_WRITE_SESSIONS:
+            return json.dumps(
+                {"erreur": f"trop de sessions ouvertes (max {MAX_WRITE_SESSIONS})"},
+                ensure_ascii=False,
+            )
+
+    try:
+        path = Path(chemin).resolve()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        target = _temp_path(path) if atomique else path
+        if atomique and mode == "ajouter" and path.exists():
+            _copy_file_data(str(path), str(target))
+        handle = open(target, "ab" if mode == "ajouter" else "wb")
+        if mode == "ajouter" and handle.tell() > 0:
+            # Pas de BOM au milieu d'un fichier existant: on le consomme a vide
+            encoder.encode("")
+    except Exception as e:
+        return json.dumps({"erreur": str(e)}, ensure_ascii=False)
+
+    session = uuid.uuid4().hex[:12]
+    with _write_sessions_lock:
+        _write_sessions[session] = {
+            "chemin": path,
+            "temporaire": target if atomique else None,
+            "fichier": handle,
+            "encodeur": encoder,
+            "morceaux": 0,
+            "activite": time.monotonic(),
+            "lock": threading.Lock(),
+        }
+    return json.dumps(
+        {"session": session, "chemin": str(path), "atomique": atomique}, ensure_ascii=False
+    )
+
+
+def _close_write_session(state: dict) -> None:
+    """Ferme le fichier d'une session abandonnee et supprime son temporaire."""
+    with state["lock"]:
+        state["fichier"].close()
+        if state["temporaire"] is not None:
+            state["temporaire"].unlink(missing_ok=True)
+
+
+def _expire_write_sessions() -> None:
+    """Annule les sessions d'ecriture inactives depuis WRITE_SESSION_IDLE_TIMEOUT."""
+    now = time.monotonic()
+    with _write_sessions_lock:
+        expired = [
+            sid for sid, st in _write_sessions.items()
+            if now - st["activite"] > WRITE_SESSION_IDLE_TIMEOUT
+        ]
+        states = [_write_sessions.pop(sid) for sid in expired]
+    for state in states:
+        _close_write_session(state)
+
+
+def _get_write_session(session: str) -> dict | None:
+    """Retourne l'etat d'une session d'ecriture ouverte (None si inconnue ou expiree)."""
+    _expire_write_sessions()
+    with _write_sessions_lock:
+        state = _write_sessions.get(session)
+        if state is not None:
+            state["activite"] = time.monotonic()
+        return state
+
+
+def ajouter_ecriture(session: str, contenu: str) -> str:
+    """
+    Ajoute un morceau de contenu a une session d'ecriture ouverte.
+
+    Args:
+        session: Identifiant retourne par ouvrir_ecriture
+        contenu: Morceau de texte a ajouter
+
+    Returns:
+        JSON avec le nombre d'octets ecrits et la taille totale.
+    """
+    state = _get_write_session(session)
+    if state is None:
+        return json.dumps({"erreur": f"session inconnue '{session}'"}, ensure_ascii=False)
+    try:
+        with state["lock"]:
+            data = state["encodeur"].encode(contenu)
+            state["fichier"].write(data)
+            state["morceaux"] += 1
+            total = state["fichier"].tell()
+    except Exception as e:
+        return json.dumps({"erreur": str(e)}, ensure_ascii=False)
+    return json.dumps({"octets_ecrits": len(data), "taille": total, "morceaux": state["morceaux"]})
+
+
+def valider_ecriture(session: str) -> str:
+    """
+    Termine une session d'ecriture: le fichier est synchronise sur disque puis,
+    en mode atomique, renomme a sa place definitive.
+
+    Args:
+        session: Identifiant retourne par ouvrir_ecriture
+
+    Returns:
+        JSON avec le chemin et la taille finale du fichier.
+    """
+    with _write_sessions_lock:
+        state = _write_sessions.pop(session, None)
+    if state is None:
+        return json.dumps({"erreur": f"session inconnue '{session}'"}, ensure_ascii=False)
+
+    path, tmp, handle = state["chemin"], state["temporaire"], state["fichier"]
+    try:
+        with state["lock"]:
+            handle.write(state["encodeur"].encode("", final=True))
+            handle.flush()
+            os.fsync(handle.fileno())
+            handle.close()
+            if tmp is not None:
+                if path.exists():
+                    shutil.copymode(path, tmp)
+                os.replace(tmp, path)
+    except Exception as e:
+        handle.close()
+        if tmp is not None:
+            tmp.unlink(missing_ok=True)
+        return json.dumps({"erreur": str(e)}, ensure_ascii=False)
+    return json.dumps({
+        "fichier": str(path),
+        "taille": path.stat().st_size,
+        "morceaux": state["morceaux"],
+    }, ensure_ascii=False)
+
+
+def annuler_ecriture(session: str) -> str:
+    """
+    Abandonne une session d'ecriture. En mode atomique, le fichier cible
+    reste intact; sinon les morceaux deja ecrits sont conserves.
+
+    Args:
+        session: Identifiant retourne par ouvrir_ecriture
+
+    Returns:
+        JSON de confirmation.
+    """
+    with _write_sessions_lock:
+        state = _write_sessions.pop(session, None)
+    if state is None:
+        return json.dumps({"erreur": f"session inconnue '{session}'"}, ensure_ascii=False)
+    _close_write_session(state)
+    return json.dumps({"session": session, "annulee": True})
+
+
+def _copy_file_data(src: str, dst: str) -> tuple[int, str]:
+    """
+    Copie le contenu d'un fichier avec la methode la plus rapide disponible:
+    reflink (FICLONE), copy_file_range, sendfile, puis tampon userspace.
+
+    Returns:
+        (octets copies, methode utilisee).
+    """
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        in_fd, out_fd = fsrc.fileno(), fdst.fileno()
+        size = os.fstat(in_fd).st_size
+
+        if sys.platform == "linux":
+            import fcntl
+            try:
+                fcntl.ioctl(out_fd, FICLONE, in_fd)
+                return size, "reflink"
+            except OSError as e:
+                if e.errno not in _COPY_FALLBACK_ERRNOS:
+                    raise
+
+            for method in ("copy_file_range", "sendfile"):
+                if not hasattr(os, method):
+                    continue
+                copied = 0
+                try:
+                    while True:
+                        if method == "copy_file_range":
+                            n = os.copy_file_range(in_fd, out_fd, COPY_CHUNK_SIZE)
+                        else:
+                            n = os.sendfile(out_fd, in_fd, None, COPY_CHUNK_SIZE)
+                        if n == 0:
+                            if copied == 0 and size > 0:
+                                break  # rien copie (ex: /proc, FUSE): methode suivante
+                            return copied, method
+                        copied += n
+                except OSError as e:
+                    if copied or e.errno not in _COPY_FALLBACK_ERRNOS:
+                        raise
+
+        shutil.copyfileobj(fsrc, fdst, COPY_BUFFER_SIZE)
+        return size, "tampon"
+
+
+def _copy2_fast(src: str, dst: str) -> str:
+    """Equivalent de shutil.copy2 base sur _copy_file_data (compatible shutil.move)."""
+    if os.path.isdir(dst):
+        dst = os.path.join(dst, os.path.basename(src))
+    _copy_file_data(src, dst)
+    shutil.copystat(src, dst)
+    return dst
+
+
+def _file_digest(chemin: str) -> bytes:
+    """Empreinte BLAKE2b du contenu d'un fichier."""
+    h = hashlib.blake2b()
+    with open(chemin, "rb") as f:
+        while chunk := f.read(COPY_BUFFER_SIZE):
+            h.update(chunk)
+    return h.digest()
+
+
+def _is_unchanged(src: str, src_stat: os.stat_result, dst: str, comparaison: str) -> bool:
+    """Vrai si la destination est deja a jour (taille + date, ou contenu)."""
+    try:
+        dst_stat = os.stat(dst)
+    except FileNotFoundError:
+        return False
+    if dst_stat.st_size != src_stat.st_size:
+        return False
+    if comparaison == "contenu":
+        return _file_digest(src) == _file_digest(dst)
+    return int(dst_stat.st_mtime) == int(src_stat.st_mtime)
+
+
+def _copy_tree(
+    source: str,
+    destination: str,
+    synchroniser: bool = False,
+    comparaison: str = "date",
+    threads: int = COPY_WORKERS,
+) -> dict:
+    """
+    Copie une arborescence: parcours scandir, fichiers copies en parallele
+    sur un pool de threads (nombre de taches en vol borne).
+    """
+    real_src = os.path.realpath(source)
+    real_dst = os.path.realpath(destination)
+    if real_dst == real_src or real_dst.startswith(real_src.rstrip(os.sep) + os.sep):
+        raise ValueError(f"'{destination}' est a l'interieur de '{source}'")
+
+    stats = {"fichiers_copies": 0, "fichiers_inchanges": 0, "dossiers": 0,
+             "octets": 0, "erreurs": []}
+    lock = threading.Lock()
+
+    def copy_one(src: str, dst: str, st: os.stat_result):
+        try:
+            if synchroniser and _is_unchanged(src, st, dst, comparaison):
+                with lock:
+                    stats["fichiers_inchanges"] += 1
+                return
+            copied, _ = _copy_file_data(src, dst)
+            shutil.copystat(src, dst)
+            with lock:
+                stats["fichiers_copies"] += 1
+                stats["octets"] += copied
+        except OSError as e:
+            with lock:
+                stats["erreurs"].append(f"{src}: {e}")
+
+    dirs = []
+    pending = deque()
+    max_pending = threads * 4
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        stack = [(source, destination)]
+        while stack:
+            src_dir, dst_dir = stack.pop()
+            # Lister la source avant de creer la destination
+            try:
+                with os.scandir(src_dir) as it:
+                    entries = list(it)
+            except OSError as e:
+                stats["erreurs"].append(f"{src_dir}: {e}")
+                continue
+            os.makedirs(dst_dir, exist_ok=True)
+            dirs.append((src_dir, dst_dir))
+            for entry in entries:
+                dst = os.path.join(dst_dir, entry.name)
+                if entry.is_dir():
+                    stack.append((entry.path, dst))
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError as e:
+                    stats["erreurs"].append(f"{entry.path}: {e}")
+                    continue
+                pending.append(executor.submit(copy_one, entry.path, dst, st))
+                if len(pending) >= max_pending:
+                    pending.popleft().result()
+        for future in pending:
+            future.result()
+
+    # Dates des dossiers appliquees apres leur contenu, des feuilles vers la racine
+    for src_dir, dst_dir in reversed(dirs):
+        try:
+            shutil.copystat(src_dir, dst_dir)
+        except OSError:
+            pass
+    stats["dossiers"] = len(dirs)
+    return stats
+
+
+def copier_fichier(
+    source: str,
+    destination: str,
+    synchroniser: bool = False,
+    comparaison: str = "date",
+    threads: int = 0,
+) -> str:
     """
     Copie un fichier ou repertoire.
 
+    Utilise le clonage (reflink) ou la copie noyau quand le systeme de fichiers
+    le permet, et copie les petits fichiers d'un repertoire en parallele.
+
     Args:
         source: Chemin source
         destination: Chemin destination
+        synchroniser: Mode synchronisation: destination existante autorisee, fichiers
+                      deja a jour ignores
+        comparaison: Detection des fichiers a jour: "date" (taille + date) ou "contenu" (empreinte)
+        threads: Nombre de copies en parallele pour un repertoire (0 = automatique)
 
     Returns:
-        Confirmation de la copie.
+        Confirmation de la copie avec nombre de fichiers et debit.
     """
+    if comparaison not in ("date", "contenu"):
+        return f"Erreur: comparaison inconnue '{comparaison}'. Valeurs: date, contenu"
+
     try:
         src = Path(source)
         if not src.exists():
             return f"Erreur: '{source}' n'existe pas"
 
+        start = time.monotonic()
         if src.is_dir():
-            shutil.copytree(source, destination)
-            return f"Repertoire copie: '{source}' -> '{destination}'"
+            if Path(destination).exists() and not synchroniser:
+                return f"Erreur: '{destination}' existe deja (utilisez synchroniser=True)"
+            stats = _copy_tree(
+                source, destination, synchroniser, comparaison, threads or COPY_WORKERS
+            )
+            duree = max(time.monotonic() - start, 1e-6)
+            message = (
+                f"Repertoire copie: '{source}' -> '{destination}' "
+                f"({stats['fichiers_copies']} fichiers copies"
+            )
+            if synchroniser:
+                message += f", {stats['fichiers_inchanges']} inchanges"
+            message += (
+                f", {_format_size(stats['octets'])} en {duree:.2f} s, "
+                f"{_format_size(stats['octets'] / duree)}/s)"
+            )
+            if stats["erreurs"]:
+                message += f" - {len(stats['erreurs'])} erreurs: " + "; ".join(stats["erreurs"][:5])
+            return message
         else:
             Path(destination).parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(source, destination)
-            return f"Fichier copie: '{source}' -> '{destination}'"
+            dst = destination
+            if os.path.isdir(dst):
+                dst = os.path.join(dst, src.name)
+            if synchroniser and _is_unchanged(source, src.stat(), dst, comparaison):
+                return f"Fichier inchange: '{destination}'"
+            copied, _ = _copy_file_data(source, dst)
+            shutil.copystat(source, dst)
+            duree = max(time.monotonic() - start, 1e-6)
+            return (
+                f"Fichier copie: '{source}' -> '{destination}' "
+                f"({_format_size(copied)}, {_format_size(copied / duree)}/s)"
+            )
     except Exception as e:
         return f"Erreur: {str(e)}"
 
@@ -154,51 +1080,375 @@ def deplacer_fichier(source: str, destination: str) -> str:
             return f"Erreur: '{source}' n'existe pas"
 
         Path(destination).parent.mkdir(parents=True, exist_ok=True)
-        shutil.move(source, destination)
+        # Entre volumes differents, shutil.move copie: on utilise le moteur rapide
+        shutil.move(source, destination, copy_function=_copy2_fast)
         return f"Deplace: '{source}' -> '{destination}'"
     except Exception as e:
         return f"Erreur: {str(e)}"
 
 
-def supprimer_fichier(chemin: str) -> str:
+def _remove_entry(path: str, is_dir: bool):
+    """Supprime un fichier ou un dossier vide, en levant la lecture seule (Windows) si besoin."""
+    remove = os.rmdir if is_dir else os.unlink
+    try:
+        remove(path)
+    except PermissionError:
+        if sys.platform != "win32":
+            raise
+        os.chmod(path, stat.S_IWRITE)
+        remove(path)
+
+
+def _delete_tree(racine: str, simulation: bool = False, threads: int = 1) -> dict:
+    """
+    Supprime une arborescence en un seul parcours scandir, en comptant au fur
+    et a mesure fichiers, dossiers et octets. Les liens symboliques sont
+    supprimes sans etre suivis. Avec threads > 1, les sous-dossiers de premier
+    niveau sont supprimes en parallele.
+
+    En simulation, rien n'est supprime: seuls les totaux sont calcules.
+    "dossiers" compte la racine; "racine" indique si elle a ete supprimee (ou
+    le serait, en simulation).
+    """
+    stats = {"fichiers": 0, "dossiers": 0, "octets": 0, "erreurs": [], "racine": False}
+    lock = threading.Lock()
+
+    # "dossiers" ne compte que les dossiers effectivement supprimes (ou qui
+    # le seraient, en simulation)
+    def delete_dir(top: str):
+        fichiers = dossiers = octets = 0
+        erreurs = []
+        # Pile (chemin, deja_vide): un dossier est retire apres son contenu
+        stack = [(top, False)]
+        while stack:
+            path, emptied = stack.pop()
+            if emptied:
+                if not simulation:
+                    try:
+                        _remove_entry(path, True)
+                    except OSError as e:
+                        erreurs.append(f"{path}: {e}")
+                        continue
+                dossiers += 1
+                if path == racine:
+                    stats["racine"] = True
+                continue
+            try:
+                with os.scandir(path) as it:
+                    entries = list(it)
+            except OSError as e:
+                # Illisible: ni suppression tentee, ni comptage
+                erreurs.append(f"{path}: {e}")
+                continue
+            stack.append((path, True))
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, False))
+                        continue
+                    size = entry.stat(follow_symlinks=False).st_size
+                    if not simulation:
+                        _remove_entry(entry.path, False)
+                except OSError as e:
+                    erreurs.append(f"{entry.path}: {e}")
+                    continue
+                fichiers += 1
+                octets += size
+        with lock:
+            stats["fichiers"] += fichiers
+            stats["dossiers"] += dossiers
+            stats["octets"] += octets
+            stats["erreurs"].extend(erreurs)
+
+    if threads <= 1:
+        delete_dir(racine)
+        return stats
+
+    # Parallele: fichiers de la racine supprimes ici, sous-dossiers sur le pool
+    with os.scandir(racine) as it:
+        entries = list(it)
+    subdirs = []
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+                continue
+            size = entry.stat(follow_symlinks=False).st_size
+            if not simulation:
+                _remove_entry(entry.path, False)
+            stats["fichiers"] += 1
+            stats["octets"] += size
+        except OSError as e:
+            stats["erreurs"].append(f"{entry.path}: {e}")
+    with ThreadPoolExecutor(max_workers=min(threads, DELETE_WORKERS)) as executor:
+        list(executor.map(delete_dir, subdirs))
+    if not simulation:
+        if stats["erreurs"]:
+            return stats
+        try:
+            _remove_entry(racine, True)
+        except OSError as e:
+            stats["erreurs"].append(f"{racine}: {e}")
+            return stats
+    stats["dossiers"] += 1
+    stats["racine"] = True
+    return stats
+
+
+def supprimer_fichier(chemin: str, simulation: bool = False, threads: int = 1) -> str:
     """
     Supprime un fichier ou repertoire.
 
     Args:
         chemin: Chemin du fichier ou repertoire a supprimer
+        simulation: Si True, ne supprime rien et indique ce qui serait supprime
+        threads: Sous-dossiers supprimes en parallele (defaut: 1, utile pour
+                 les tres grosses arborescences type node_modules)
 
     Returns:
-        Confirmation de la suppression.
+        Confirmation de la suppression avec le nombre d'elements et la taille.
     """
     try:
         if _is_protected_path(chemin):
             return f"Refuse: '{chemin}' est un chemin systeme protege"
 
         path = Path(chemin)
-        if not path.exists():
+        if not path.exists() and not path.is_symlink():
             return f"Erreur: '{chemin}' n'existe pas"
 
-        if path.is_dir():
-            count = sum(1 for _ in path.rglob("*"))
-            shutil.rmtree(chemin)
-            return f"Repertoire supprime: '{chemin}' ({count} elements)"
-        else:
-            os.remove(chemin)
-            return f"Fichier supprime: '{chemin}'"
+        if path.is_dir() and not path.is_symlink():
+            stats = _delete_tree(chemin, simulation, threads)
+            # La racine n'est pas comptee parmi les elements
+            dossiers = stats["dossiers"] - (1 if stats["racine"] else 0)
+            detail = (f"{stats['fichiers'] + dossiers} elements: {stats['fichiers']} fichiers, "
+                      f"{dossiers} dossiers, {_format_size(stats['octets'])}")
+            if simulation:
+                return f"Simulation: '{chemin}' serait supprime ({detail})"
+            if stats["erreurs"]:
+                shown = "\n".join(stats["erreurs"][:10])
+                more = len(stats["erreurs"]) - 10
+                suffix = f"\n... et {more} autres erreurs" if more > 0 else ""
+                return (f"Erreur: suppression incomplete de '{chemin}' ({detail} supprimes, "
+                        f"{len(stats['erreurs'])} erreurs)\n{shown}{suffix}")
+            return f"Repertoire supprime: '{chemin}' ({detail})"
+
+        size = path.lstat().st_size
+        if simulation:
+            return f"Simulation: '{chemin}' serait supprime ({_format_size(size)})"
+        _remove_entry(chemin, False)
+        return f"Fichier supprime: '{chemin}' ({_format_size(size)})"
     except Exception as e:
         return f"Erreur: {str(e)}"
 
 
-def lister_repertoire(chemin: str = ".") -> str:
+def _validate_batch(operations) -> tuple[list[dict], list]:
     """
-    Liste le contenu d'un repertoire avec details.
+    Valide toutes les operations d'un lot avant execution.
+
+    Returns:
+        (operations normalisees, erreurs [index, message]).
+    """
+    if not isinstance(operations, list):
+        return [], [[None, "le lot doit etre une liste JSON d'operations"]]
+    if len(operations) > MAX_BATCH_OPERATIONS:
+        return [], [[None, f"trop d'operations ({len(operations)} > {MAX_BATCH_OPERATIONS})"]]
+
+    normalized = []
+    errors = []
+    for i, op in enumerate(operations):
+        if not isinstance(op, dict):
+            errors.append([i, "operation invalide (objet attendu)"])
+            continue
+        name = str(op.get("op", "")).lower()
+        name = BATCH_ALIASES.get(name, name)
+        if name not in BATCH_OPERATIONS:
+            errors.append([i, f"operation inconnue '{op.get('op')}'"])
+            continue
+        missing = [f for f in BATCH_OPERATIONS[name] if not isinstance(op.get(f), str) or not op[f]]
+        if missing:
+            errors.append([i, f"champ(s) manquant(s): {', '.join(missing)}"])
+            continue
+        target = op.get("chemin") if name == "supprimer" else op.get("source")
+        if name in ("supprimer", "deplacer") and _is_protected_path(target):
+            errors.append([i, f"'{target}' est un chemin systeme protege"])
+            continue
+        normalized.append({"op": name, **{f: op[f] for f in BATCH_OPERATIONS[name]}})
+    return normalized, errors
+
+
+def _run_batch_operation(op: dict):
+    """Execute une operation de lot validee (leve une exception en cas d'echec)."""
+    name = op["op"]
+    if name == "creer_repertoire":
+        os.makedirs(op["chemin"], exist_ok=True)
+    elif name == "supprimer":
+        if os.path.isdir(op["chemin"]) and not os.path.islink(op["chemin"]):
+            stats = _delete_tree(op["chemin"])
+            if stats["erreurs"]:
+                raise OSError(stats["erreurs"][0])
+        else:
+            os.remove(op["chemin"])
+    elif name == "copier":
+        if os.path.isdir(op["source"]):
+            if os.path.exists(op["destination"]):
+                raise FileExistsError(f"'{op['destination']}' existe deja")
+            stats = _copy_tree(op["source"], op["destination"], threads=1)
+            if stats["erreurs"]:
+                raise OSError(stats["erreurs"][0])
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(op["destination"])), exist_ok=True)
+            _copy2_fast(op["source"], op["destination"])
+    elif name == "deplacer":
+        if not os.path.lexists(op["source"]):
+            raise FileNotFoundError(f"'{op['source']}' n'existe pas")
+        os.makedirs(os.path.dirname(os.path.abspath(op["destination"])), exist_ok=True)
+        shutil.move(op["source"], op["destination"], copy_function=_copy2_fast)
+
+
+def _batch_paths(op: dict) -> list[str]:
+    """Chemins normalises touches par une operation de lot."""
+    fields = ("chemin",) if "chemin" in op else ("source", "destination")
+    return [os.path.normcase(os.path.abspath(op[f])) for f in fields]
+
+
+def _batch_waves(ops: list[dict]) -> list[list[int]]:
+    """
+    Decoupe le lot en vagues d'operations consecutives independantes: une
+    operation dont un chemin egale, contient ou est contenu dans un chemin
+    d'une operation de la vague courante ouvre une nouvelle vague.
+    """
+    waves = []
+    current = []
+    claimed = set()
+    claimed_parents = set()
+    for i, op in enumerate(ops):
+        paths = _batch_paths(op)
+        parents = [[str(p) for p in Path(path).parents] for path in paths]
+        conflict = any(
+            path in claimed or path in claimed_parents or any(p in claimed for p in path_parents)
+            for path, path_parents in zip(paths, parents)
+        )
+        if conflict:
+            waves.append(current)
+            current = []
+            claimed.clear()
+            claimed_parents.clear()
+        current.append(i)
+        claimed.update(paths)
+        for path_parents in parents:
+            claimed_parents.update(path_parents)
+    if current:
+        waves.append(current)
+    return waves
+
+
+def operations_fichiers_lot(operations: str, parallelisme: int = 4) -> str:
+    """
+    Execute un lot d'operations sur les fichiers en un seul appel.
+
+    Tout le lot est valide avant execution (format, chemins proteges): en cas
+    d'erreur de validation, rien n'est execute. Les operations s'executent
+    dans l'ordre du lot; seules des operations consecutives portant sur des
+    chemins distincts (ni egaux, ni imbriques) s'executent en parallele.
+
+    Args:
+        operations: Liste JSON d'operations, ex:
+            '[{"op": "creer_repertoire", "chemin": "b"},
+              {"op": "copier", "source": "a.txt", "destination": "b/a.txt"},
+              {"op": "deplacer", "source": "c.txt", "destination": "d.txt"},
+              {"op": "supprimer", "chemin": "tmp"}]'
+            (alias acceptes: copy, move, delete, mkdir)
+        parallelisme: Nombre d'operations simultanees (defaut: 4, max: 32, 1 = sequentiel)
+
+    Returns:
+        JSON avec le nombre de succes/echecs et un statut par operation.
+    """
+    try:
+        parsed = json.loads(operations) if isinstance(operations, str) else operations
+    except json.JSONDecodeError as e:
+        return json.dumps({"erreur": f"JSON invalide: {e}"}, ensure_ascii=False)
+
+    ops, errors = _validate_batch(parsed)
+    if errors:
+        return json.dumps({"valide": False, "executees": 0, "erreurs": errors}, ensure_ascii=False)
+
+    start = time.monotonic()
+    statuts = [None] * len(ops)
+
+    def run(i):
+        try:
+            _run_batch_operation(ops[i])
+            statuts[i] = "ok"
+        except Exception as e:
+            statuts[i] = f"erreur: {e}"
+
+    workers = min(max(1, parallelisme), 32)
+    if workers == 1:
+        for i in range(len(ops)):
+            run(i)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for wave in _batch_waves(ops):
+                list(executor.map(run, wave))
+
+    reussies = sum(1 for st in statuts if st == "ok")
+    return json.dumps({
+        "valide": True,
+        "total": len(ops),
+        "reussies": reussies,
+        "echouees": len(ops) - reussies,
+        "duree_secondes": round(time.monotonic() - start, 3),
+        "statuts": statuts,
+    }, ensure_ascii=False)
+
+
+LISTING_SORT_KEYS = ("nom", "taille", "date", "type")
+
+
+def _entry_info(entry: os.DirEntry, stat: os.stat_result | None) -> dict:
+    """Description d'une entree de repertoire (stat deja fait ou None si echec)."""
+    if stat is None:
+        return {"nom": entry.name, "type": "inconnu", "taille": "-", "modifie": "-"}
+    is_dir = entry.is_dir()
+    return {
+        "nom": entry.name,
+        "type": "dossier" if is_dir else "fichier",
+        "taille": "-" if is_dir else _format_size(stat.st_size),
+        "modifie": datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+def _safe_stat(entry: os.DirEntry) -> os.stat_result | None:
+    """stat() d'une entree (mis en cache par DirEntry), None si inaccessible."""
+    try:
+        return entry.stat()
+    except OSError:
+        return None
+
+
+def lister_repertoire(
+    chemin: str = ".",
+    tri: str = "nom",
+    inverse: bool = False,
+    curseur: int = 0,
+    limite: int = 1000,
+) -> str:
+    """
+    Liste le contenu d'un repertoire avec details, par pages.
 
     Args:
         chemin: Chemin du repertoire (defaut: repertoire courant)
+        tri: "nom" (dossiers d'abord), "taille", "date" ou "type" (defaut: "nom")
+        inverse: Inverse l'ordre de tri
+        curseur: Position de depart dans la liste triee (valeur de curseur_suivant)
+        limite: Nombre max d'elements retournes (defaut: 1000, 0 = tous)
 
     Returns:
-        La liste des fichiers et dossiers avec details.
+        La liste des fichiers et dossiers avec details, et le curseur de la page suivante.
     """
+    if tri not in LISTING_SORT_KEYS:
+        return f"Erreur: tri inconnu '{tri}'. Tris: {', '.join(LISTING_SORT_KEYS)}"
+
     try:
         path = Path(chemin)
         if not path.exists():
@@ -206,29 +1456,47 @@ def lister_repertoire(chemin: str = ".") -> str:
         if not path.is_dir():
             return f"Erreur: '{chemin}' n'est pas un repertoire"
 
-        entries = []
-        for entry in sorted(path.iterdir(), key=lambda e: (not e.is_dir(), e.name.lower())):
-            try:
-                stat = entry.stat()
-                entries.append({
-                    "nom": entry.name,
-                    "type": "dossier" if entry.is_dir() else "fichier",
-                    "taille": _format_size(stat.st_size) if entry.is_file() else "-",
-                    "modifie": datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S"),
-                })
-            except (PermissionError, OSError):
-                entries.append({
-                    "nom": entry.name,
-                    "type": "inconnu",
-                    "taille": "-",
-                    "modifie": "-",
-                })
+        # Un seul passage scandir: le type vient du DirEntry (sans stat sous Linux)
+        with os.scandir(path) as it:
+            entries = list(it)
+
+        stats = {}
+        if tri in ("taille", "date"):
+            # Le tri a besoin du stat de toutes les entrees
+            for entry in entries:
+                stats[entry.name] = _safe_stat(entry)
+            if tri == "taille":
+                def sort_key(e):
+                    st = stats[e.name]
+                    return (st.st_size if st and not e.is_dir() else -1, e.name.lower())
+            else:
+                def sort_key(e):
+                    st = stats[e.name]
+                    return (st.st_mtime if st else 0.0, e.name.lower())
+        elif tri == "type":
+            def sort_key(e):
+                return (not e.is_dir(), os.path.splitext(e.name)[1].lower(), e.name.lower())
+        else:
+            def sort_key(e):
+                return (not e.is_dir(), e.name.lower())
+
+        entries.sort(key=sort_key, reverse=inverse)
+
+        curseur = max(0, curseur)
+        page = entries[curseur:curseur + limite] if limite > 0 else entries[curseur:]
+        contenu = [
+            _entry_info(e, stats[e.name] if e.name in stats else _safe_stat(e))
+            for e in page
+        ]
+        fin = curseur + len(page)
 
         return json.dumps({
             "repertoire": str(path.resolve()),
             "nombre_elements": len(entries),
-            "contenu": entries,
-        }, ensure_ascii=False, indent=2)
+            "curseur": curseur,
+            "curseur_suivant": fin if fin < len(entries) else None,
+            "contenu": contenu,
+        }, ensure_ascii=False)
     except Exception as e:
         return f"Erreur: {str(e)}"
 
@@ -301,10 +1569,17 @@ def creer_repertoire(chemin: str) -> str:
 def register_tools(mcp):
     """Enregistre les outils fichiers sur l'instance MCP."""
     mcp.add_tool(lire_fichier)
+    mcp.add_tool(suivre_fichier)
+    mcp.add_tool(lire_binaire)
     mcp.add_tool(ecrire_fichier)
+    mcp.add_tool(ouvrir_ecriture)
+    mcp.add_tool(ajouter_ecriture)
+    mcp.add_tool(valider_ecriture)
+    mcp.add_tool(annuler_ecriture)
     mcp.add_tool(copier_fichier)
     mcp.add_tool(deplacer_fichier)
     mcp.add_tool(supprimer_fichier)
+    mcp.add_tool(operations_fichiers_lot)
     mcp.add_tool(lister_repertoire)
     mcp.add_tool(info_fichier)
     mcp.add_tool(creer_repertoire)
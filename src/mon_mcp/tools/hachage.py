@@ -0,0 +1,418 @@
+"""
+Module de hachage de fichiers, de detection de doublons et de comparaison
+de dossiers.
+
+Les fichiers sont parcourus avec scandir et haches sur un pool de threads
+avec de gros tampons. La detection de doublons ne hache que les candidats:
+regroupement par taille, puis empreinte partielle (debut + fin du fichier),
+puis empreinte complete. Les empreintes sont gardees en cache par
+(peripherique, inode, taille, date de modification).
+
+Outils: hacher_fichiers, trouver_doublons, comparer_repertoires
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from mon_mcp.tools.fichiers import _format_size
+
+HASH_ALGORITHMS = ("md5", "sha1", "sha256", "sha512", "blake2b")
+
+# Taille du tampon de lecture (octets)
+HASH_BUFFER_SIZE = 1024 * 1024
+
+# Empreinte partielle: debut et fin du fichier
+PARTIAL_BLOCK = 64 * 1024
+
+HASH_WORKERS = min(16, (os.cpu_count() or 4) * 2)
+
+# Cache LRU: (dev, inode, taille, mtime_ns, algorithme, partiel) -> empreinte hex
+HASH_CACHE_SIZE = 100_000
+_hash_cache: OrderedDict = OrderedDict()
+_hash_cache_lock = threading.Lock()
+
+# Nombre max de fichiers detailles dans une reponse
+MAX_LISTED = 5000
+
+# Ecart de date tolere par defaut (FAT/exFAT arrondissent a 2 secondes)
+MTIME_TOLERANCE = 2.0
+
+
+def _walk_files(racine: str, recursif: bool, erreurs: list) -> list[tuple[str, os.stat_result]]:
+    """Liste les fichiers reguliers (liens symboliques ignores) avec leur stat."""
+    files = []
+    stack = [racine]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                entries = list(it)
+        except OSError as e:
+            erreurs.append(f"{current}: {e}")
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursif:
+                        stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    files.append((entry.path, entry.stat(follow_symlinks=False)))
+            except OSError as e:
+                erreurs.append(f"{entry.path}: {e}")
+    return files
+
+
+def _hash_file(path: str, st: os.stat_result, algorithme: str, partiel: bool = False) -> str:
+    """
+    Calcule (ou lit en cache) l'empreinte d'un fichier.
+
+    En mode partiel, seuls le premier et le dernier bloc sont haches; pour un
+    fichier assez petit, l'empreinte partielle couvre tout le fichier.
+    """
+    size = st.st_size
+    if partiel and size <= 2 * PARTIAL_BLOCK:
+        partiel = False
+    # scandir ne fournit pas toujours l'inode sous Windows: le chemin le remplace
+    key = (st.st_dev, st.st_ino or path, size, st.st_mtime_ns, algorithme, partiel)
+    with _hash_cache_lock:
+        digest = _hash_cache.get(key)
+        if digest is not None:
+            _hash_cache.move_to_end(key)
+            return digest
+
+    h = hashlib.new(algorithme)
+    with open(path, "rb", buffering=0) as f:
+        if partiel:
+            h.update(f.read(PARTIAL_BLOCK))
+            f.seek(-PARTIAL_BLOCK, os.SEEK_END)
+            h.update(f.read(PARTIAL_BLOCK))
+        else:
+            buf = bytearray(HASH_BUFFER_SIZE)
+            view = memoryview(buf)
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                h.update(view[:n])
+    digest = h.hexdigest()
+
+    with _hash_cache_lock:
+        _hash_cache[key] = digest
+        if len(_hash_cache) > HASH_CACHE_SIZE:
+            _hash_cache.popitem(last=False)
+    return digest
+
+
+def _hash_many(files: list, algorithme: str, partiel: bool, threads: int, erreurs: list) -> dict:
+    """Hache une liste de (chemin, stat) en parallele. Retourne {chemin: empreinte}."""
+    def run(item):
+        path, st = item
+        try:
+            return path, _hash_file(path, st, algorithme, partiel)
+        except OSError as e:
+            erreurs.append(f"{path}: {e}")
+            return path, None
+
+    workers = threads if threads > 0 else HASH_WORKERS
+    if workers == 1 or len(files) <= 1:
+        results = map(run, files)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(run, files))
+    return {path: digest for path, digest in results if digest is not None}
+
+
+def hacher_fichiers(
+    chemin: str,
+    algorithme: str = "sha256",
+    recursif: bool = True,
+    threads: int = 0,
+) -> str:
+    """
+    Calcule l'empreinte (checksum) d'un fichier ou de tous les fichiers d'un dossier.
+
+    Args:
+        chemin: Fichier ou dossier a hacher
+        algorithme: md5, sha1, sha256, sha512 ou blake2b (defaut: sha256)
+        recursif: Inclure les sous-dossiers (defaut: True)
+        threads: Nombre de fichiers haches en parallele (0 = automatique)
+
+    Returns:
+        JSON avec les empreintes par chemin (relatif au dossier), le volume et la duree.
+    """
+    if algorithme not in HASH_ALGORITHMS:
+        valeurs = ", ".join(HASH_ALGORITHMS)
+        return json.dumps({"erreur": f"algorithme inconnu '{algorithme}'. Valeurs: {valeurs}"},
+                          ensure_ascii=False)
+
+    chemin = os.path.abspath(chemin)
+    if not os.path.exists(chemin):
+        return json.dumps({"erreur": f"'{chemin}' n'existe pas"}, ensure_ascii=False)
+
+    start = time.monotonic()
+    erreurs = []
+    try:
+        if os.path.isdir(chemin):
+            files = _walk_files(chemin, recursif, erreurs)
+        else:
+            files = [(chemin, os.stat(chemin))]
+        digests = _hash_many(files, algorithme, False, threads, erreurs)
+    except Exception as e:
+        return json.dumps({"erreur": str(e)}, ensure_ascii=False)
+
+    base = chemin if os.path.isdir(chemin) else os.path.dirname(chemin)
+    empreintes = {os.path.relpath(p, base): d for p, d in sorted(digests.items())}
+    total_bytes = sum(st.st_size for p, st in files if p in digests)
+    result = {
+        "racine": base,
+        "algorithme": algorithme,
+        "fichiers": len(empreintes),
+        "taille_totale": _format_size(total_bytes),
+        "duree_secondes": round(time.monotonic() - start, 3),
+        "empreintes": dict(list(empreintes.items())[:MAX_LISTED]),
+    }
+    if len(empreintes) > MAX_LISTED:
+        result["tronque"] = True
+    if erreurs:
+        result["erreurs"] = erreurs[:20]
+    return json.dumps(result, ensure_ascii=False)
+
+
+def trouver_doublons(
+    chemin: str,
+    taille_min: int = 1,
+    recursif: bool = True,
+    threads: int = 0,
+    max_groupes: int = 100,
+) -> str:
+    """
+    Trouve les fichiers en double (contenu identique) dans un dossier.
+
+    Seuls les fichiers de meme taille sont compares; ils sont d'abord filtres
+    par une empreinte partielle avant le hachage complet. Les liens physiques
+    vers un meme fichier ne sont pas comptes comme doublons.
+
+    Args:
+        chemin: Dossier a analyser
+        taille_min: Taille minimale des fichiers en octets (defaut: 1, ignore les fichiers vides)
+        recursif: Inclure les sous-dossiers (defaut: True)
+        threads: Nombre de fichiers haches en parallele (0 = automatique)
+        max_groupes: Nombre max de groupes retournes, les plus couteux d'abord (defaut: 100)
+
+    Returns:
+        JSON avec les groupes de doublons et l'espace recuperable.
+    """
+    chemin = os.path.abspath(chemin)
+    if not os.path.isdir(chemin):
+        return json.dumps({"erreur": f"'{chemin}' n'est pas un repertoire"}, ensure_ascii=False)
+
+    start = time.monotonic()
+    erreurs = []
+    try:
+        files = _walk_files(chemin, recursif, erreurs)
+
+        # 1. Regroupement par taille (un seul chemin par inode)
+        by_size = defaultdict(list)
+        seen_inodes = set()
+        for path, st in files:
+            if st.st_size < taille_min:
+                continue
+            inode = (st.st_dev, st.st_ino)
+            if st.st_ino and inode in seen_inodes:
+                continue
+            seen_inodes.add(inode)
+            by_size[st.st_size].append((path, st))
+        candidates = [item for group in by_size.values() if len(group) > 1 for item in group]
+
+        # 2. Empreinte partielle, 3. empreinte complete des survivants
+        hashed = 0
+        for partiel in (True, False):
+            hashed += len(candidates) if partiel else 0
+            digests = _hash_many(candidates, "blake2b", partiel, threads, erreurs)
+            groups = defaultdict(list)
+            for path, st in candidates:
+                if path in digests:
+                    groups[(st.st_size, digests[path])].append((path, st))
+            candidates = [item for group in groups.values() if len(group) > 1 for item in group]
+    except Exception as e:
+        return json.dumps({"erreur": str(e)}, ensure_ascii=False)
+
+    groupes = sorted(
+        (
+            [size, sorted(p for p, _ in group)]
+            for (size, _), group in groups.items() if len(group) > 1
+        ),
+        key=lambda g: g[0] * (len(g[1]) - 1),
+        reverse=True,
+    )
+    recuperable = sum(size * (len(paths) - 1) for size, paths in groupes)
+    result = {
+        "racine": chemin,
+        "fichiers_examines": len(files),
+        "fichiers_compares": hashed,
+        "groupes_total": len(groupes),
+        "fichiers_en_double": sum(len(paths) - 1 for _, paths in groupes),
+        "espace_recuperable": _format_size(recuperable),
+        "duree_secondes": round(time.monotonic() - start, 3),
+        "groupes": [
+            {"taille": size, "fichiers": [os.path.relpath(p, chemin) for p in paths]}
+            for size, paths in groupes[:max(1, max_groupes)]
+        ],
+    }
+    if erreurs:
+        result["erreurs"] = erreurs[:20]
+    return json.dumps(result, ensure_ascii=False)
+
+
+def _snapshot_tree(racine: str, erreurs: list) -> dict:
+    """
+    Parcourt une arborescence avec scandir.
+
+    Returns:
+        {chemin relatif: stat (None pour un dossier)}.
+    """
+    tree = {}
+    stack = [("", racine)]
+    while stack:
+        rel_dir, current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                entries = list(it)
+        except OSError as e:
+            erreurs.append(f"{current}: {e}")
+            continue
+        for entry in entries:
+            rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    tree[rel] = None
+                    stack.append((rel, entry.path))
+                else:
+                    tree[rel] = entry.stat(follow_symlinks=False)
+            except OSError as e:
+                erreurs.append(f"{entry.path}: {e}")
+    return tree
+
+
+def _top_level_only(paths: list[str], dirs: set[str]) -> list[str]:
+    """Retire les chemins contenus dans un dossier lui-meme present dans la liste."""
+    kept = []
+    for path in sorted(paths):
+        parent = path.rpartition("/")[0]
+        while parent and parent not in dirs:
+            parent = parent.rpartition("/")[0]
+        if not parent:
+            kept.append(path)
+    return kept
+
+
+def comparer_repertoires(
+    source: str,
+    cible: str,
+    contenu: bool = False,
+    tolerance_date: float = MTIME_TOLERANCE,
+    max_resultats: int = 1000,
+    threads: int = 0,
+) -> str:
+    """
+    Compare deux arborescences (ex: avant/apres un build, sauvegarde vs original).
+
+    Les deux dossiers sont parcourus en parallele. Les fichiers sont compares
+    par taille et date; avec contenu=True, tous les fichiers de meme taille
+    sont compares par empreinte (la date est alors ignoree). Un dossier entierement
+    ajoute ou supprime est signale une seule fois, sans son contenu.
+
+    Args:
+        source: Dossier de reference
+        cible: Dossier compare a la reference
+        contenu: Verifier le contenu (empreinte) quand la taille est identique (defaut: False)
+        tolerance_date: Ecart de date ignore, en secondes (defaut: 2, sans effet avec contenu)
+        max_resultats: Nombre max de chemins listes par categorie (defaut: 1000)
+        threads: Fichiers haches en parallele avec contenu=True (0 = automatique)
+
+    Returns:
+        JSON avec les chemins ajoutes, supprimes et modifies (avec la raison).
+    """
+    source = os.path.abspath(source)
+    cible = os.path.abspath(cible)
+    for chemin in (source, cible):
+        if not os.path.isdir(chemin):
+            return json.dumps({"erreur": f"'{chemin}' n'est pas un repertoire"}, ensure_ascii=False)
+
+    start = time.monotonic()
+    erreurs = []
+    try:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            snapshots = executor.map(lambda root: _snapshot_tree(root, erreurs), (source, cible))
+            before, after = snapshots
+
+        tolerance_ns = int(tolerance_date * 1e9)
+        removed = [p for p in before if p not in after]
+        added = [p for p in after if p not in before]
+        modified = {}
+        to_hash = []
+        identical = 0
+        for path, old in before.items():
+            if path not in after:
+                continue
+            new = after[path]
+            if (old is None) != (new is None):
+                modified[path] = "type"
+            elif old is None:
+                continue
+            elif old.st_size != new.st_size:
+                modified[path] = "taille"
+            elif contenu:
+                # Meme taille et meme date ne garantissent pas le meme contenu
+                to_hash.append(path)
+            elif abs(old.st_mtime_ns - new.st_mtime_ns) > tolerance_ns:
+                modified[path] = "date"
+            else:
+                identical += 1
+
+        if to_hash:
+            old_digests = _hash_many([(os.path.join(source, p), before[p]) for p in to_hash],
+                                     "blake2b", False, threads, erreurs)
+            new_digests = _hash_many([(os.path.join(cible, p), after[p]) for p in to_hash],
+                                     "blake2b", False, threads, erreurs)
+            for p in to_hash:
+                a = old_digests.get(os.path.join(source, p))
+                b = new_digests.get(os.path.join(cible, p))
+                if a is None or b is None or a != b:
+                    modified[p] = "contenu"
+                else:
+                    identical += 1
+    except Exception as e:
+        return json.dumps({"erreur": str(e)}, ensure_ascii=False)
+
+    removed = _top_level_only(removed, {p for p in removed if before[p] is None})
+    added = _top_level_only(added, {p for p in added if after[p] is None})
+    limit = max(1, max_resultats)
+    result = {
+        "source": source,
+        "cible": cible,
+        "identiques": identical,
+        "nb_ajoutes": len(added),
+        "nb_supprimes": len(removed),
+        "nb_modifies": len(modified),
+        "duree_secondes": round(time.monotonic() - start, 3),
+        "ajoutes": added[:limit],
+        "supprimes": removed[:limit],
+        "modifies": [[p, modified[p]] for p in sorted(modified)[:limit]],
+    }
+    if max(len(added), len(removed), len(modified)) > limit:
+        result["tronque"] = True
+    if erreurs:
+        result["erreurs"] = erreurs[:20]
+    return json.dumps(result, ensure_ascii=False)
+
+
+def register_tools(mcp):
+    mcp.add_tool(hacher_fichiers)
+    mcp.add_tool(trouver_doublons)
+    mcp.add_tool(comparer_repertoires)
@@ -0,0 +1,342 @@
+"""
+Module de recherche floue de fichiers par nom.
+
+Un index des chemins est tenu en memoire pour chaque racine et sauvegarde
+a cote des index de contenu (gzip JSON). Il est rafraichi de facon
+incrementale: seuls les dossiers dont la date de modification a change
+(fichier ajoute, supprime ou renomme) sont relus. La requete est decoupee en
+mots, chacun devant apparaitre dans le chemin ou, lettre a lettre, dans le
+nom du fichier; les meilleurs resultats sont selectionnes par tas.
+
+Outils: trouver_fichier
+"""
+
+import bisect
+import gzip
+import hashlib
+import heapq
+import json
+import os
+import re
+import threading
+import time
+
+from mon_mcp import config
+from mon_mcp.walker import DEFAULT_PRUNED_DIRS
+
+FORMAT_VERSION = 1
+
+# Age max de l'index avant verification des dates des dossiers (secondes)
+PATH_INDEX_TTL = 30.0
+
+# Limite de chemins indexes par racine
+MAX_INDEXED_PATHS = 2_000_000
+
+_SEPARATORS = " _-./\\"
+
+# Index en memoire: racine normalisee -> etat
+_path_indexes: dict[str, dict] = {}
+_path_indexes_lock = threading.Lock()
+
+
+def _index_file(root: str) -> str:
+    """Fichier de sauvegarde de l'index des chemins d'une racine."""
+    digest = hashlib.sha1(root.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(config.INDEX_DIR, f"chemins-{digest}.json.gz")
+
+
+def _scan_dir(path: str) -> tuple[int, list[str], list[str]] | None:
+    """Lit un dossier: (mtime_ns, fichiers, sous-dossiers retenus), None si illisible."""
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+        files, subdirs = [], []
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not entry.name.startswith(".") and entry.name not in DEFAULT_PRUNED_DIRS:
+                            subdirs.append(entry.name)
+                    else:
+                        files.append(entry.name)
+                except OSError:
+                    continue
+    except OSError:
+        return None
+    return mtime_ns, files, subdirs
+
+
+def _scan_tree(root: str, rel: str, dirs: dict) -> None:
+    """
+    Indexe un dossier et ses sous-dossiers dans `dirs`
+    ({rel: [mtime_ns, fichiers, sous-dossiers]}).
+    """
+    stack = [rel]
+    count = sum(len(d[1]) for d in dirs.values())
+    while stack and count < MAX_INDEXED_PATHS:
+        current = stack.pop()
+        scanned = _scan_dir(os.path.join(root, current) if current else root)
+        if scanned is None:
+            continue
+        dirs[current] = list(scanned)
+        count += len(scanned[1])
+        stack.extend(f"{current}/{name}" if current else name for name in scanned[2])
+
+
+def _remove_subtree(rel: str, dirs: dict) -> None:
+    """Retire un dossier disparu et ses descendants."""
+    prefix = rel + "/"
+    for key in [k for k in dirs if k == rel or k.startswith(prefix)]:
+        del dirs[key]
+
+
+def _refresh(root: str, dirs: dict) -> bool:
+    """
+    Relit les dossiers dont la date a change.
+
+    Returns:
+        True si l'index a ete modifie.
+    """
+    changed = False
+    for rel in list(dirs):
+        entry = dirs.get(rel)
+        if entry is None:
+            continue  # retire pendant ce rafraichissement
+        path = os.path.join(root, rel) if rel else root
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            _remove_subtree(rel, dirs)
+            changed = True
+            continue
+        if mtime_ns == entry[0]:
+            continue
+        scanned = _scan_dir(path)
+        if scanned is None:
+            continue
+        old_subdirs = set(entry[2])
+        dirs[rel] = list(scanned)
+        for name in old_subdirs - set(scanned[2]):
+            _remove_subtree(f"{rel}/{name}" if rel else name, dirs)
+        for name in set(scanned[2]) - old_subdirs:
+            _scan_tree(root, f"{rel}/{name}" if rel else name, dirs)
+        changed = True
+    return changed
+
+
+def _load(root: str) -> dict | None:
+    """Charge l'index sauvegarde d'une racine (None si absent ou invalide)."""
+    try:
+        with gzip.open(_index_file(root), "rt", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("version") != FORMAT_VERSION or data.get("racine") != root:
+        return None
+    return data["dossiers"]
+
+
+def _save(root: str, dirs: dict) -> None:
+    """Sauvegarde l'index d'une racine (ecriture atomique)."""
+    path = _index_file(root)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=3) as f:
+        json.dump({"version": FORMAT_VERSION, "racine": root, "dossiers": dirs}, f,
+                  ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def _flatten(root: str, dirs: dict) -> list[tuple[str, str, str]]:
+    """Liste plate (chemin relatif en minuscules, nom en minuscules, chemin complet)."""
+    paths = []
+    for rel, (_, files, _) in dirs.items():
+        base = os.path.join(root, rel) if rel else root
+        rel_prefix = f"{rel}/" if rel else ""
+        for name in files:
+            paths.append(((rel_prefix + name).lower(), name.lower(), os.path.join(base, name)))
+    return paths
+
+
+def _blob(paths: tuple[tuple[str, str, str], ...]) -> tuple[str, tuple[int, ...]]:
+    """Chemins relatifs joints par des retours a la ligne, et debut de chaque ligne."""
+    offsets = []
+    pos = 0
+    for rel, _, _ in paths:
+        offsets.append(pos)
+        pos += len(rel) + 1
+    return "\n".join(rel for rel, _, _ in paths), tuple(offsets)
+
+
+def _prefilter(token: str, blob: str, offsets: tuple[int, ...]) -> list[int]:
+    """
+    Indices des chemins pouvant correspondre au mot (sous-chaine du chemin ou
+    sous-sequence du nom), par deux passes de regex sur le texte de tous les
+    chemins plutot qu'un test par chemin.
+    """
+    substring = re.compile(re.escape(token) + "[^\n]*")
+    subseq = re.compile(
+        re.escape(token[0])
+        + "".join(f"[^{re.escape(c)}/\n]*{re.escape(c)}" for c in token[1:])
+        + "[^/\n]*$",
+        re.MULTILINE,
+    )
+    found = {bisect.bisect_right(offsets, m.start()) - 1 for m in substring.finditer(blob)}
+    found.update(bisect.bisect_right(offsets, m.start()) - 1 for m in subseq.finditer(blob))
+    return sorted(found)
+
+
+def _get_index(root: str, rafraichir: bool) -> tuple[tuple, dict]:
+    """
+    Retourne un instantane immuable de l'index d'une racine, pris sous le
+    verrou: (chemins, texte et debuts pour le pre-filtre), en construisant ou
+    rafraichissant l'index. Un rafraichissement concurrent remplace
+    l'instantane sans modifier celui deja retourne.
+    """
+    with _path_indexes_lock:
+        state = _path_indexes.get(root)
+        if state is None:
+            state = {"dossiers": None, "instantane": None, "verifie": 0.0,
+                     "lock": threading.Lock()}
+            _path_indexes[root] = state
+
+    with state["lock"]:
+        info = {"racine": root}
+        now = time.monotonic()
+        if state["dossiers"] is None:
+            dirs = _load(root)
+            if dirs is None:
+                dirs = {}
+                _scan_tree(root, "", dirs)
+                info["construit"] = True
+                changed = True
+            else:
+                changed = _refresh(root, dirs)
+            state["dossiers"] = dirs
+            state["verifie"] = now
+        elif rafraichir or now - state["verifie"] > PATH_INDEX_TTL:
+            changed = _refresh(root, state["dossiers"])
+            state["verifie"] = now
+        else:
+            changed = False
+
+        if changed or state["instantane"] is None:
+            paths = tuple(_flatten(root, state["dossiers"]))
+            state["instantane"] = (paths, *_blob(paths))
+            if changed:
+                try:
+                    _save(root, state["dossiers"])
+                except OSError:
+                    pass
+        return state["instantane"], info
+
+
+def _subsequence_regex(token: str) -> re.Pattern:
+    """
+    Expression trouvant les lettres du mot dans l'ordre ("cr" -> "c[^r]*r"),
+    sans retour arriere, avec l'ecart le plus court depuis chaque depart.
+    """
+    parts = [re.escape(token[0])]
+    for c in token[1:]:
+        parts.append(f"[^{re.escape(c)}]*{re.escape(c)}")
+    return re.compile("".join(parts))
+
+
+def _token_score(token: str, subseq: re.Pattern, name: str, path: str) -> int | None:
+    """
+    Score d'un mot de la requete: sous-chaine du nom > du chemin > sous-sequence
+    du nom. None si le mot ne correspond a aucun de ces cas.
+    """
+    pos = name.find(token)
+    if pos >= 0:
+        score = 100
+        if pos == 0 or name[pos - 1] in _SEPARATORS:
+            score += 30
+        if len(token) == len(name) or name.startswith(token + "."):
+            score += 40
+        return score
+    if token in path:
+        return 50
+    # Sous-sequence: bonus si les lettres sont proches dans le nom
+    m = subseq.search(name)
+    if m:
+        return 30 - min(25, m.end() - m.start() - len(token))
+    return None
+
+
+def trouver_fichier(
+    requete: str,
+    racines: str = "",
+    max_resultats: int = 20,
+    extensions: str = "",
+    rafraichir: bool = False,
+) -> str:
+    """
+    Trouve rapidement un fichier a partir de quelques mots de son nom, meme
+    approximatifs (ex: "rapport budget 2024", "cptrendu"), sans connaitre son
+    emplacement exact.
+
+    La premiere recherche sur une racine construit un index des chemins
+    (sauvegarde sur disque); les suivantes ne relisent que les dossiers modifies.
+
+    Args:
+        requete: Mots a retrouver dans le nom ou le chemin (insensible a la casse)
+        racines: Dossiers a indexer, separes par des virgules (defaut: dossier personnel)
+        max_resultats: Nombre de resultats retournes, les plus pertinents d'abord (defaut: 20)
+        extensions: Extensions filtrees, separees par virgules (ex: ".xlsx,.csv") (optionnel)
+        rafraichir: Verifie les dossiers modifies meme si l'index est recent
+
+    Returns:
+        JSON avec les fichiers classes par pertinence.
+    """
+    tokens = requete.lower().split()
+    if not tokens:
+        return json.dumps({"erreur": "la requete ne peut pas etre vide"}, ensure_ascii=False)
+
+    roots = [r.strip() for r in racines.split(",") if r.strip()] or [os.path.expanduser("~")]
+    ext_filter = tuple(
+        e if e.startswith(".") else "." + e
+        for e in (x.strip().lower() for x in extensions.split(",")) if e
+    )
+    queries = [(t, _subsequence_regex(t)) for t in tokens]
+    # Le mot le plus long est en general le plus selectif
+    selective = max(tokens, key=len)
+
+    start = time.monotonic()
+    scored = []
+    index_info = []
+    for root in roots:
+        root = os.path.normcase(os.path.abspath(root))
+        if not os.path.isdir(root):
+            return json.dumps({"erreur": f"'{root}' n'est pas un repertoire"}, ensure_ascii=False)
+        try:
+            (paths, blob, offsets), info = _get_index(root, rafraichir)
+        except Exception as e:
+            return json.dumps({"erreur": str(e)}, ensure_ascii=False)
+        info["chemins"] = len(paths)
+        index_info.append(info)
+        for i in _prefilter(selective, blob, offsets):
+            rel, name, full = paths[i]
+            if ext_filter and not name.endswith(ext_filter):
+                continue
+            score = 0
+            for token, subseq in queries:
+                token_score = _token_score(token, subseq, name, rel)
+                if token_score is None:
+                    break
+                score += token_score
+            else:
+                score -= min(20, len(name) // 4) + rel.count("/")
+                scored.append((score, full))
+
+    best = heapq.nlargest(max(1, max_resultats), scored, key=lambda item: item[0])
+    return json.dumps({
+        "requete": requete,
+        "index": index_info,
+        "correspondances": len(scored),
+        "duree_secondes": round(time.monotonic() - start, 3),
+        "resultats": [{"chemin": full, "score": score} for score, full in best],
+    }, ensure_ascii=False)
+
+
+def register_tools(mcp):
+    mcp.add_tool(trouver_fichier)
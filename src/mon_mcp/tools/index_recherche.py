@@ -0,0 +1,444 @@
+"""
+Module d'index de contenu pour la recherche de fichiers.
+
+Chaque dossier indexe a sa base SQLite (dans ~/.mon_mcp/index, ou le dossier
+de la variable MON_MCP_INDEX_DIR): un index inverse qui associe a chaque
+trigramme (3 octets consecutifs du texte en minuscules) la liste des
+fichiers qui le contiennent. Une recherche de contenu n'ouvre alors que les
+fichiers possedant tous les trigrammes du texte cherche.
+
+La mise a jour est incrementale: seuls les fichiers dont la taille ou la
+date a change sont relus, et leurs listes sont ecrites dans un nouveau
+segment. Un fichier modifie recoit un nouvel identifiant, ses anciennes
+entrees sont ignorees puis purgees lors de la fusion des segments.
+
+Outils: indexer_dossier, etat_index, supprimer_index
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+from array import array
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from mon_mcp import config
+from mon_mcp.extractors import EXTRACTION_VERSION, MAX_EXTRACT_SIZE, extract_text, has_extractor
+from mon_mcp.walker import walk
+
+# Fichiers plus gros non indexes (meme limite que la recherche de contenu)
+MAX_INDEXED_SIZE = 10 * 1024 * 1024
+
+# Octets examines pour reconnaitre un fichier binaire (octet NUL): un fichier
+# binaire est enregistre sans trigrammes, la recherche de contenu l'ignorant
+BINARY_SNIFF_SIZE = 8192
+
+INDEX_WORKERS = min(8, (os.cpu_count() or 4))
+
+# Nombre d'entrees (trigramme, fichier) accumulees avant ecriture d'un segment
+SEGMENT_POSTINGS = 4_000_000
+
+# Au-dela, les segments sont fusionnes (et les entrees perimees purgees)
+MAX_SEGMENTS = 8
+
+# Intersection arretee quand il reste moins de candidats (verifies ensuite)
+MIN_CANDIDATES = 32
+
+# Octets examines par appel a _TRIGRAM_RE lors de l'extraction des trigrammes
+TRIGRAM_CHUNK_SIZE = 64 * 1024
+
+_TRIGRAM_RE = re.compile(rb"(?=(...))", re.DOTALL)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (cle TEXT PRIMARY KEY, valeur TEXT);
+CREATE TABLE IF NOT EXISTS fichiers (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    chemin TEXT UNIQUE NOT NULL,
+    taille INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    tri BLOB NOT NULL,
+    segment INTEGER NOT NULL,
+    ids BLOB NOT NULL,
+    PRIMARY KEY (tri, segment)
+) WITHOUT ROWID;
+"""
+
+
+def _normalize_root(dossier: str) -> str:
+    """Chemin absolu normalise (casse comprise sous Windows) servant de cle d'index."""
+    return os.path.normcase(os.path.abspath(dossier))
+
+
+def _db_path(root: str) -> str:
+    """Chemin de la base d'index d'un dossier (nom derive du chemin normalise)."""
+    digest = hashlib.sha1(root.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(config.INDEX_DIR, f"{digest}.sqlite")
+
+
+def _connect(db: str) -> sqlite3.Connection:
+    """Ouvre une base d'index (WAL: lectures possibles pendant une mise a jour)."""
+    conn = sqlite3.connect(db, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def _normalize_text(data: bytes) -> bytes:
+    """Texte en minuscules, tel que compare par la recherche de contenu."""
+    return data.decode("utf-8", errors="ignore").lower().encode("utf-8")
+
+
+def _trigrams(data: bytes) -> set[bytes]:
+    """
+    Ensemble des trigrammes d'un texte normalise, construit par blocs (qui se
+    chevauchent de 2 octets): la memoire reste bornee par le nombre de
+    trigrammes distincts et non par la taille du fichier.
+    """
+    trigrams = set()
+    for start in range(0, len(data) - 2, TRIGRAM_CHUNK_SIZE):
+        trigrams.update(_TRIGRAM_RE.findall(data, start, start + TRIGRAM_CHUNK_SIZE + 2))
+    return trigrams
+
+
+def _walk(root: str):
+    """Fichiers indexables (meme parcours que rechercher_fichiers par defaut)."""
+    for entry, _ in walk(root, prefixes_caches=(".", "__")):
+        try:
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            st = entry.stat(follow_symlinks=False)
+        except OSError:
+            continue
+        if st.st_size <= (MAX_EXTRACT_SIZE if has_extractor(entry.path) else MAX_INDEXED_SIZE):
+            yield entry.path, st
+
+
+def _read_trigrams(path: str) -> set[bytes] | None:
+    """
+    Trigrammes d'un fichier (texte extrait pour les documents), ensemble vide
+    pour un fichier binaire, None s'il est illisible.
+    """
+    if has_extractor(path):
+        text = extract_text(path)
+        return None if text is None else _trigrams(text.lower().encode("utf-8"))
+    try:
+        with open(path, "rb") as f:
+            head = f.read(BINARY_SNIFF_SIZE)
+            if b"\x00" in head:
+                return set()
+            return _trigrams(_normalize_text(head + f.read()))
+    except OSError:
+        return None
+
+
+def _extraction_version(conn: sqlite3.Connection) -> str | None:
+    """Version des extracteurs de documents avec laquelle l'index a ete construit."""
+    try:
+        row = conn.execute("SELECT valeur FROM meta WHERE cle = 'extraction'").fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0] if row else None
+
+
+def _remove_db(db: str) -> None:
+    """Supprime une base d'index et ses fichiers WAL."""
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db + suffix):
+            os.remove(db + suffix)
+
+
+def _find_index(dossier: str) -> tuple[str, str] | None:
+    """Cherche un index couvrant le dossier (lui-meme ou un parent). Retourne (racine, base)."""
+    current = _normalize_root(dossier)
+    while True:
+        db = _db_path(current)
+        if os.path.isfile(db):
+            return current, db
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        current = parent
+
+
+def _indexed_files(conn: sqlite3.Connection, root: str, dossier: str) -> dict:
+    """Fichiers indexes sous `dossier`: {chemin: (taille, mtime_ns)}."""
+    sql = "SELECT chemin, taille, mtime_ns FROM fichiers"
+    params = ()
+    if _normalize_root(dossier) != root:
+        # Plage de chemins commencant par "dossier/" (index UNIQUE sur chemin)
+        prefix = os.path.join(os.path.abspath(dossier), "")
+        collate = " COLLATE NOCASE" if sys.platform == "win32" else ""
+        sql += f" WHERE chemin >= ?{collate} AND chemin < ?{collate}"
+        params = (prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1))
+    # Documents extraits par une autre version: non fiables, donc examines
+    stale_documents = _extraction_version(conn) != EXTRACTION_VERSION
+    return {
+        chemin: (taille, mtime_ns)
+        for chemin, taille, mtime_ns in conn.execute(sql, params)
+        if not (stale_documents and has_extractor(chemin))
+    }
+
+
+def _candidate_files(conn: sqlite3.Connection, tris: set[bytes]) -> set[str]:
+    """Fichiers contenant tous les trigrammes donnes."""
+    # Les trigrammes les plus rares d'abord: intersection progressive
+    postings = []
+    for tri in tris:
+        ids = array("I")
+        for (blob,) in conn.execute("SELECT ids FROM postings WHERE tri = ?", (tri,)):
+            ids.frombytes(blob)
+        postings.append(ids)
+    postings.sort(key=len)
+    ids = None
+    for posting in postings:
+        ids = set(posting) if ids is None else ids.intersection(posting)
+        if len(ids) < MIN_CANDIDATES:
+            break
+    candidates = set()
+    id_list = list(ids or ())
+    for i in range(0, len(id_list), 900):
+        chunk = id_list[i:i + 900]
+        sql = f"SELECT chemin FROM fichiers WHERE id IN ({','.join('?' * len(chunk))})"
+        candidates.update(r[0] for r in conn.execute(sql, chunk))
+    return candidates
+
+
+def _index_candidates(dossier: str, textes: list[str]) -> dict | None:
+    """
+    Interroge l'index couvrant `dossier` pour un ou plusieurs textes cherches.
+
+    Returns:
+        None si aucun index ne couvre le dossier ou si aucun texte ne fait
+        3 octets, sinon {"racine",
+        "indexes": {chemin: (taille, mtime_ns)}, "candidats": [set ou None par
+        texte]} (None: texte de moins de 3 octets, non filtrable par l'index).
+        Un fichier indexe absent des candidats d'un texte ne le contient pas,
+        tant que sa taille et sa date n'ont pas change.
+    """
+    tri_sets = [_trigrams(_normalize_text(texte.encode("utf-8"))) for texte in textes]
+    if not any(tri_sets):
+        return None
+    found = _find_index(dossier)
+    if found is None:
+        return None
+    root, db = found
+
+    conn = _connect(db)
+    try:
+        indexed = _indexed_files(conn, root, dossier)
+        candidates = [_candidate_files(conn, tris) if tris else None for tris in tri_sets]
+    finally:
+        conn.close()
+    return {"racine": root, "indexes": indexed, "candidats": candidates}
+
+
+def _write_segment(conn: sqlite3.Connection, postings: dict) -> None:
+    """Ecrit les listes accumulees {trigramme: array d'ids} dans un nouveau segment."""
+    if not postings:
+        return
+    (segment,) = conn.execute("SELECT COALESCE(MAX(segment), 0) + 1 FROM postings").fetchone()
+    conn.executemany(
+        "INSERT INTO postings (tri, segment, ids) VALUES (?, ?, ?)",
+        ((tri, segment, ids.tobytes()) for tri, ids in postings.items()),
+    )
+
+
+def _compact(conn: sqlite3.Connection) -> None:
+    """Fusionne tous les segments en un seul, sans les identifiants de fichiers disparus."""
+    live = {r[0] for r in conn.execute("SELECT id FROM fichiers")}
+    (last,) = conn.execute("SELECT COALESCE(MAX(segment), 0) FROM postings").fetchone()
+    # Par tranche de premier octet pour borner la memoire
+    for first in range(256):
+        low = bytes([first])
+        rows = conn.execute(
+            "SELECT tri, ids FROM postings WHERE tri >= ? AND tri < ? AND segment <= ?",
+            (low, bytes([first, 255, 255, 255]), last),
+        ).fetchall()
+        merged = defaultdict(lambda: array("I"))
+        for tri, blob in rows:
+            ids = array("I")
+            ids.frombytes(blob)
+            merged[tri].extend(i for i in ids if i in live)
+        conn.executemany(
+            "INSERT INTO postings (tri, segment, ids) VALUES (?, ?, ?)",
+            ((tri, last + 1, ids.tobytes()) for tri, ids in merged.items() if ids),
+        )
+    conn.execute("DELETE FROM postings WHERE segment <= ?", (last,))
+
+
+def indexer_dossier(dossier: str, reconstruire: bool = False) -> str:
+    """
+    Construit ou met a jour l'index de contenu d'un dossier.
+
+    La premiere construction lit tous les fichiers (<= 10 MB); les suivantes
+    ne relisent que les fichiers ajoutes ou modifies. Une fois indexe,
+    rechercher_fichiers(contenu=...) dans ce dossier ou un sous-dossier
+    n'ouvre plus que les fichiers candidats.
+
+    Args:
+        dossier: Dossier a indexer
+        reconstruire: Repart d'un index vide au lieu de le mettre a jour
+
+    Returns:
+        JSON avec le nombre de fichiers ajoutes, mis a jour, supprimes et la duree.
+    """
+    if not os.path.isdir(dossier):
+        return json.dumps({"erreur": f"'{dossier}' n'est pas un repertoire"}, ensure_ascii=False)
+
+    start = time.monotonic()
+    root = _normalize_root(dossier)
+    db = _db_path(root)
+    try:
+        os.makedirs(config.INDEX_DIR, exist_ok=True)
+        if reconstruire:
+            _remove_db(db)
+        conn = _connect(db)
+    except (OSError, sqlite3.Error) as e:
+        return json.dumps({"erreur": f"index inaccessible: {e}"}, ensure_ascii=False)
+
+    try:
+        conn.executescript(_SCHEMA)
+        rows = conn.execute("SELECT id, chemin, taille, mtime_ns FROM fichiers")
+        known = {c: (i, t, m) for i, c, t, m in rows}
+        # Documents indexes avec une autre version des extracteurs: relus
+        stale_documents = _extraction_version(conn) != EXTRACTION_VERSION
+        seen = set()
+        todo = []
+        for path, st in _walk(os.path.abspath(dossier)):
+            seen.add(path)
+            old = known.get(path)
+            if (old is None or old[1] != st.st_size or old[2] != st.st_mtime_ns
+                    or (stale_documents and has_extractor(path))):
+                todo.append((path, st))
+        removed = [c for c in known if c not in seen]
+
+        added = updated = 0
+        with conn:
+            conn.executemany("DELETE FROM fichiers WHERE chemin = ?", ((c,) for c in removed))
+            postings = defaultdict(lambda: array("I"))
+            pending = 0
+            with ThreadPoolExecutor(max_workers=INDEX_WORKERS) as executor:
+                results = executor.map(_read_trigrams, (p for p, _ in todo))
+                for (path, st), tris in zip(todo, results):
+                    if tris is None:
+                        continue
+                    if path in known:
+                        # Nouvel identifiant: les anciennes entrees deviennent perimees
+                        conn.execute("DELETE FROM fichiers WHERE chemin = ?", (path,))
+                        updated += 1
+                    else:
+                        added += 1
+                    file_id = conn.execute(
+                        "INSERT INTO fichiers (chemin, taille, mtime_ns) VALUES (?, ?, ?)",
+                        (path, st.st_size, st.st_mtime_ns),
+                    ).lastrowid
+                    for tri in tris:
+                        postings[tri].append(file_id)
+                    pending += len(tris)
+                    if pending >= SEGMENT_POSTINGS:
+                        _write_segment(conn, postings)
+                        postings.clear()
+                        pending = 0
+            _write_segment(conn, postings)
+
+            (segments,) = conn.execute("SELECT COUNT(DISTINCT segment) FROM postings").fetchone()
+            if segments > MAX_SEGMENTS:
+                _compact(conn)
+            conn.executemany("INSERT OR REPLACE INTO meta (cle, valeur) VALUES (?, ?)", [
+                ("racine", os.path.abspath(dossier)),
+                ("mis_a_jour", datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+                ("extraction", EXTRACTION_VERSION),
+            ])
+        (total,) = conn.execute("SELECT COUNT(*) FROM fichiers").fetchone()
+    except (OSError, sqlite3.Error) as e:
+        return json.dumps({"erreur": str(e)}, ensure_ascii=False)
+    finally:
+        conn.close()
+
+    return json.dumps({
+        "dossier": os.path.abspath(dossier),
+        "fichiers_indexes": total,
+        "ajoutes": added,
+        "mis_a_jour": updated,
+        "supprimes": len(removed),
+        "duree_secondes": round(time.monotonic() - start, 3),
+    }, ensure_ascii=False)
+
+
+def _index_info(db: str) -> dict:
+    """Resume d'une base d'index."""
+    conn = _connect(db)
+    try:
+        meta = dict(conn.execute("SELECT cle, valeur FROM meta"))
+        (fichiers,) = conn.execute("SELECT COUNT(*) FROM fichiers").fetchone()
+    finally:
+        conn.close()
+    return {
+        "dossier": meta.get("racine"),
+        "fichiers": fichiers,
+        "mis_a_jour": meta.get("mis_a_jour"),
+        "taille_index_octets": os.path.getsize(db),
+    }
+
+
+def etat_index(dossier: str = "") -> str:
+    """
+    Affiche l'etat de l'index d'un dossier, ou de tous les index existants.
+
+    Args:
+        dossier: Dossier indexe (vide = tous les index)
+
+    Returns:
+        JSON avec pour chaque index: dossier, nombre de fichiers, date de mise a jour, taille.
+    """
+    try:
+        if dossier:
+            found = _find_index(dossier)
+            if found is None:
+                return json.dumps(
+                    {"dossier": os.path.abspath(dossier), "indexe": False}, ensure_ascii=False
+                )
+            return json.dumps({"indexe": True, **_index_info(found[1])}, ensure_ascii=False)
+
+        index = []
+        if os.path.isdir(config.INDEX_DIR):
+            for name in sorted(os.listdir(config.INDEX_DIR)):
+                if name.endswith(".sqlite"):
+                    index.append(_index_info(os.path.join(config.INDEX_DIR, name)))
+        return json.dumps({"total": len(index), "index": index}, ensure_ascii=False)
+    except (OSError, sqlite3.Error) as e:
+        return json.dumps({"erreur": str(e)}, ensure_ascii=False)
+
+
+def supprimer_index(dossier: str) -> str:
+    """
+    Supprime l'index de contenu d'un dossier.
+
+    Args:
+        dossier: Dossier dont l'index doit etre supprime
+
+    Returns:
+        JSON de confirmation.
+    """
+    db = _db_path(_normalize_root(dossier))
+    if not os.path.isfile(db):
+        message = f"aucun index pour '{os.path.abspath(dossier)}'"
+        return json.dumps({"erreur": message}, ensure_ascii=False)
+    try:
+        _remove_db(db)
+    except OSError as e:
+        return json.dumps({"erreur": str(e)}, ensure_ascii=False)
+    return json.dumps({"dossier": os.path.abspath(dossier), "supprime": True}, ensure_ascii=False)
+
+
+def register_tools(mcp):
+    mcp.add_tool(indexer_dossier)
+    mcp.add_tool(etat_index)
+    mcp.add_tool(supprimer_index)
@@ -1,13 +1,72 @@
 """Outil MCP pour la recherche intelligente de fichiers."""
 
 import fnmatch
+import heapq
 import json
 import os
-from datetime import datetime
+import re
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from pathlib import Path
 
+from mon_mcp.extractors import MAX_EXTRACT_SIZE, extract_text, has_extractor
+from mon_mcp.tools.index_recherche import BINARY_SNIFF_SIZE, _index_candidates
+from mon_mcp.walker import parse_patterns, walk
+
 MAX_SEARCH_SIZE = 10 * 1024 * 1024  # 10 MB max pour la recherche de contenu
 
+# Lectures en parallele par defaut: aucune. L'analyse (regex) garde le GIL et,
+# sur disque local, le pool de threads ne rattrape pas son cout (mesure avec
+# benchmarks/bench_recherche.py --cache-froid). threads > 1 reste possible
+# pour recouvrir des lectures lentes (ex: partage reseau).
+SEARCH_WORKERS = 1
+
+# Detail des occurrences: lignes max par fichier et longueur max d'une ligne
+MAX_OCCURRENCES = 100
+MAX_LINE_LENGTH = 300
+
+# Recherches en arriere-plan (demarrer_recherche): id -> etat
+MAX_SEARCH_SESSIONS = 16
+# Attente max d'un appel a resultats_recherche (secondes): courte, l'appelant
+# reinterroge plutot que de bloquer un appel d'outil
+MAX_RESULTS_WAIT = 10.0
+_search_sessions: dict[str, dict] = {}
+_search_sessions_lock = threading.Lock()
+
+# Categories de fichiers (parametre categorie) -> extensions
+FILE_CATEGORIES = {
+    "document": {".pdf", ".doc", ".docx", ".odt", ".rtf", ".txt", ".md", ".ppt", ".pptx", ".odp"},
+    "tableur": {".xls", ".xlsx", ".xlsm", ".ods", ".csv"},
+    "image": {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tif", ".tiff", ".webp", ".svg", ".heic",
+              ".ico"},
+    "video": {".mp4", ".mkv", ".avi", ".mov", ".wmv", ".webm", ".flv", ".m4v"},
+    "audio": {".mp3", ".wav", ".flac", ".aac", ".ogg", ".m4a", ".wma"},
+    "archive": {".zip", ".rar", ".7z", ".tar", ".gz", ".bz2", ".xz", ".tgz"},
+    "code": {".py", ".js", ".ts", ".java", ".c", ".cpp", ".h", ".cs", ".go", ".rs", ".rb", ".php",
+             ".html", ".css", ".json", ".xml", ".yaml", ".yml", ".sh", ".ps1", ".sql"},
+    "executable": {".exe", ".msi", ".bat", ".cmd", ".dll", ".appimage"},
+}
+
+# Ordres de tri des resultats (parametre tri): cle, ordre decroissant
+SORT_ORDERS = {
+    "plus_gros": (lambda item: item[2].st_size, True),
+    "plus_petit": (lambda item: item[2].st_size, False),
+    "plus_recent": (lambda item: item[2].st_mtime_ns, True),
+    "plus_ancien": (lambda item: item[2].st_mtime_ns, False),
+    "nom": (lambda item: item[1].lower(), False),
+}
+
+_SIZE_UNITS = {"": 1, "o": 1, "b": 1, "k": 1024, "ko": 1024, "kb": 1024,
+               "m": 1024 ** 2, "mo": 1024 ** 2, "mb": 1024 ** 2,
+               "g": 1024 ** 3, "go": 1024 ** 3, "gb": 1024 ** 3,
+               "t": 1024 ** 4, "to": 1024 ** 4, "tb": 1024 ** 4}
+
+_DURATION_UNITS = {"min": 60, "h": 3600, "j": 86400, "d": 86400, "sem": 7 * 86400, "w": 7 * 86400}
+
 
 def _format_size(size_bytes: int) -> str:
     """Formate une taille en octets en format lisible."""
@@ -18,115 +77,801 @@ def _format_size(size_bytes: int) -> str:
     return f"{size_bytes:.1f} Po"
 
 
+def _parse_extensions(extensions: str) -> set[str]:
+    """Convertit ".py,txt" en {".py", ".txt"}."""
+    ext_filter = set()
+    for ext in extensions.split(","):
+        ext = ext.strip().lower()
+        if not ext:
+            continue
+        if not ext.startswith("."):
+            ext = "." + ext
+        ext_filter.add(ext)
+    return ext_filter
+
+
+def _parse_size(value: str) -> int:
+    """Convertit "100 Mo", "1.5G", "2048" en octets."""
+    m = re.fullmatch(r"\s*(\d+(?:[.,]\d+)?)\s*([a-zA-Z]*)\s*", value)
+    if not m or m.group(2).lower() not in _SIZE_UNITS:
+        raise ValueError(f"taille invalide '{value}' (ex: 500 Ko, 100 Mo, 2 Go)")
+    return int(float(m.group(1).replace(",", ".")) * _SIZE_UNITS[m.group(2).lower()])
+
+
+def _parse_date(value: str) -> float:
+    """
+    Convertit une date en timestamp: date ISO ("2024-05-01", "2024-05-01 14:30")
+    ou duree relative a maintenant ("30min", "2h", "7j", "2sem").
+    """
+    m = re.fullmatch(r"\s*(\d+(?:[.,]\d+)?)\s*([a-zA-Z]+)\s*", value)
+    if m and m.group(2).lower() in _DURATION_UNITS:
+        seconds = float(m.group(1).replace(",", ".")) * _DURATION_UNITS[m.group(2).lower()]
+        return (datetime.now() - timedelta(seconds=seconds)).timestamp()
+    try:
+        return datetime.fromisoformat(value.strip()).timestamp()
+    except ValueError:
+        raise ValueError(f"date invalide '{value}' (ex: 2024-05-01, 7j, 2h, 30min)") from None
+
+
+def _parse_filters(
+    taille_min: str = "",
+    taille_max: str = "",
+    modifie_apres: str = "",
+    modifie_avant: str = "",
+    categorie: str = "",
+) -> dict | None:
+    """
+    Filtres sur les metadonnees, appliques au stat deja fait pendant le parcours.
+
+    Returns:
+        None si aucun filtre, sinon {"taille_min", "taille_max", "apres_ns",
+        "avant_ns", "extensions"} (None = pas de borne).
+    """
+    if not (taille_min or taille_max or modifie_apres or modifie_avant or categorie):
+        return None
+    extensions = None
+    if categorie:
+        extensions = set()
+        for name in (c.strip().lower() for c in categorie.split(",")):
+            if name not in FILE_CATEGORIES:
+                raise ValueError(
+                    f"categorie inconnue '{name}'. Valeurs: {', '.join(FILE_CATEGORIES)}"
+                )
+            extensions |= FILE_CATEGORIES[name]
+    return {
+        "taille_min": _parse_size(taille_min) if taille_min else None,
+        "taille_max": _parse_size(taille_max) if taille_max else None,
+        "apres_ns": int(_parse_date(modifie_apres) * 1e9) if modifie_apres else None,
+        "avant_ns": int(_parse_date(modifie_avant) * 1e9) if modifie_avant else None,
+        "extensions": extensions,
+    }
+
+
+def _matches_filters(filename: str, stat: os.stat_result, filters: dict) -> bool:
+    """Verifie taille, date de modification et categorie d'un fichier."""
+    if filters["taille_min"] is not None and stat.st_size < filters["taille_min"]:
+        return False
+    if filters["taille_max"] is not None and stat.st_size > filters["taille_max"]:
+        return False
+    if filters["apres_ns"] is not None and stat.st_mtime_ns < filters["apres_ns"]:
+        return False
+    if filters["avant_ns"] is not None and stat.st_mtime_ns > filters["avant_ns"]:
+        return False
+    extensions = filters["extensions"]
+    if extensions is not None and os.path.splitext(filename)[1].lower() not in extensions:
+        return False
+    return True
+
+
+def _iter_files(
+    dossier: str,
+    motif: str,
+    ext_filter: set[str],
+    ignorer: list[str] | tuple = (),
+    filtrer_ignores: bool = True,
+    filters: dict | None = None,
+    stop: threading.Event | None = None,
+):
+    """
+    Parcourt le dossier et produit (chemin, nom, stat) des fichiers retenus
+    par nom et metadonnees. Le parcours s'arrete des que `stop` est leve.
+    """
+    motif_lower = motif.lower()
+    # Dossiers caches et speciaux ignores, en plus des regles du parcours
+    for entry, _ in walk(dossier, ignorer, filtrer_ignores, prefixes_caches=(".", "__")):
+        if stop is not None and stop.is_set():
+            return
+        filename = entry.name
+
+        # Filtre par motif de nom
+        if not fnmatch.fnmatch(filename.lower(), motif_lower):
+            continue
+
+        # Filtre par extension
+        if ext_filter and Path(filename).suffix.lower() not in ext_filter:
+            continue
+
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        if filters is not None and not _matches_filters(filename, stat, filters):
+            continue
+        yield entry.path, filename, stat
+
+
+def _compile_query(
+    contenu: str = "",
+    regex: bool = False,
+    termes: list[str] | None = None,
+    operateur: str = "et",
+    exclure: list[str] | None = None,
+) -> dict:
+    """
+    Compile une requete de contenu (insensible a la casse).
+
+    Les termes litteraux tous ASCII sont cherches directement dans les octets;
+    sinon (accents, expressions regulieres) le contenu est decode en texte.
+
+    Returns:
+        {"octets": bool, "positifs": [motifs], "tous": motif combine,
+         "exclus": [motifs], "operateur": "et"|"ou"}
+    """
+    positifs = ([contenu] if contenu else []) + list(termes or [])
+    exclus = list(exclure or [])
+    if not positifs:
+        raise ValueError("aucun terme de contenu a chercher")
+
+    sources = [t if regex else re.escape(t) for t in positifs + exclus]
+    use_bytes = not regex and all(t.isascii() for t in positifs + exclus)
+    if use_bytes:
+        sources = [src.encode("ascii") for src in sources]
+        union = b"|".join(b"(?:" + src + b")" for src in sources[:len(positifs)])
+    else:
+        union = "|".join(f"(?:{src})" for src in sources[:len(positifs)])
+    flags = re.IGNORECASE | re.MULTILINE
+    return {
+        "octets": use_bytes,
+        "positifs": [re.compile(src, flags) for src in sources[:len(positifs)]],
+        "tous": re.compile(union, flags),
+        "exclus": [re.compile(src, flags) for src in sources[len(positifs):]],
+        "operateur": operateur,
+    }
+
+
+def _line_bounds(buf, start: int, newline) -> tuple[int, int]:
+    """Debut et fin (sans le saut de ligne) de la ligne contenant la position."""
+    line_start = buf.rfind(newline, 0, start) + 1
+    line_end = buf.find(newline, start)
+    return line_start, len(buf) if line_end < 0 else line_end
+
+
+def _line_text(buf, start: int, end: int) -> str:
+    """Texte d'une ligne, decode et tronque pour l'affichage."""
+    text = buf[start:end]
+    if isinstance(text, bytes):
+        text = text.decode("utf-8", errors="replace")
+    text = text.rstrip("\r")
+    return text if len(text) <= MAX_LINE_LENGTH else text[:MAX_LINE_LENGTH] + "..."
+
+
+def _context_lines(
+    buf, line_start: int, line_end: int, contexte: int, newline
+) -> tuple[list, list]:
+    """Lignes avant et apres une ligne donnee."""
+    before = []
+    pos = line_start
+    while len(before) < contexte and pos > 0:
+        start = buf.rfind(newline, 0, pos - 1) + 1
+        before.append(_line_text(buf, start, pos - 1))
+        pos = start
+    after = []
+    pos = line_end
+    while len(after) < contexte and pos + 1 < len(buf):
+        end = buf.find(newline, pos + 1)
+        end = len(buf) if end < 0 else end
+        after.append(_line_text(buf, pos + 1, end))
+        pos = end
+    return before[::-1], after
+
+
+def _match_content(data: bytes, query: dict, occurrences: bool, contexte: int) -> dict | None:
+    """
+    Applique une requete au contenu d'un fichier.
+
+    Returns:
+        None si le fichier ne correspond pas, sinon {"ligne_trouvee"} et, si
+        occurrences est demande, le nombre total d'occurrences et le detail des
+        premieres (ligne, texte, contexte).
+    """
+    buf = data if query["octets"] else data.decode("utf-8", errors="ignore")
+    newline = b"\n" if query["octets"] else "\n"
+
+    for pattern in query["exclus"]:
+        if pattern.search(buf):
+            return None
+    if query["operateur"] == "et" and len(query["positifs"]) > 1:
+        if not all(pattern.search(buf) for pattern in query["positifs"]):
+            return None
+
+    if not occurrences:
+        m = query["tous"].search(buf)
+        if m is None:
+            return None
+        return {"ligne_trouvee": buf.count(newline, 0, m.start()) + 1}
+
+    count = 0
+    details = []
+    line = 1
+    last = 0
+    last_line_start = -1
+    for m in query["tous"].finditer(buf):
+        count += 1
+        if len(details) >= MAX_OCCURRENCES:
+            continue
+        line += buf.count(newline, last, m.start())
+        last = m.start()
+        line_start, line_end = _line_bounds(buf, m.start(), newline)
+        if line_start == last_line_start:
+            continue  # une seule entree par ligne
+        last_line_start = line_start
+        entry = {"ligne": line, "texte": _line_text(buf, line_start, line_end)}
+        if contexte > 0:
+            entry["avant"], entry["apres"] = _context_lines(
+                buf, line_start, line_end, contexte, newline
+            )
+        details.append(entry)
+    if count == 0:
+        return None
+    return {"ligne_trouvee": details[0]["ligne"], "nb_occurrences": count, "occurrences": details}
+
+
+def _scan_file(
+    filepath: str,
+    query: dict,
+    occurrences: bool = False,
+    contexte: int = 0,
+    stat: os.stat_result | None = None,
+) -> dict | None:
+    """
+    Cherche le contenu dans un fichier lu en un bloc, ou dans le texte extrait
+    d'un document (Excel, Word, PowerPoint, PDF).
+
+    Returns:
+        Resultat de _match_content, None si absent, illisible ou binaire
+        (octet NUL dans les premiers Ko).
+    """
+    if has_extractor(filepath):
+        text = extract_text(filepath, stat)
+        if text is None:
+            return None
+        return _match_content(text.encode("utf-8"), query, occurrences, contexte)
+    try:
+        with open(filepath, "rb") as f:
+            data = f.read(MAX_SEARCH_SIZE)
+    except OSError:
+        return None
+    if b"\x00" in data[:BINARY_SNIFF_SIZE]:
+        return None
+    return _match_content(data, query, occurrences, contexte)
+
+
+def _result(filepath: str, filename: str, stat: os.stat_result, match: dict | None) -> dict:
+    """Entree de resultat d'un fichier trouve."""
+    return {
+        "chemin": filepath,
+        "nom": filename,
+        "taille": _format_size(stat.st_size),
+        "modifie": datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S"),
+        "ligne_trouvee": None,
+        **(match or {}),
+    }
+
+
+def _query_index(dossier: str, query_terms: list[str], operateur: str) -> dict | None:
+    """
+    Combine les candidats de l'index pour plusieurs termes litteraux
+    (intersection pour "et", union pour "ou").
+    """
+    lookup = _index_candidates(dossier, query_terms) if query_terms else None
+    if lookup is None:
+        return None
+    per_term = lookup["candidats"]
+    if operateur == "ou":
+        if any(c is None for c in per_term):
+            return None
+        candidates = set().union(*per_term)
+    else:
+        per_term = [c for c in per_term if c is not None]
+        if not per_term:
+            return None
+        candidates = set.intersection(*per_term)
+    return {"racine": lookup["racine"], "indexes": lookup["indexes"], "candidats": candidates}
+
+
+def _skip_scan(filepath: str, stat: os.stat_result, index: dict | None) -> bool:
+    """Vrai si le fichier n'a pas a etre lu: trop gros, ou ecarte par l'index."""
+    if stat.st_size > (MAX_EXTRACT_SIZE if has_extractor(filepath) else MAX_SEARCH_SIZE):
+        return True
+    if index is None:
+        return False
+    abspath = os.path.abspath(filepath)
+    known = index["indexes"].get(abspath)
+    # Fichier indexe et inchange: exclu s'il n'est pas candidat
+    return known == (stat.st_size, stat.st_mtime_ns) and abspath not in index["candidats"]
+
+
+def _search(
+    dossier: str,
+    motif: str,
+    query: dict | None,
+    ext_filter: set[str],
+    index: dict | None,
+    threads: int,
+    occurrences: bool = False,
+    contexte: int = 0,
+    stop: threading.Event | None = None,
+    ignorer: list[str] | tuple = (),
+    filtrer_ignores: bool = True,
+    filters: dict | None = None,
+):
+    """
+    Moteur de recherche: produit (chemin, nom, stat, correspondance) dans
+    l'ordre du parcours (correspondance None sans recherche de contenu).
+
+    Les fichiers a examiner sont lus et analyses dans le thread appelant, ou
+    sur un pool de threads si threads > 1 (un nombre borne de lectures est
+    alors en vol). Fermer le generateur (ex: limite de resultats atteinte)
+    annule les lectures en attente; l'evenement `stop` interrompt le parcours
+    meme quand aucun resultat n'est produit, et abandonne aussi ces lectures.
+    """
+    files = _iter_files(dossier, motif, ext_filter, ignorer, filtrer_ignores, filters, stop)
+    if query is None:
+        for filepath, filename, stat in files:
+            yield filepath, filename, stat, None
+        return
+
+    workers = threads if threads > 0 else SEARCH_WORKERS
+    if workers == 1:
+        # Sans parallelisme: lecture dans le thread appelant, sans pool
+        for filepath, filename, stat in files:
+            if _skip_scan(filepath, stat, index):
+                continue
+            match = _scan_file(filepath, query, occurrences, contexte, stat)
+            if match is not None:
+                yield filepath, filename, stat, match
+        return
+
+    def scan(filepath, stat):
+        # Une lecture deja soumise mais pas commencee est abandonnee apres `stop`
+        if stop is not None and stop.is_set():
+            return None
+        return _scan_file(filepath, query, occurrences, contexte, stat)
+
+    pending = deque()
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        for filepath, filename, stat in files:
+            if _skip_scan(filepath, stat, index):
+                continue
+            pending.append((filepath, filename, stat, executor.submit(scan, filepath, stat)))
+            while pending and (len(pending) >= workers * 4 or pending[0][3].done()):
+                if stop is not None and stop.is_set():
+                    return
+                filepath, filename, stat, future = pending.popleft()
+                match = future.result()
+                if match is not None:
+                    yield filepath, filename, stat, match
+        while pending:
+            if stop is not None and stop.is_set():
+                return  # lectures pas encore commencees annulees ci-dessous
+            filepath, filename, stat, future = pending.popleft()
+            match = future.result()
+            if match is not None:
+                yield filepath, filename, stat, match
+    finally:
+        for *_, future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def _parse_terms(value: str) -> list[str]:
+    """Liste de termes: liste JSON (ex: '["a", "b"]') ou texte simple (un seul terme)."""
+    if not value:
+        return []
+    try:
+        parsed = json.loads(value)
+    except json.JSONDecodeError:
+        return [value]
+    if isinstance(parsed, str):
+        return [parsed]
+    if not isinstance(parsed, list) or not all(isinstance(t, str) for t in parsed):
+        raise ValueError("les termes doivent etre une liste JSON de textes")
+    return [t for t in parsed if t]
+
+
+def _prepare_search(
+    dossier: str,
+    contenu: str,
+    extensions: str,
+    utiliser_index: bool,
+    regex: bool,
+    termes: str,
+    operateur: str,
+    exclure: str,
+    ignorer: str = "",
+    filters: tuple[str, ...] = (),
+) -> dict | str:
+    """
+    Valide les parametres d'une recherche et compile la requete.
+
+    Args:
+        filters: (taille_min, taille_max, modifie_apres, modifie_avant, categorie)
+
+    Returns:
+        Message d'erreur, ou {"ext_filter", "query", "index", "termes", "ignorer", "filtres"}.
+    """
+    if operateur not in ("et", "ou"):
+        return f"Erreur: operateur inconnu '{operateur}'. Valeurs: et, ou"
+
+    base_path = Path(dossier)
+    if not base_path.exists():
+        return f"Erreur: le repertoire '{dossier}' n'existe pas"
+    if not base_path.is_dir():
+        return f"Erreur: '{dossier}' n'est pas un repertoire"
+
+    try:
+        terms = _parse_terms(termes)
+        excluded = _parse_terms(exclure)
+        query = None
+        if contenu or terms:
+            query = _compile_query(contenu, regex, terms, operateur, excluded)
+    except (ValueError, re.error) as e:
+        return f"Erreur: requete invalide: {e}"
+
+    try:
+        meta_filters = _parse_filters(*filters)
+    except ValueError as e:
+        return f"Erreur: {e}"
+
+    index = None
+    if query is not None and utiliser_index and not regex:
+        index = _query_index(dossier, ([contenu] if contenu else []) + terms, operateur)
+
+    return {
+        "ext_filter": _parse_extensions(extensions) if extensions else set(),
+        "query": query,
+        "index": index,
+        "termes": terms,
+        "ignorer": parse_patterns(ignorer),
+        "filtres": meta_filters,
+    }
+
+
 def rechercher_fichiers(
     dossier: str,
     motif: str = "*",
     contenu: str = "",
     extensions: str = "",
     max_resultats: int = 50,
+    utiliser_index: bool = True,
+    threads: int = 0,
+    regex: bool = False,
+    termes: str = "",
+    operateur: str = "et",
+    exclure: str = "",
+    occurrences: bool = False,
+    contexte: int = 0,
+    ignorer: str = "",
+    filtrer_ignores: bool = True,
+    taille_min: str = "",
+    taille_max: str = "",
+    modifie_apres: str = "",
+    modifie_avant: str = "",
+    categorie: str = "",
+    tri: str = "",
 ) -> str:
     """
     Recherche des fichiers par nom et/ou contenu.
 
+    Pour les tres grandes arborescences, demarrer_recherche renvoie les
+    premiers resultats sans attendre la fin du parcours.
+
     Args:
         dossier: Repertoire de recherche
         motif: Pattern de nom de fichier (ex: "*.py", "rapport*") (defaut: "*")
-        contenu: Texte a chercher dans le contenu des fichiers (optionnel)
+        contenu: Texte a chercher dans le contenu des fichiers, y compris le texte des
+                 documents .xlsx, .docx, .pptx et .pdf (optionnel, autres binaires ignores)
         extensions: Extensions filtrees, separees par virgules (ex: ".py,.txt") (optionnel)
         max_resultats: Nombre max de resultats (defaut: 50)
+        utiliser_index: Si un index de contenu couvre le dossier (indexer_dossier),
+                        n'ouvre que les fichiers candidats (defaut: True)
+        threads: Fichiers lus en parallele pour la recherche de contenu (0 = automatique,
+                 soit 1; augmenter seulement pour des lectures lentes, ex: partage reseau)
+        regex: Interprete contenu, termes et exclure comme des expressions regulieres
+        termes: Plusieurs termes a chercher, liste JSON (ex: '["budget", "2024"]')
+        operateur: "et" (tous les termes presents) ou "ou" (au moins un) (defaut: "et")
+        exclure: Termes qui ne doivent pas apparaitre, liste JSON
+        occurrences: Retourne toutes les lignes trouvees et le nombre d'occurrences par fichier
+        contexte: Nombre de lignes de contexte avant/apres chaque ligne trouvee (active occurrences)
+        ignorer: Motifs exclus du parcours, syntaxe .gitignore, separes par virgules
+                 (ex: "*.log,data/,/dist")
+        filtrer_ignores: Respecte .gitignore/.ignore et saute node_modules, venv,
+                         build, target... (defaut: True)
+        taille_min: Taille minimale (ex: "500 Ko", "100 Mo", "2 Go") (optionnel)
+        taille_max: Taille maximale (optionnel)
+        modifie_apres: Modifie apres une date ("2024-05-01") ou depuis une duree
+                       ("30min", "2h", "7j", "2sem") (optionnel)
+        modifie_avant: Modifie avant une date ou il y a plus d'une duree (optionnel)
+        categorie: Type de fichier, separes par virgules: document, tableur, image,
+                   video, audio, archive, code, executable (optionnel)
+        tri: Ordre des resultats: plus_gros, plus_petit, plus_recent, plus_ancien, nom
+             (defaut: ordre du parcours). Avec un tri, tout le dossier est parcouru
+             et seuls les max_resultats meilleurs sont gardes.
 
     Returns:
         Liste des fichiers trouves avec chemin, taille, date de modification.
     """
+    if tri and tri not in SORT_ORDERS:
+        return f"Erreur: tri inconnu '{tri}'. Valeurs: {', '.join(SORT_ORDERS)}"
     try:
-        base_path = Path(dossier)
-        if not base_path.exists():
-            return f"Erreur: le repertoire '{dossier}' n'existe pas"
-        if not base_path.is_dir():
-            return f"Erreur: '{dossier}' n'est pas un repertoire"
-
-        # Parser les extensions
-        ext_filter = set()
-        if extensions:
-            for ext in extensions.split(","):
-                ext = ext.strip().lower()
-                if not ext.startswith("."):
-                    ext = "." + ext
-                ext_filter.add(ext)
-
-        resultats = []
-        contenu_lower = contenu.lower() if contenu else ""
-
-        for dirpath, dirnames, filenames in os.walk(dossier):
-            # Ignorer les dossiers caches et speciaux
-            dirnames[:] = [d for d in dirnames if not d.startswith((".", "__"))]
-
-            for filename in filenames:
-                if len(resultats) >= max_resultats:
-                    break
-
-                # Filtre par motif de nom
-                if not fnmatch.fnmatch(filename.lower(), motif.lower()):
-                    continue
-
-                # Filtre par extension
-                if ext_filter:
-                    file_ext = Path(filename).suffix.lower()
-                    if file_ext not in ext_filter:
-                        continue
-
-                filepath = os.path.join(dirpath, filename)
-
-                try:
-                    stat = os.stat(filepath)
-                except (PermissionError, OSError):
-                    continue
-
-                # Filtre par contenu
-                ligne_trouvee = None
-                if contenu_lower:
-                    if stat.st_size > MAX_SEARCH_SIZE:
-                        continue
-                    try:
-                        with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
-                            for i, line in enumerate(f, 1):
-                                if contenu_lower in line.lower():
-                                    ligne_trouvee = i
-                                    break
-                            else:
-                                continue  # Contenu non trouve, passer au fichier suivant
-                    except (PermissionError, OSError, UnicodeDecodeError):
-                        continue
-
-                resultats.append({
-                    "chemin": filepath,
-                    "nom": filename,
-                    "taille": _format_size(stat.st_size),
-                    "modifie": datetime.fromtimestamp(stat.st_mtime).strftime(
-                        "%Y-%m-%d %H:%M:%S"
-                    ),
-                    "ligne_trouvee": ligne_trouvee,
-                })
-
-            if len(resultats) >= max_resultats:
-                break
+        prepared = _prepare_search(dossier, contenu, extensions, utiliser_index,
+                                   regex, termes, operateur, exclure, ignorer,
+                                   (taille_min, taille_max, modifie_apres, modifie_avant,
+                                    categorie))
+        if isinstance(prepared, str):
+            return prepared
+        index = prepared["index"]
+
+        found = []
+        total = 0
+        if max_resultats > 0:
+            search = _search(dossier, motif, prepared["query"], prepared["ext_filter"], index,
+                             threads, occurrences or contexte > 0, max(0, contexte),
+                             ignorer=prepared["ignorer"], filtrer_ignores=filtrer_ignores,
+                             filters=prepared["filtres"])
+            try:
+                if tri:
+                    # Selection par tas: seuls les max_resultats meilleurs restent en memoire
+                    key, reverse = SORT_ORDERS[tri]
+                    select = heapq.nlargest if reverse else heapq.nsmallest
+
+                    def counted():
+                        nonlocal total
+                        for item in search:
+                            total += 1
+                            yield item
+
+                    found = select(max_resultats, counted(), key=key)
+                else:
+                    for item in search:
+                        found.append(item)
+                        if len(found) >= max_resultats:
+                            break
+                    total = len(found)
+            finally:
+                search.close()
+        resultats = [_result(*item) for item in found]
 
         return json.dumps(
             {
-                "dossier": str(base_path.resolve()),
+                "dossier": str(Path(dossier).resolve()),
                 "motif": motif,
                 "contenu_recherche": contenu or None,
+                "termes": prepared["termes"] or None,
+                "index_utilise": index["racine"] if index else None,
+                "tri": tri or None,
                 "nombre_resultats": len(resultats),
-                "limite_atteinte": len(resultats) >= max_resultats,
+                "limite_atteinte": total >= max_resultats,
                 "resultats": resultats,
             },
             ensure_ascii=False,
-            indent=2,
         )
     except Exception as e:
         return f"Erreur: {str(e)}"
 
 
+def _run_session(state: dict, search) -> None:
+    """Thread de fond d'une session: alimente la liste de resultats au fil du parcours."""
+    try:
+        for item in search:
+            if state["stop"].is_set():
+                break
+            with state["cond"]:
+                state["resultats"].append(_result(*item))
+                state["cond"].notify_all()
+            if len(state["resultats"]) >= state["max_resultats"]:
+                break
+    except Exception as e:
+        state["erreur"] = str(e)
+    finally:
+        search.close()
+        with state["cond"]:
+            state["termine"] = True
+            state["duree"] = round(time.monotonic() - state["debut"], 3)
+            state["cond"].notify_all()
+
+
+def _prune_sessions() -> None:
+    """Oublie les sessions terminees les plus anciennes au-dela de la limite."""
+    finished = [sid for sid, st in _search_sessions.items() if st["termine"]]
+    while len(_search_sessions) >= MAX_SEARCH_SESSIONS and finished:
+        _search_sessions.pop(finished.pop(0))
+
+
+def demarrer_recherche(
+    dossier: str,
+    motif: str = "*",
+    contenu: str = "",
+    extensions: str = "",
+    max_resultats: int = 10000,
+    utiliser_index: bool = True,
+    threads: int = 0,
+    regex: bool = False,
+    termes: str = "",
+    operateur: str = "et",
+    exclure: str = "",
+    occurrences: bool = False,
+    contexte: int = 0,
+    ignorer: str = "",
+    filtrer_ignores: bool = True,
+    taille_min: str = "",
+    taille_max: str = "",
+    modifie_apres: str = "",
+    modifie_avant: str = "",
+    categorie: str = "",
+) -> str:
+    """
+    Demarre une recherche en arriere-plan et retourne immediatement un
+    identifiant de session. Les resultats se lisent au fur et a mesure avec
+    resultats_recherche; annuler_recherche arrete le parcours.
+
+    Memes criteres que rechercher_fichiers.
+
+    Args:
+        dossier: Repertoire de recherche
+        motif: Pattern de nom de fichier (defaut: "*")
+        contenu: Texte a chercher dans le contenu des fichiers (optionnel)
+        extensions: Extensions filtrees, separees par virgules (optionnel)
+        max_resultats: Nombre max de resultats collectes (defaut: 10000)
+        utiliser_index: Utilise l'index de contenu s'il existe (defaut: True)
+        threads: Fichiers lus en parallele (0 = automatique, soit 1; plus pour un partage reseau)
+        regex: Interprete les termes comme des expressions regulieres
+        termes: Plusieurs termes a chercher, liste JSON
+        operateur: "et" ou "ou" (defaut: "et")
+        exclure: Termes qui ne doivent pas apparaitre, liste JSON
+        occurrences: Detail des lignes trouvees par fichier
+        contexte: Lignes de contexte autour de chaque ligne trouvee
+        ignorer: Motifs exclus du parcours (syntaxe .gitignore, separes par virgules)
+        filtrer_ignores: Respecte .gitignore/.ignore et les dossiers lourds par defaut
+        taille_min: Taille minimale (ex: "100 Mo") (optionnel)
+        taille_max: Taille maximale (optionnel)
+        modifie_apres: Modifie apres une date ou depuis une duree (ex: "7j") (optionnel)
+        modifie_avant: Modifie avant une date ou il y a plus d'une duree (optionnel)
+        categorie: Type de fichier (document, tableur, image, video...) (optionnel)
+
+    Returns:
+        JSON avec l'identifiant de session.
+    """
+    try:
+        prepared = _prepare_search(dossier, contenu, extensions, utiliser_index,
+                                   regex, termes, operateur, exclure, ignorer,
+                                   (taille_min, taille_max, modifie_apres, modifie_avant,
+                                    categorie))
+    except Exception as e:
+        return json.dumps({"erreur": str(e)}, ensure_ascii=False)
+    if isinstance(prepared, str):
+        return json.dumps({"erreur": prepared.removeprefix("Erreur: ")}, ensure_ascii=False)
+
+    stop = threading.Event()
+    search = _search(dossier, motif, prepared["query"], prepared["ext_filter"], prepared["index"],
+                     threads, occurrences or contexte > 0, max(0, contexte), stop,
+                     prepared["ignorer"], filtrer_ignores, prepared["filtres"])
+    state = {
+        "resultats": [],
+        "max_resultats": max(1, max_resultats),
+        "termine": False,
+        "erreur": None,
+        "debut": time.monotonic(),
+        "duree": None,
+        "stop": stop,
+        "cond": threading.Condition(),
+    }
+    session = uuid.uuid4().hex[:12]
+    with _search_sessions_lock:
+        _prune_sessions()
+        if len(_search_sessions) >= MAX_SEARCH_SESSIONS:
+            search.close()
+            return json.dumps(
+                {"erreur": f"trop de recherches en cours (max {MAX_SEARCH_SESSIONS})"},
+                ensure_ascii=False,
+            )
+        _search_sessions[session] = state
+    threading.Thread(target=_run_session, args=(state, search), daemon=True).start()
+
+    return json.dumps({
+        "session": session,
+        "dossier": str(Path(dossier).resolve()),
+        "index_utilise": prepared["index"]["racine"] if prepared["index"] else None,
+    }, ensure_ascii=False)
+
+
+def resultats_recherche(
+    session: str,
+    curseur: int = 0,
+    limite: int = 100,
+    attente: float = 0.0,
+) -> str:
+    """
+    Lit une page de resultats d'une recherche demarree avec demarrer_recherche.
+
+    Args:
+        session: Identifiant retourne par demarrer_recherche
+        curseur: Position du premier resultat a lire (0, puis curseur_suivant)
+        limite: Nombre max de resultats retournes (defaut: 100)
+        attente: Attend jusqu'a N secondes qu'un nouveau resultat arrive ou
+                 que la recherche se termine (defaut: 0, max: 10)
+
+    Returns:
+        JSON avec les resultats, curseur_suivant et l'etat (termine, nombre trouve).
+    """
+    with _search_sessions_lock:
+        state = _search_sessions.get(session)
+    if state is None:
+        return json.dumps({"erreur": f"session inconnue '{session}'"}, ensure_ascii=False)
+
+    curseur = max(0, curseur)
+    with state["cond"]:
+        if attente > 0:
+            state["cond"].wait_for(
+                lambda: state["termine"] or len(state["resultats"]) > curseur,
+                min(attente, MAX_RESULTS_WAIT),
+            )
+        page = state["resultats"][curseur:curseur + max(1, limite)]
+        total = len(state["resultats"])
+        termine = state["termine"]
+
+    result = {
+        "session": session,
+        "resultats": page,
+        "curseur_suivant": curseur + len(page),
+        "nombre_trouves": total,
+        "termine": termine,
+    }
+    if termine:
+        result["duree_secondes"] = state["duree"]
+        result["limite_atteinte"] = total >= state["max_resultats"]
+    if state["erreur"]:
+        result["erreur"] = state["erreur"]
+    return json.dumps(result, ensure_ascii=False)
+
+
+def annuler_recherche(session: str) -> str:
+    """
+    Arrete une recherche en arriere-plan et libere sa session: les lectures
+    de fichiers pas encore commencees sont abandonnees.
+
+    Args:
+        session: Identifiant retourne par demarrer_recherche
+
+    Returns:
+        JSON avec le nombre de resultats trouves avant l'annulation.
+    """
+    with _search_sessions_lock:
+        state = _search_sessions.pop(session, None)
+    if state is None:
+        return json.dumps({"erreur": f"session inconnue '{session}'"}, ensure_ascii=False)
+    state["stop"].set()
+    return json.dumps({
+        "session": session,
+        "annulee": True,
+        "nombre_trouves": len(state["resultats"]),
+    }, ensure_ascii=False)
+
+
 def register_tools(mcp):
     """Enregistre les outils recherche sur l'instance MCP."""
     mcp.add_tool(rechercher_fichiers)
+    mcp.add_tool(demarrer_recherche)
+    mcp.add_tool(resultats_recherche)
+    mcp.add_tool(annuler_recherche)
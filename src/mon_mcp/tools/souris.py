@@ -9,6 +9,65 @@ from mon_mcp.platform_api import (
     mouse_scroll,
 )
 
+# Frequence max des deplacements intermediaires (Hz)
+MOVE_FRAME_RATE = 120
+
+# Courbes d'acceleration: t (0..1, temps ecoule) -> progression (0..1)
+EASING_CURVES = {
+    "lineaire": lambda t: t,
+    "douce": lambda t: 4 * t ** 3 if t < 0.5 else 1 - (-2 * t + 2) ** 3 / 2,
+    "acceleration": lambda t: t ** 3,
+    "deceleration": lambda t: 1 - (1 - t) ** 3,
+}
+
+
+def _smooth_move(x: int, y: int, duree: float, courbe: str = "lineaire") -> int:
+    """
+    Deplace la souris vers (x, y) en suivant une echeance monotone.
+
+    La progression est calculee depuis le temps reellement ecoule, donc le
+    surcout de chaque appel ne s'accumule pas: un retard saute des images au
+    lieu d'allonger le mouvement. Le nombre d'images est borne par la frequence
+    et par la distance (pas plus d'une image par pixel), et les positions
+    identiques apres arrondi ne sont pas renvoyees.
+
+    Returns:
+        Le nombre de deplacements effectivement envoyes.
+    """
+    ease = EASING_CURVES[courbe]
+    start_x, start_y = get_cursor_pos()
+    dx, dy = x - start_x, y - start_y
+    distance = max(abs(dx), abs(dy))
+    if distance == 0:
+        return 0
+
+    frame = max(1.0 / MOVE_FRAME_RATE, duree / distance)
+    start = time.monotonic()
+    deadline = start + duree
+    next_frame = start
+    last = (start_x, start_y)
+    events = 0
+
+    while True:
+        now = time.monotonic()
+        t = min((now - start) / duree, 1.0)
+        progress = ease(t)
+        pos = (round(start_x + dx * progress), round(start_y + dy * progress))
+        if pos != last:
+            set_cursor_pos(*pos)
+            last = pos
+            events += 1
+        if t >= 1.0:
+            break
+        next_frame += frame
+        if next_frame < now:
+            next_frame = now + frame
+        delay = min(next_frame, deadline) - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    return events
+
 
 def clic_souris(x: int, y: int, bouton: str = "left") -> str:
     """
@@ -64,7 +123,7 @@ def position_souris() -> str:
         return f"Erreur: {str(e)}"
 
 
-def deplacer_souris(x: int, y: int, duree: float = 0.5) -> str:
+def deplacer_souris(x: int, y: int, duree: float = 0.5, courbe: str = "lineaire") -> str:
     """
     Deplace la souris vers une position donnee avec mouvement fluide.
 
@@ -72,22 +131,19 @@ def deplacer_souris(x: int, y: int, duree: float = 0.5) -> str:
         x: Position X cible
         y: Position Y cible
         duree: Duree du deplacement en secondes (defaut: 0.5, 0 = instantane)
+        courbe: "lineaire", "douce", "acceleration" ou "deceleration" (defaut: "lineaire")
 
     Returns:
         Confirmation.
     """
+    if courbe not in EASING_CURVES:
+        return f"Erreur: courbe inconnue '{courbe}'. Courbes: {', '.join(EASING_CURVES)}"
+
     try:
         if duree <= 0:
             set_cursor_pos(x, y)
         else:
-            start_x, start_y = get_cursor_pos()
-            steps = max(int(duree / 0.01), 1)
-            for i in range(1, steps + 1):
-                t = i / steps
-                cur_x = int(start_x + (x - start_x) * t)
-                cur_y = int(start_y + (y - start_y) * t)
-                set_cursor_pos(cur_x, cur_y)
-                time.sleep(duree / steps)
+            _smooth_move(x, y, duree, courbe)
         return f"Souris deplacee vers ({x}, {y})"
     except Exception as e:
         return f"Erreur: {str(e)}"
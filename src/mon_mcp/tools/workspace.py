@@ -14,6 +14,8 @@ from datetime import datetime
 from fnmatch import fnmatch
 from pathlib import Path
 
+from mon_mcp.walker import parse_patterns, walk
+
 # Chemins proteges (repris de fichiers.py)
 if sys.platform == "win32":
     _PROTECTED_PATHS = {
@@ -134,13 +136,21 @@ def obtenir_workspace() -> str:
     }, ensure_ascii=False)
 
 
-def lister_workspace(pattern: str = "*", recursif: bool = False) -> str:
+def lister_workspace(
+    pattern: str = "*",
+    recursif: bool = False,
+    ignorer: str = "",
+    filtrer_ignores: bool = True,
+) -> str:
     """
     Liste les fichiers du workspace.
 
     Args:
         pattern: Pattern glob pour filtrer (ex: "*.py", "rapport*")
         recursif: Chercher recursivement dans les sous-dossiers
+        ignorer: Motifs exclus, syntaxe .gitignore, separes par virgules (ex: "*.log,cache/")
+        filtrer_ignores: Respecte .gitignore/.ignore et saute node_modules, venv,
+            build... (defaut: True)
 
     Returns:
         JSON avec la liste des fichiers et leurs metadonnees.
@@ -151,46 +161,33 @@ def lister_workspace(pattern: str = "*", recursif: bool = False) -> str:
     if not os.path.isdir(_current_workspace):
         return json.dumps({"erreur": f"Le workspace n'existe plus: {_current_workspace}"}, ensure_ascii=False)
 
+    try:
+        os.scandir(_current_workspace).close()
+    except PermissionError:
+        return json.dumps(
+            {"erreur": f"Permission refusee: {_current_workspace}"}, ensure_ascii=False
+        )
+
     fichiers = []
     max_results = 200
 
-    if recursif:
-        for root, dirs, files in os.walk(_current_workspace):
-            # Ignorer les dossiers caches
-            dirs[:] = [d for d in dirs if not d.startswith(".")]
-            for f in files:
-                if fnmatch(f, pattern):
-                    full_path = os.path.join(root, f)
-                    rel_path = os.path.relpath(full_path, _current_workspace)
-                    try:
-                        stat = os.stat(full_path)
-                        fichiers.append({
-                            "nom": f,
-                            "chemin_relatif": rel_path,
-                            "taille": stat.st_size,
-                            "modifie": datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S"),
-                        })
-                    except OSError:
-                        continue
-                    if len(fichiers) >= max_results:
-                        break
-            if len(fichiers) >= max_results:
-                break
-    else:
+    # Ignorer les dossiers caches
+    for entry, rel_path in walk(_current_workspace, parse_patterns(ignorer), filtrer_ignores,
+                                prefixes_caches=(".",), recursif=recursif):
+        if not fnmatch(entry.name, pattern):
+            continue
         try:
-            for entry in os.scandir(_current_workspace):
-                if entry.is_file() and fnmatch(entry.name, pattern):
-                    stat = entry.stat()
-                    fichiers.append({
-                        "nom": entry.name,
-                        "chemin_relatif": entry.name,
-                        "taille": stat.st_size,
-                        "modifie": datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S"),
-                    })
-                    if len(fichiers) >= max_results:
-                        break
-        except PermissionError:
-            return json.dumps({"erreur": f"Permission refusee: {_current_workspace}"}, ensure_ascii=False)
+            stat = entry.stat()
+        except OSError:
+            continue
+        fichiers.append({
+            "nom": entry.name,
+            "chemin_relatif": rel_path.replace("/", os.sep),
+            "taille": stat.st_size,
+            "modifie": datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S"),
+        })
+        if len(fichiers) >= max_results:
+            break
 
     return json.dumps({
         "workspace": _current_workspace,
@@ -270,12 +267,15 @@ def nettoyer_workspace(confirmer: bool = False) -> str:
     }, ensure_ascii=False)
 
 
-def archiver_workspace(destination: str) -> str:
+def archiver_workspace(destination: str, ignorer: str = "", filtrer_ignores: bool = True) -> str:
     """
     Cree une archive .zip du workspace.
 
     Args:
         destination: Chemin du fichier .zip a creer
+        ignorer: Motifs exclus, syntaxe .gitignore, separes par virgules (ex: "*.tmp,logs/")
+        filtrer_ignores: Respecte .gitignore/.ignore et saute node_modules, venv,
+            build... (defaut: True)
 
     Returns:
         Confirmation avec nombre de fichiers archives et taille.
@@ -296,16 +296,15 @@ def archiver_workspace(destination: str) -> str:
     fichiers_archives = 0
     try:
         with zipfile.ZipFile(destination, "w", zipfile.ZIP_DEFLATED) as zf:
-            for root, dirs, files in os.walk(_current_workspace):
-                dirs[:] = [d for d in dirs if not d.startswith(".")]
-                for f in files:
-                    full_path = os.path.join(root, f)
-                    arcname = os.path.relpath(full_path, _current_workspace)
-                    try:
-                        zf.write(full_path, arcname)
-                        fichiers_archives += 1
-                    except (OSError, PermissionError):
-                        continue
+            for entry, arcname in walk(_current_workspace, parse_patterns(ignorer), filtrer_ignores,
+                                       prefixes_caches=(".",)):
+                if os.path.abspath(entry.path) == destination:
+                    continue
+                try:
+                    zf.write(entry.path, arcname)
+                    fichiers_archives += 1
+                except (OSError, PermissionError):
+                    continue
 
         taille = os.path.getsize(destination)
         if taille < 1024:
@@ -0,0 +1,205 @@
+"""
+Parcours d'arborescences partage par les outils de recherche et de workspace.
+
+Le parcours (scandir) elague:
+- les dossiers lourds sans interet pour une recherche (node_modules, venv,
+  build, target...), sauf si filtrer_ignores=False;
+- les chemins exclus par les fichiers .gitignore / .ignore rencontres;
+- les chemins correspondant aux motifs d'exclusion de l'appelant (meme
+  syntaxe que .gitignore: "*.log", "data/", "/dist", "**/tmp");
+- les dossiers dont le nom commence par un des prefixes caches donnes.
+
+Les motifs sont compiles une fois en expressions regulieres.
+"""
+
+import os
+import re
+
+DEFAULT_PRUNED_DIRS = frozenset({
+    "node_modules", "venv", ".venv", "build", "target", "dist",
+    "__pycache__", ".git", ".hg", ".svn", ".tox", ".mypy_cache", ".pytest_cache",
+})
+
+IGNORE_FILES = (".gitignore", ".ignore")
+
+
+def _glob_to_regex(glob: str) -> str:
+    """Traduit un motif de type .gitignore (sans ancrage) en expression reguliere."""
+    out = []
+    i = 0
+    n = len(glob)
+    while i < n:
+        c = glob[i]
+        if glob.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif glob.startswith("/**", i) and i + 3 == n:
+            out.append("(?:/.*)?")
+            i += 3
+        elif glob.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif c == "*":
+            out.append("[^/]*")
+            i += 1
+        elif c == "?":
+            out.append("[^/]")
+            i += 1
+        elif c == "[":
+            start = i + 2 if glob.startswith("[!", i) or glob.startswith("[]", i) else i + 1
+            end = glob.find("]", start)
+            if end < 0:
+                out.append(re.escape(c))
+                i += 1
+                continue
+            body = glob[i + 1:end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            out.append("[" + body.replace("\\", "\\\\") + "]")
+            i = end + 1
+        elif c == "\\" and i + 1 < n:
+            out.append(re.escape(glob[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(c))
+            i += 1
+    return "".join(out)
+
+
+def compile_rule(line: str, base: str = "") -> tuple | None:
+    """
+    Compile une ligne de .gitignore.
+
+    Args:
+        line: Ligne du fichier (ou motif d'exclusion)
+        base: Chemin relatif (avec "/" final) du dossier contenant le fichier
+
+    Returns:
+        (base, regex, negation, dossier_seulement), ou None pour une ligne vide
+        ou un commentaire.
+    """
+    line = line.rstrip("\n\r")
+    if not line.endswith("\\ "):
+        line = line.rstrip(" ")
+    if not line or line.startswith("#"):
+        return None
+    negate = line.startswith("!")
+    if negate:
+        line = line[1:]
+    elif line.startswith(("\\!", "\\#")):
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    anchored = "/" in line
+    line = line.lstrip("/")
+    prefix = "^" if anchored else "^(?:.*/)?"
+    return base, re.compile(prefix + _glob_to_regex(line) + "$"), negate, dir_only
+
+
+def compile_rules(motifs) -> list[tuple]:
+    """Compile une liste de motifs d'exclusion (syntaxe .gitignore)."""
+    rules = []
+    for motif in motifs:
+        rule = compile_rule(motif.strip())
+        if rule is not None:
+            rules.append(rule)
+    return rules
+
+
+def parse_patterns(value: str) -> list[str]:
+    """Motifs separes par des virgules ou des retours a la ligne."""
+    return [p.strip() for p in re.split(r"[,\n]", value or "") if p.strip()]
+
+
+def _read_ignore_files(path: str, base: str) -> list[tuple]:
+    """Regles des fichiers .gitignore / .ignore d'un dossier."""
+    rules = []
+    for name in IGNORE_FILES:
+        try:
+            with open(os.path.join(path, name), encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    rule = compile_rule(line, base)
+                    if rule is not None:
+                        rules.append(rule)
+        except OSError:
+            continue
+    return rules
+
+
+def is_ignored(rel: str, is_dir: bool, rules: list[tuple]) -> bool:
+    """Applique les regles dans l'ordre: la derniere qui correspond l'emporte."""
+    ignored = False
+    for base, regex, negate, dir_only in rules:
+        if dir_only and not is_dir:
+            continue
+        if base:
+            if not rel.startswith(base):
+                continue
+            sub = rel[len(base):]
+        else:
+            sub = rel
+        if regex.match(sub):
+            ignored = not negate
+    return ignored
+
+
+def walk(
+    racine: str,
+    exclure: list[str] | tuple = (),
+    filtrer_ignores: bool = True,
+    prefixes_caches: tuple[str, ...] = (".",),
+    recursif: bool = True,
+):
+    """
+    Parcourt une arborescence et produit les fichiers retenus.
+
+    Args:
+        racine: Dossier de depart
+        exclure: Motifs d'exclusion supplementaires (syntaxe .gitignore)
+        filtrer_ignores: Applique .gitignore/.ignore et les dossiers lourds par defaut
+        prefixes_caches: Dossiers ignores selon le debut de leur nom (ex: ".", "__")
+        recursif: Descend dans les sous-dossiers
+
+    Yields:
+        (os.DirEntry, chemin relatif avec "/") pour chaque fichier, dossier par
+        dossier (fichiers d'un dossier avant ses sous-dossiers).
+    """
+    user_rules = compile_rules(exclure)
+    stack = [(racine, "", [])]
+    while stack:
+        path, rel_dir, inherited = stack.pop()
+        rules = inherited
+        if filtrer_ignores:
+            own = _read_ignore_files(path, rel_dir)
+            if own:
+                rules = inherited + own
+        active = rules + user_rules
+        try:
+            with os.scandir(path) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        subdirs = []
+        for entry in entries:
+            rel = rel_dir + entry.name
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+            if is_dir:
+                if not recursif or entry.is_symlink():
+                    continue
+                if prefixes_caches and entry.name.startswith(prefixes_caches):
+                    continue
+                if filtrer_ignores and entry.name in DEFAULT_PRUNED_DIRS:
+                    continue
+                if active and is_ignored(rel, True, active):
+                    continue
+                subdirs.append((entry.path, rel + "/", rules))
+            else:
+                if active and is_ignored(rel, False, active):
+                    continue
+                yield entry, rel
+        stack.extend(reversed(subdirs))
@@ -0,0 +1,64 @@
+"""Tests pour les outils d'attente de conditions a l'ecran."""
+
+import json
+from contextlib import contextmanager
+
+import pytest
+
+from mon_mcp.tools import attente
+
+
+@pytest.fixture
+def ecran(monkeypatch):
+    """Simule l'ecran: chaque capture renvoie la trame suivante de la liste."""
+    state = {"trames": [], "captures": 0}
+
+    @contextmanager
+    def grabber():
+        def grab(monitor):
+            i = min(state["captures"], len(state["trames"]) - 1)
+            state["captures"] += 1
+            return state["trames"][i]
+        yield grab
+
+    monkeypatch.setattr(attente, "_screen_grabber", grabber)
+    return state
+
+
+def test_attendre_pixel(ecran):
+    """La condition est remplie quand le pixel atteint la couleur."""
+    ecran["trames"] = [b"\x00\x00\x00\xff", b"\x00\x00\x00\xff", b"\x10\x20\xf0\xff"]
+    data = json.loads(attente.attendre_pixel(5, 5, "#f02010", timeout=2, intervalle=0.01))
+    assert data["condition_remplie"] is True
+    assert data["couleur_actuelle"] == "#f02010"
+    assert data["verifications"] == 3
+
+
+def test_attendre_pixel_couleur_invalide():
+    """Une couleur mal formee est refusee."""
+    data = json.loads(attente.attendre_pixel(0, 0, "rouge"))
+    assert "erreur" in data
+
+
+def test_attendre_changement(ecran):
+    """Detecte le changement d'empreinte de la region."""
+    ecran["trames"] = [b"a" * 16, b"a" * 16, b"b" * 16]
+    data = json.loads(attente.attendre_changement(0, 0, 2, 2, timeout=2, intervalle=0.01))
+    assert data["condition_remplie"] is True
+
+
+def test_attendre_stabilite(ecran):
+    """En mode stable, attend que la region ne change plus."""
+    ecran["trames"] = [b"1", b"2", b"3", b"3"]
+    data = json.loads(attente.attendre_changement(
+        0, 0, 2, 2, mode="stable", stabilite=0.05, timeout=2, intervalle=0.01,
+    ))
+    assert data["condition_remplie"] is True
+    assert ecran["captures"] >= 4
+
+
+def test_attendre_changement_timeout(ecran):
+    """Sans changement, l'attente se termine au timeout."""
+    ecran["trames"] = [b"x" * 16]
+    data = json.loads(attente.attendre_changement(0, 0, 2, 2, timeout=0.1, intervalle=0.02))
+    assert data["condition_remplie"] is False
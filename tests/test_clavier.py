@@ -0,0 +1,81 @@
+"""Tests pour la saisie de texte (mode rapide et repli)."""
+
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from mon_mcp.tools import clavier
+
+
+def test_rapide_partiel_ne_retape_que_la_suite(monkeypatch):
+    """Un lot injecte en partie n'est pas retape depuis le debut."""
+    tapes = []
+    monkeypatch.setattr(clavier, "_type_text_bulk", lambda texte: 3)
+    monkeypatch.setattr(clavier, "_type_text", lambda texte, intervalle: tapes.append(texte))
+
+    result = clavier.ecrire_texte("bonjour", mode="rapide")
+    assert tapes == ["jour"]
+    assert "3/7" in result
+
+
+def test_rapide_echec_complet(monkeypatch):
+    """Aucun evenement injecte: tout le texte est tape caractere par caractere."""
+    tapes = []
+
+    def refuse(texte):
+        raise RuntimeError("entree bloquee")
+
+    monkeypatch.setattr(clavier, "_type_text_bulk", refuse)
+    monkeypatch.setattr(clavier, "_type_text", lambda texte, intervalle: tapes.append(texte))
+    clavier.ecrire_texte("abc", mode="rapide")
+    assert tapes == ["abc"]
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="backend XTest Linux")
+def test_xtest_lot_unique(monkeypatch):
+    """Les evenements partent en un lot; un caractere absent du clavier est remappe."""
+    from Xlib import X
+    from Xlib.ext import xtest
+
+    from mon_mcp import _platform_linux
+
+    layout = {38: [ord("a"), ord("A")], 50: [0xFFE1, 0]}  # a/A, Shift_L
+    events = []
+
+    class FakeDisplay:
+        display = SimpleNamespace(info=SimpleNamespace(min_keycode=8, max_keycode=255))
+        syncs = 0
+
+        def has_extension(self, name):
+            return True
+
+        def get_keyboard_mapping(self, first, count):
+            return [layout.get(first + i, [0, 0]) for i in range(count)]
+
+        def keysym_to_keycode(self, keysym):
+            return next((kc for kc, syms in layout.items() if keysym in syms), 0)
+
+        def keycode_to_keysym(self, keycode, index):
+            return layout.get(keycode, [0, 0])[index]
+
+        def change_keyboard_mapping(self, keycode, keysyms):
+            layout[keycode] = list(keysyms[0])
+            events.append(("mapping", keycode, keysyms[0][0]))
+
+        def sync(self):
+            events.append(("sync",))
+
+    monkeypatch.setattr(_platform_linux, "_get_display", FakeDisplay)
+    monkeypatch.setattr(_platform_linux, "KEYMAP_SETTLE_DELAY", 0)
+    monkeypatch.setattr(xtest, "fake_input", lambda d, kind, kc: events.append((kind, kc)))
+
+    assert _platform_linux.type_text_bulk("aA€") == 3
+    keys = [e for e in events if e[0] in (X.KeyPress, X.KeyRelease)]
+    assert keys[:6] == [(X.KeyPress, 38), (X.KeyRelease, 38), (X.KeyPress, 50),
+                        (X.KeyPress, 38), (X.KeyRelease, 38), (X.KeyRelease, 50)]
+    scratch = keys[6][1]
+    assert ("mapping", scratch, 0x010020AC) in events
+    # Un seul aller-retour pour les evenements, puis restauration du keycode
+    assert events.index(("sync",)) > events.index((X.KeyRelease, scratch))
+    assert events[-2:] == [("mapping", scratch, X.NoSymbol), ("sync",)]
@@ -0,0 +1,100 @@
+"""Tests pour l'enregistrement et le rejeu des entrees."""
+
+import base64
+import json
+
+import pytest
+
+from mon_mcp.tools import enregistrement
+
+
+@pytest.fixture
+def plateforme(monkeypatch):
+    """Remplace les entrees systeme par un journal d'appels."""
+    calls = []
+    monkeypatch.setattr(enregistrement, "set_cursor_pos", lambda x, y: calls.append(("move", x, y)))
+    monkeypatch.setattr(
+        enregistrement, "mouse_button",
+        lambda x, y, b, p: calls.append(("button", x, y, b, p)),
+    )
+    monkeypatch.setattr(enregistrement, "mouse_scroll", lambda dy: calls.append(("scroll", dy)))
+    monkeypatch.setattr(enregistrement, "key_action", lambda k, p: calls.append(("key", k, p)))
+    monkeypatch.setattr(enregistrement, "start_input_recorder", lambda cb: (lambda: None))
+    monkeypatch.setattr(enregistrement, "_screen_signature", lambda: b"\x10" * 16)
+    yield calls
+    enregistrement._recording = None
+
+
+def test_enregistrer_puis_rejouer(tmp_path, plateforme):
+    """Un journal enregistre est rejoue dans l'ordre."""
+    json.loads(enregistrement.demarrer_enregistrement())
+    enregistrement._on_event("move", 10, 20)
+    enregistrement._on_event("button", 10, 20, "left", True)
+    enregistrement._on_event("button", 10, 20, "left", False)
+    enregistrement._on_event("key", "a", True)
+    enregistrement._on_event("key", "a", False)
+
+    fichier = str(tmp_path / "session.json.gz")
+    result = json.loads(enregistrement.arreter_enregistrement(fichier))
+    assert result["evenements"] == 5
+
+    result = json.loads(enregistrement.rejouer_enregistrement(fichier, vitesse=50))
+    assert result["evenements_rejoues"] == 5
+    assert plateforme == [
+        ("move", 10, 20),
+        ("button", 10, 20, "left", True),
+        ("button", 10, 20, "left", False),
+        ("key", "a", True),
+        ("key", "a", False),
+    ]
+
+
+def test_rejeu_relache_les_touches(tmp_path, plateforme):
+    """Une touche laissee enfoncee est relachee a la fin du rejeu."""
+    log = {"version": 1, "evenements": [[0, "k", "shift", 1]]}
+    fichier = str(tmp_path / "j.json")
+    enregistrement._save_log(fichier, log)
+
+    enregistrement.rejouer_enregistrement(fichier, vitesse=50)
+    assert plateforme[-1] == ("key", "shift", False)
+
+
+def test_point_controle_different(tmp_path, plateforme):
+    """Le rejeu s'arrete si l'ecran differe du point de controle."""
+    signature = base64.b64encode(b"\xf0" * 16).decode()
+    log = {
+        "version": 1,
+        "evenements": [[0, "c", "dialogue", signature], [0, "k", "enter", 1]],
+    }
+    fichier = str(tmp_path / "j.json")
+    enregistrement._save_log(fichier, log)
+
+    result = json.loads(enregistrement.rejouer_enregistrement(fichier, verifier=True))
+    assert result["points_controle"][0]["ok"] is False
+    assert result["interrompu"]
+    assert ("key", "enter", True) not in plateforme
+
+
+def test_arreter_sans_enregistrement():
+    """Arreter sans enregistrement en cours renvoie une erreur."""
+    result = json.loads(enregistrement.arreter_enregistrement("x.json"))
+    assert "erreur" in result
+
+
+def test_sauvegarde_echouee_conserve_enregistrement(tmp_path, plateforme, monkeypatch):
+    """Un echec de sauvegarde garde le journal pour une nouvelle tentative."""
+    enregistrement.demarrer_enregistrement()
+    enregistrement._on_event("key", "a", True)
+
+    def echec(fichier, log):
+        raise OSError("disque plein")
+
+    with monkeypatch.context() as m:
+        m.setattr(enregistrement, "_save_log", echec)
+        result = json.loads(enregistrement.arreter_enregistrement(str(tmp_path / "a.json")))
+    assert "erreur" in result
+    assert "deja en cours" in enregistrement.demarrer_enregistrement()
+
+    result = json.loads(enregistrement.arreter_enregistrement(str(tmp_path / "b.json")))
+    assert result["evenements"] == 1
+    assert enregistrement._recording is None
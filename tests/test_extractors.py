@@ -0,0 +1,103 @@
+"""Tests pour l'extraction du texte des documents (sans dependances optionnelles)."""
+
+import json
+import zipfile
+import zlib
+
+from mon_mcp import extractors
+from mon_mcp.tools.recherche import rechercher_fichiers
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+A = 'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main"'
+S = 'xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"'
+
+
+def _docx(path, paragraphs):
+    body = "".join(f"<w:p><w:r><w:t>{p}</w:t></w:r></w:p>" for p in paragraphs)
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("word/document.xml", f"<w:document {W}><w:body>{body}</w:body></w:document>")
+
+
+def _pptx(path, slides):
+    with zipfile.ZipFile(path, "w") as zf:
+        for i, text in enumerate(slides, 1):
+            slide = f"<p:sld xmlns:p='urn:p' {A}><a:p><a:r><a:t>{text}</a:t></a:r></a:p></p:sld>"
+            zf.writestr(f"ppt/slides/slide{i}.xml", slide)
+
+
+def _xlsx(path):
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("xl/sharedStrings.xml", f"<sst {S}><si><t>Chiffre d'affaires</t></si></sst>")
+        zf.writestr("xl/worksheets/sheet1.xml",
+                    f'<worksheet {S}><sheetData><row r="1"><c r="A1" t="s"><v>0</v></c>'
+                    f'<c r="B1"><v>125000</v></c></row></sheetData></worksheet>')
+
+
+def test_extracteurs_office(tmp_path):
+    """Texte des formats Office lu directement dans l'archive."""
+    _docx(tmp_path / "a.docx", ["Compte rendu", "Budget valide"])
+    _pptx(tmp_path / "b.pptx", ["Titre", "Conclusion"] + ["x"] * 8 + ["Derniere"])
+    _xlsx(tmp_path / "c.xlsx")
+
+    assert extractors.extract_text(str(tmp_path / "a.docx")) == "Compte rendu\nBudget valide\n"
+    text = extractors.extract_text(str(tmp_path / "b.pptx"))
+    assert text.index("Conclusion") < text.index("Derniere")
+    text = extractors.extract_text(str(tmp_path / "c.xlsx"))
+    assert "Chiffre d'affaires" in text and "125000" in text and "\n0" not in text
+
+
+def test_extracteur_pdf_flux(tmp_path):
+    """Chaines des operateurs de texte d'un flux compresse."""
+    stream = zlib.compress(b"BT /F1 12 Tf (Facture n\\260 42) Tj T* [(Total) -250 ( TTC)] TJ ET")
+    (tmp_path / "f.pdf").write_bytes(
+        b"%%PDF-1.4\n1 0 obj << /Length %d /Filter /FlateDecode >>\nstream\n" % len(stream)
+        + stream + b"\nendstream\nendobj\n%EOF\n"
+    )
+    texte = extractors._extract_pdf_streams(str(tmp_path / "f.pdf"))
+    assert texte == "Facture n\xb0 42\nTotal TTC\n"
+
+
+def test_extracteur_cache_et_personnalise(tmp_path, monkeypatch):
+    """Extracteur ajoute par extension; texte relu seulement si le fichier change."""
+    calls = []
+
+    def extract(path):
+        calls.append(path)
+        return "texte extrait"
+
+    monkeypatch.setitem(extractors._extractors, ".demo", extract)
+    path = tmp_path / "x.demo"
+    path.write_bytes(b"\x00binaire")
+    assert extractors.extract_text(str(path)) == "texte extrait"
+    assert extractors.extract_text(str(path)) == "texte extrait"
+    assert len(calls) == 1
+    path.write_bytes(b"\x00binaire modifie")
+    extractors.extract_text(str(path))
+    assert len(calls) == 2
+
+    # Document corrompu: ignore sans erreur
+    (tmp_path / "casse.docx").write_bytes(b"pas un zip")
+    assert extractors.extract_text(str(tmp_path / "casse.docx")) is None
+
+
+def test_recherche_dans_documents(tmp_path, monkeypatch):
+    """rechercher_fichiers et l'index trouvent le texte des documents."""
+    from mon_mcp import config
+    from mon_mcp.tools import index_recherche
+
+    monkeypatch.setattr(config, "INDEX_DIR", str(tmp_path / "index"))
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    _docx(docs / "reunion.docx", ["Ordre du jour", "Budget previsionnel 2025"])
+    _pptx(docs / "presentation.pptx", ["Strategie commerciale"])
+    (docs / "notes.txt").write_text("rien a voir")
+
+    data = json.loads(rechercher_fichiers(str(docs), contenu="budget previsionnel",
+                                          occurrences=True))
+    assert [r["nom"] for r in data["resultats"]] == ["reunion.docx"]
+    assert data["resultats"][0]["occurrences"][0]["ligne"] == 2
+
+    index_recherche.indexer_dossier(str(docs))
+    data = json.loads(rechercher_fichiers(str(docs), contenu="strategie"))
+    assert data["index_utilise"] is not None
+    assert [r["nom"] for r in data["resultats"]] == ["presentation.pptx"]
@@ -0,0 +1,82 @@
+"""Tests pour le registre des fenetres."""
+
+import json
+import threading
+
+import pytest
+
+from mon_mcp.tools import fenetres
+
+
+@pytest.fixture
+def bureau(monkeypatch):
+    """Remplace l'enumeration systeme par une liste de fenetres simulee."""
+    state = {"fenetres": [], "appels": 0}
+
+    def list_windows():
+        state["appels"] += 1
+        return list(state["fenetres"])
+
+    monkeypatch.setattr(fenetres, "list_windows", list_windows)
+    monkeypatch.setitem(fenetres._registry, "fenetres", None)
+    monkeypatch.setitem(fenetres._registry, "surveillance", False)
+    return state
+
+
+def _win(titre, pid=1, classe="App"):
+    return {"titre": titre, "pid": pid, "classe": classe}
+
+
+def test_liste_en_cache(bureau):
+    """Deux listes successives n'enumerent qu'une fois."""
+    bureau["fenetres"] = [_win("Editeur")]
+    fenetres.liste_fenetres()
+    fenetres.liste_fenetres()
+    assert bureau["appels"] == 1
+
+
+def test_liste_perimee_pendant_lecture(bureau, monkeypatch):
+    """Une invalidation pendant l'enumeration empeche la mise en cache."""
+    def list_windows():
+        bureau["appels"] += 1
+        fenetres._invalidate_windows()
+        return [_win("Ancienne")]
+
+    monkeypatch.setattr(fenetres, "list_windows", list_windows)
+    fenetres.liste_fenetres()
+    assert fenetres._registry["fenetres"] is None
+
+
+def test_chercher_par_regex_pid_classe(bureau):
+    """Filtrage par titre (regex), pid et classe."""
+    bureau["fenetres"] = [
+        _win("Rapport 2024 - Word", pid=10, classe="OpusApp"),
+        _win("Rapport - Notepad", pid=11, classe="Notepad"),
+        _win("Terminal", pid=12, classe="Konsole"),
+    ]
+    data = json.loads(fenetres.chercher_fenetres(titre=r"rapport \d+"))
+    assert [w["pid"] for w in data["fenetres"]] == [10]
+    data = json.loads(fenetres.chercher_fenetres(classe="notepad"))
+    assert data["total"] == 1
+    data = json.loads(fenetres.chercher_fenetres(pid=12))
+    assert data["fenetres"][0]["titre"] == "Terminal"
+
+
+def test_attendre_fenetre_reveil_evenement(bureau):
+    """Une invalidation reveille l'attente sans attendre le timeout."""
+    def apparition():
+        bureau["fenetres"] = [_win("Dialogue")]
+        fenetres._invalidate_windows()
+
+    timer = threading.Timer(0.1, apparition)
+    timer.start()
+    data = json.loads(fenetres.attendre_fenetre(titre="dialogue", timeout=5))
+    timer.join()
+    assert data["trouve"] is True
+    assert data["attente_secondes"] < 1
+
+
+def test_attendre_fenetre_timeout(bureau):
+    """Sans fenetre correspondante, l'attente se termine au timeout."""
+    data = json.loads(fenetres.attendre_fenetre(titre="absente", timeout=0.2))
+    assert data["trouve"] is False
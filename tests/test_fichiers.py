@@ -1,17 +1,20 @@
 """Tests pour les outils de gestion de fichiers."""
 
 import json
+import os
+import time
+from collections import OrderedDict
 from pathlib import Path
 
 from mon_mcp.tools.fichiers import (
-    lire_fichier,
-    ecrire_fichier,
     copier_fichier,
+    creer_repertoire,
     deplacer_fichier,
-    supprimer_fichier,
-    lister_repertoire,
+    ecrire_fichier,
     info_fichier,
-    creer_repertoire,
+    lire_fichier,
+    lister_repertoire,
+    supprimer_fichier,
 )
 
 
@@ -66,6 +69,63 @@ def test_supprimer_fichier(tmp_path):
     assert not f.exists()
 
 
+def _make_tree(root):
+    for i in range(3):
+        d = root / f"sous{i}" / "profond"
+        d.mkdir(parents=True)
+        (d / "f.bin").write_bytes(b"x" * 100)
+        (root / f"sous{i}" / "g.txt").write_text("abc")
+    (root / "racine.txt").write_text("r")
+
+
+def test_supprimer_repertoire_compte(tmp_path):
+    """Suppression en un parcours avec comptage, sequentielle et parallele."""
+    for threads in (1, 4):
+        root = tmp_path / f"arbre{threads}"
+        _make_tree(root)
+        result = supprimer_fichier(str(root), threads=threads)
+        assert "13 elements: 7 fichiers, 6 dossiers" in result
+        assert not root.exists()
+
+
+def test_supprimer_simulation(tmp_path):
+    """La simulation compte sans rien supprimer."""
+    root = tmp_path / "arbre"
+    _make_tree(root)
+    result = supprimer_fichier(str(root), simulation=True)
+    assert result.startswith("Simulation")
+    assert "7 fichiers" in result and "310.0 o" in result
+    assert (root / "sous0" / "profond" / "f.bin").exists()
+
+
+def test_supprimer_dossier_illisible(tmp_path, monkeypatch):
+    """Un dossier illisible n'est ni supprime ni compte."""
+    from mon_mcp.tools.fichiers import _delete_tree
+    root = tmp_path / "arbre"
+    (root / "bloque").mkdir(parents=True)
+    (root / "bloque" / "f.txt").write_text("x")
+    (root / "libre").mkdir()
+    scandir = os.scandir
+
+    def scandir_bloque(path="."):
+        if os.path.basename(path) == "bloque":
+            raise PermissionError("acces refuse")
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", scandir_bloque)
+    stats = _delete_tree(str(root))
+    assert stats["dossiers"] == 1
+    assert len(stats["erreurs"]) == 2  # bloque (lecture), puis la racine non vide
+    assert (root / "bloque" / "f.txt").exists()
+    assert not (root / "libre").exists()
+
+    (root / "libre").mkdir()
+    (root / "libre" / "g.txt").write_text("y")
+    result = supprimer_fichier(str(root))
+    assert result.startswith("Erreur: suppression incomplete")
+    assert "(2 elements: 1 fichiers, 1 dossiers, 1.0 o supprimes, 2 erreurs)" in result
+
+
 def test_supprimer_refuse_chemin_systeme():
     """Test que les chemins systeme sont refuses."""
     result = supprimer_fichier("C:\\Windows")
@@ -113,3 +173,409 @@ def test_creer_repertoire_existant(tmp_path):
     """Test creation d'un repertoire qui existe deja."""
     result = creer_repertoire(str(tmp_path))
     assert "existe deja" in result
+
+
+def test_lire_fichier_plage_de_lignes(tmp_path, monkeypatch):
+    """Lecture d'une plage de lignes via l'index creux (petits blocs)."""
+    from mon_mcp.tools import fichiers
+    monkeypatch.setattr(fichiers, "LINE_INDEX_BLOCK", 64)
+    f = tmp_path / "log.txt"
+    f.write_text("".join(f"ligne {i}\n" for i in range(1, 1001)))
+
+    data = json.loads(lire_fichier(str(f), debut_ligne=500, nb_lignes=3))
+    assert data["contenu"] == "ligne 500\nligne 501\nligne 502\n"
+    assert data["fin_ligne"] == 502
+    assert data["lignes"] == 1000
+
+
+def test_lire_fichier_dernieres_lignes(tmp_path):
+    """Mode tail: seulement les N dernieres lignes."""
+    f = tmp_path / "log.txt"
+    f.write_text("a\nb\nc\nd\n")
+
+    data = json.loads(lire_fichier(str(f), dernieres_lignes=2))
+    assert data["contenu"] == "c\nd\n"
+
+
+def test_lire_fichier_plage_octets(tmp_path):
+    """Lecture d'une plage d'octets."""
+    f = tmp_path / "data.txt"
+    f.write_text("0123456789")
+
+    data = json.loads(lire_fichier(str(f), debut_octet=3, nb_octets=4))
+    assert data["contenu"] == "3456"
+    assert data["fin_octet"] == 7
+
+
+def test_lire_fichier_index_invalide_apres_modification(tmp_path):
+    """L'index en cache est reconstruit quand le fichier change."""
+    f = tmp_path / "log.txt"
+    f.write_text("a\nb\n")
+    assert json.loads(lire_fichier(str(f), debut_ligne=2))["contenu"] == "b\n"
+
+    f.write_text("x\ny\nz\n")
+    data = json.loads(lire_fichier(str(f), debut_ligne=3))
+    assert data["contenu"] == "z\n"
+    assert data["lignes"] == 3
+
+
+def test_lire_fichier_format_identique(tmp_path):
+    """Lectures entiere et partielle renvoient le meme format JSON."""
+    f = tmp_path / "log.txt"
+    f.write_text("a\nb\nc\n")
+
+    entier = json.loads(lire_fichier(str(f)))
+    partiel = json.loads(lire_fichier(str(f), debut_ligne=1))
+    assert entier["contenu"] == partiel["contenu"]
+    assert entier["lignes"] == partiel["lignes"] == 3
+    assert entier["tronque"] is partiel["tronque"] is False
+
+
+def test_suivre_fichier_ajouts(tmp_path):
+    """Seuls les octets ajoutes depuis l'appel precedent sont retournes."""
+    from mon_mcp.tools.fichiers import suivre_fichier
+    f = tmp_path / "app.log"
+    f.write_text("ancien\n")
+
+    data = json.loads(suivre_fichier(str(f)))
+    assert data["contenu"] == ""
+
+    with open(f, "a") as fh:
+        fh.write("nouveau\n")
+    data = json.loads(suivre_fichier(str(f)))
+    assert data["contenu"] == "nouveau\n"
+    assert json.loads(suivre_fichier(str(f)))["contenu"] == ""
+
+
+def test_suivre_fichier_rotation(tmp_path):
+    """Un fichier remplace (rotation) est relu depuis le debut."""
+    from mon_mcp.tools.fichiers import suivre_fichier
+    f = tmp_path / "app.log"
+    f.write_text("avant la rotation\n")
+    suivre_fichier(str(f), depuis_debut=True)
+
+    f.rename(tmp_path / "app.log.1")
+    f.write_text("apres\n")
+    data = json.loads(suivre_fichier(str(f)))
+    assert data["rotation"] is True
+    assert data["contenu"] == "apres\n"
+
+
+def test_suivre_fichier_attente(tmp_path):
+    """Avec un timeout, l'appel attend l'arrivee de nouvelles donnees."""
+    import threading
+
+    from mon_mcp.tools.fichiers import suivre_fichier
+    f = tmp_path / "app.log"
+    f.write_text("")
+    suivre_fichier(str(f))
+
+    def ecrire():
+        with open(f, "a") as fh:
+            fh.write("evenement\n")
+
+    timer = threading.Timer(0.1, ecrire)
+    timer.start()
+    data = json.loads(suivre_fichier(str(f), timeout=5))
+    timer.join()
+    assert data["contenu"] == "evenement\n"
+    assert data["attente_secondes"] < 2
+
+
+def test_suivre_fichier_ecriture_avant_surveillance(tmp_path, monkeypatch):
+    """Une ecriture juste avant la mise en place de la surveillance n'est pas manquee."""
+    from mon_mcp.tools import fichiers
+    f = tmp_path / "app.log"
+    f.write_text("")
+    fichiers.suivre_fichier(str(f))
+
+    def wait_file_change(path, timeout, recheck=None):
+        with open(f, "a") as fh:
+            fh.write("evenement\n")
+        if recheck is not None and recheck():
+            return True
+        time.sleep(timeout)
+        return False
+
+    monkeypatch.setattr(fichiers, "wait_file_change", wait_file_change)
+    data = json.loads(fichiers.suivre_fichier(str(f), timeout=5))
+    assert data["contenu"] == "evenement\n"
+    assert data["attente_secondes"] < 1
+
+
+def test_suivre_fichier_etat_borne(tmp_path, monkeypatch):
+    """Seuls les fichiers suivis le plus recemment sont memorises."""
+    from mon_mcp.tools import fichiers
+    monkeypatch.setattr(fichiers, "MAX_FOLLOWED_FILES", 2)
+    monkeypatch.setattr(fichiers, "_follow_state", OrderedDict())
+    for i in range(3):
+        f = tmp_path / f"app{i}.log"
+        f.write_text("x")
+        fichiers.suivre_fichier(str(f))
+    assert [os.path.basename(k) for k in fichiers._follow_state] == ["app1.log", "app2.log"]
+
+
+def test_lister_repertoire_pagination(tmp_path):
+    """Pagination par curseur sur une liste triee."""
+    for i in range(5):
+        (tmp_path / f"f{i}.txt").write_text("x" * i)
+
+    data = json.loads(lister_repertoire(str(tmp_path), limite=2))
+    assert [e["nom"] for e in data["contenu"]] == ["f0.txt", "f1.txt"]
+    assert data["curseur_suivant"] == 2
+
+    data = json.loads(lister_repertoire(str(tmp_path), limite=2, curseur=4))
+    assert [e["nom"] for e in data["contenu"]] == ["f4.txt"]
+    assert data["curseur_suivant"] is None
+
+
+def test_lister_repertoire_tri_taille(tmp_path):
+    """Tri par taille decroissante."""
+    (tmp_path / "petit.txt").write_text("a")
+    (tmp_path / "gros.txt").write_text("a" * 100)
+    (tmp_path / "moyen.txt").write_text("a" * 10)
+
+    data = json.loads(lister_repertoire(str(tmp_path), tri="taille", inverse=True))
+    assert [e["nom"] for e in data["contenu"]] == ["gros.txt", "moyen.txt", "petit.txt"]
+
+
+def test_copier_repertoire_parallele(tmp_path):
+    """Copie d'une arborescence (contenu et structure preserves)."""
+    src = tmp_path / "src"
+    (src / "a" / "b").mkdir(parents=True)
+    for i in range(20):
+        (src / "a" / f"f{i}.txt").write_text(f"contenu {i}")
+    (src / "a" / "b" / "gros.bin").write_bytes(bytes(range(256)) * 4096)
+
+    result = copier_fichier(str(src), str(tmp_path / "dst"), threads=4)
+    assert "21 fichiers copies" in result
+    assert (tmp_path / "dst" / "a" / "f7.txt").read_text() == "contenu 7"
+    assert (tmp_path / "dst" / "a" / "b" / "gros.bin").read_bytes() == bytes(range(256)) * 4096
+
+
+def test_copier_repertoire_synchroniser(tmp_path):
+    """En mode synchronisation, seuls les fichiers modifies sont recopies."""
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "stable.txt").write_text("stable")
+    (src / "modifie.txt").write_text("v1")
+    dst = str(tmp_path / "dst")
+    copier_fichier(str(src), dst)
+
+    assert "existe deja" in copier_fichier(str(src), dst)
+
+    (src / "modifie.txt").write_text("version 2")
+    result = copier_fichier(str(src), dst, synchroniser=True)
+    assert "1 fichiers copies" in result
+    assert "1 inchanges" in result
+    assert (tmp_path / "dst" / "modifie.txt").read_text() == "version 2"
+
+
+def test_copier_repertoire_dans_lui_meme(tmp_path):
+    """Copier un repertoire dans son propre sous-arbre est refuse."""
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "a.txt").write_text("a")
+
+    result = copier_fichier(str(src), str(src / "copie"))
+    assert result.startswith("Erreur")
+    assert not (src / "copie").exists()
+
+
+def test_copier_repli_si_copie_noyau_vide(tmp_path, monkeypatch):
+    """Si la copie noyau ne copie rien, le repli par tampon copie le contenu."""
+    from mon_mcp.tools import fichiers
+    monkeypatch.setattr(os, "copy_file_range", lambda *a: 0, raising=False)
+    monkeypatch.setattr(os, "sendfile", lambda *a: 0, raising=False)
+    src = tmp_path / "src.bin"
+    src.write_bytes(b"donnees" * 1000)
+
+    copied, method = fichiers._copy_file_data(str(src), str(tmp_path / "dst.bin"))
+    assert copied == 7000
+    assert method in ("reflink", "tampon")
+    assert (tmp_path / "dst.bin").read_bytes() == b"donnees" * 1000
+
+
+def test_operations_fichiers_lot(tmp_path):
+    """Execution d'un lot mixte d'operations."""
+    from mon_mcp.tools.fichiers import operations_fichiers_lot
+    (tmp_path / "a.txt").write_text("a")
+    (tmp_path / "b.txt").write_text("b")
+    (tmp_path / "c.txt").write_text("c")
+    sortie = tmp_path / "sortie"
+    ops = [
+        {"op": "mkdir", "chemin": str(sortie)},
+        {"op": "copier", "source": str(tmp_path / "a.txt"), "destination": str(sortie / "a.txt")},
+        {"op": "deplacer", "source": str(tmp_path / "b.txt"), "destination": str(sortie / "b.txt")},
+        {"op": "supprimer", "chemin": str(tmp_path / "c.txt")},
+        {"op": "supprimer", "chemin": str(tmp_path / "absent.txt")},
+    ]
+    data = json.loads(operations_fichiers_lot(json.dumps(ops)))
+    assert data["reussies"] == 4
+    assert data["statuts"][4].startswith("erreur")
+    assert (sortie / "b.txt").read_text() == "b"
+    assert not (tmp_path / "c.txt").exists()
+
+
+def test_operations_fichiers_lot_ordre(tmp_path):
+    """Des operations sur les memes chemins s'executent dans l'ordre du lot."""
+    from mon_mcp.tools.fichiers import _batch_waves, operations_fichiers_lot
+    a, b, c, x = (str(tmp_path / n) for n in ("a.txt", "b.txt", "c.txt", "x.txt"))
+    ops = [
+        {"op": "copier", "source": a, "destination": b},
+        {"op": "supprimer", "chemin": x},
+        {"op": "deplacer", "source": b, "destination": c},
+        {"op": "supprimer", "chemin": a},
+    ]
+    assert [len(w) for w in _batch_waves(ops)] == [2, 2]
+    for _ in range(5):
+        (tmp_path / "x.txt").write_text("x")
+        (tmp_path / "a.txt").write_text("a")
+        data = json.loads(operations_fichiers_lot(json.dumps(ops)))
+        assert data["reussies"] == 4, data["statuts"]
+        assert (tmp_path / "c.txt").read_text() == "a"
+        (tmp_path / "c.txt").unlink()
+
+
+def test_operations_fichiers_lot_validation(tmp_path):
+    """Un lot invalide n'execute aucune operation."""
+    from mon_mcp.tools.fichiers import operations_fichiers_lot
+    f = tmp_path / "garde.txt"
+    f.write_text("x")
+    ops = [
+        {"op": "supprimer", "chemin": str(f)},
+        {"op": "supprimer", "chemin": "/"},
+        {"op": "renommer", "chemin": "x"},
+    ]
+    data = json.loads(operations_fichiers_lot(json.dumps(ops)))
+    assert data["valide"] is False
+    assert [e[0] for e in data["erreurs"]] == [1, 2]
+    assert f.exists()
+
+
+def test_ecrire_fichier_ajout_et_position(tmp_path):
+    """Modes ajouter et ecriture a une position."""
+    f = tmp_path / "log.txt"
+    ecrire_fichier(str(f), "abcdef")
+    ecrire_fichier(str(f), "gh", mode="ajouter")
+    ecrire_fichier(str(f), "XY", position=2)
+    assert f.read_text() == "abXYefgh"
+
+
+def test_ecrire_fichier_atomique(tmp_path):
+    """L'ecriture atomique remplace le fichier sans laisser de temporaire."""
+    f = tmp_path / "config.json"
+    f.write_text("ancien")
+    result = ecrire_fichier(str(f), "nouveau", atomique=True)
+    assert "ecrit" in result
+    assert f.read_text() == "nouveau"
+    assert [p.name for p in tmp_path.iterdir()] == ["config.json"]
+
+
+def test_session_ecriture(tmp_path):
+    """Ecriture par morceaux: rien n'est visible avant validation."""
+    from mon_mcp.tools.fichiers import ajouter_ecriture, ouvrir_ecriture, valider_ecriture
+    f = tmp_path / "gros.txt"
+    session = json.loads(ouvrir_ecriture(str(f), encodage="utf-8-sig"))["session"]
+    for i in range(3):
+        ajouter_ecriture(session, f"ligne é{i}\n")
+    assert not f.exists()
+    data = json.loads(valider_ecriture(session))
+    assert data["morceaux"] == 3
+    assert f.read_bytes().count(b"\xef\xbb\xbf") == 1
+    assert f.read_text(encoding="utf-8-sig") == "ligne é0\nligne é1\nligne é2\n"
+
+
+def test_session_ecriture_annulee(tmp_path):
+    """Annuler une session atomique laisse la cible intacte."""
+    from mon_mcp.tools.fichiers import ajouter_ecriture, annuler_ecriture, ouvrir_ecriture
+    f = tmp_path / "garde.txt"
+    f.write_text("original")
+    session = json.loads(ouvrir_ecriture(str(f), mode="ajouter"))["session"]
+    ajouter_ecriture(session, " + suite")
+    assert json.loads(annuler_ecriture(session))["annulee"] is True
+    assert f.read_text() == "original"
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_session_ecriture_expiree(tmp_path, monkeypatch):
+    """Une session inactive est fermee et son temporaire supprime."""
+    from mon_mcp.tools import fichiers
+    f = tmp_path / "abandon.txt"
+    session = json.loads(fichiers.ouvrir_ecriture(str(f)))["session"]
+    fichiers.ajouter_ecriture(session, "debut")
+    assert len(list(tmp_path.iterdir())) == 1
+
+    monkeypatch.setattr(fichiers, "WRITE_SESSION_IDLE_TIMEOUT", 0.0)
+    time.sleep(0.01)
+    assert "erreur" in json.loads(fichiers.ajouter_ecriture(session, "suite"))
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_lire_binaire(tmp_path):
+    """Lecture d'une portion binaire et detection du type."""
+    import base64
+
+    from mon_mcp.tools.fichiers import lire_binaire
+    f = tmp_path / "image.png"
+    data = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 4
+    f.write_bytes(data)
+
+    result = json.loads(lire_binaire(str(f), debut=8, nb_octets=16))
+    assert result["type"] == "image/png"
+    assert base64.b64decode(result["donnees"]) == data[8:24]
+    assert result["tronque"] is True
+
+    result = json.loads(lire_binaire(str(f), debut=-4, encodage_sortie="hex"))
+    assert result["debut"] == len(data) - 4
+    assert result["donnees"].startswith(f"{len(data) - 4:08x}  fc fd fe ff")
+    assert result["tronque"] is False
+
+
+def test_lire_binaire_texte(tmp_path):
+    """Un fichier texte UTF-8 est reconnu comme text/plain."""
+    from mon_mcp.tools.fichiers import lire_binaire
+    f = tmp_path / "notes.txt"
+    f.write_text("héllo")
+    assert json.loads(lire_binaire(str(f), nb_octets=0))["type"] == "text/plain"
+
+
+def test_lire_binaire_documents_office(tmp_path):
+    """Le type d'une archive zip vient de ses entrees, pas des 512 premiers octets."""
+    import zipfile
+
+    from mon_mcp.tools.fichiers import lire_binaire
+    f = tmp_path / "rapport.docx"
+    with zipfile.ZipFile(f, "w") as zf:
+        zf.writestr("[Content_Types].xml", "<Types>" + "x" * 2000 + "</Types>")
+        zf.writestr("_rels/.rels", "<Relationships/>")
+        zf.writestr("word/document.xml", "<w:document/>")
+    assert b"word/" not in f.read_bytes()[:512]
+    result = json.loads(lire_binaire(str(f), nb_octets=0))
+    assert result["type"].endswith("officedocument.wordprocessingml.document")
+
+    f = tmp_path / "livre.epub"
+    with zipfile.ZipFile(f, "w") as zf:
+        zf.writestr("mimetype", "application/epub+zip")
+        zf.writestr("META-INF/container.xml", "<container/>")
+    assert json.loads(lire_binaire(str(f), nb_octets=0))["type"] == "application/epub+zip"
+
+    f = tmp_path / "archive.zip"
+    with zipfile.ZipFile(f, "w") as zf:
+        zf.writestr("notes.txt", "x")
+    assert json.loads(lire_binaire(str(f), nb_octets=0))["type"] == "application/zip"
+
+
+def test_detection_signatures_courtes():
+    """Les signatures "BM" et "MZ" sont confirmees par la structure de l'en-tete."""
+    from mon_mcp.tools.fichiers import _detect_type
+    assert _detect_type(b"BMW et MZ: notes de reunion") == "text/plain"
+    assert _detect_type(b"MZ" + b"x" * 100) == "text/plain"
+
+    bmp = b"BM" + (70).to_bytes(4, "little") + bytes(8) + (40).to_bytes(4, "little") + bytes(52)
+    assert _detect_type(bmp) == "image/bmp"
+    exe = bytearray(256)
+    exe[:2] = b"MZ"
+    exe[0x3C:0x40] = (0x80).to_bytes(4, "little")
+    exe[0x80:0x84] = b"PE\0\0"
+    assert _detect_type(bytes(exe)) == "application/x-msdownload"
@@ -0,0 +1,90 @@
+"""Tests pour les outils de hachage et de detection de doublons."""
+
+import hashlib
+import json
+
+from mon_mcp.tools.hachage import PARTIAL_BLOCK, hacher_fichiers, trouver_doublons
+
+
+def test_hacher_fichiers(tmp_path):
+    """Empreintes d'un dossier, chemins relatifs."""
+    (tmp_path / "a.txt").write_bytes(b"alpha")
+    (tmp_path / "sous").mkdir()
+    (tmp_path / "sous" / "b.txt").write_bytes(b"beta")
+
+    data = json.loads(hacher_fichiers(str(tmp_path), algorithme="md5"))
+    assert data["fichiers"] == 2
+    assert data["empreintes"]["a.txt"] == hashlib.md5(b"alpha").hexdigest()
+
+
+def test_hacher_algorithme_inconnu(tmp_path):
+    data = json.loads(hacher_fichiers(str(tmp_path), algorithme="crc"))
+    assert "erreur" in data
+
+
+def test_trouver_doublons(tmp_path):
+    """Seuls les contenus identiques sont regroupes, y compris pour les gros fichiers."""
+    gros = b"x" * (3 * PARTIAL_BLOCK)
+    # Meme debut et meme fin, milieu different: l'empreinte complete tranche
+    variante = b"x" * PARTIAL_BLOCK + b"y" * PARTIAL_BLOCK + b"x" * PARTIAL_BLOCK
+    (tmp_path / "g1.bin").write_bytes(gros)
+    (tmp_path / "g2.bin").write_bytes(gros)
+    (tmp_path / "g3.bin").write_bytes(variante)
+    (tmp_path / "p1.txt").write_text("meme")
+    (tmp_path / "p2.txt").write_text("meme")
+    (tmp_path / "autre.txt").write_text("diff")
+
+    data = json.loads(trouver_doublons(str(tmp_path)))
+    groupes = {tuple(g["fichiers"]) for g in data["groupes"]}
+    assert groupes == {("g1.bin", "g2.bin"), ("p1.txt", "p2.txt")}
+    assert data["fichiers_en_double"] == 2
+    assert data["groupes"][0]["taille"] == len(gros)
+
+
+def test_comparer_repertoires(tmp_path):
+    """Ajouts, suppressions et modifications; dossier ajoute signale une seule fois."""
+    import os
+
+    from mon_mcp.tools.hachage import comparer_repertoires
+
+    a, b = tmp_path / "a", tmp_path / "b"
+    for root in (a, b):
+        root.mkdir()
+        (root / "same.txt").write_text("x")
+        (root / "taille.txt").write_text("court" if root == a else "plus long")
+    (a / "parti.txt").write_text("bye")
+    (b / "nouveau").mkdir()
+    (b / "nouveau" / "f.txt").write_text("f")
+    (a / "date.txt").write_text("abc")
+    (b / "date.txt").write_text("abc")
+    os.utime(b / "date.txt", (0, 0))
+    for f in ("same.txt", "taille.txt"):
+        st = os.stat(a / f)
+        os.utime(b / f, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    data = json.loads(comparer_repertoires(str(a), str(b)))
+    assert data["ajoutes"] == ["nouveau"]
+    assert data["supprimes"] == ["parti.txt"]
+    assert data["modifies"] == [["date.txt", "date"], ["taille.txt", "taille"]]
+    assert data["identiques"] == 1
+
+    data = json.loads(comparer_repertoires(str(a), str(b), contenu=True))
+    assert data["modifies"] == [["taille.txt", "taille"]]
+    assert data["identiques"] == 2
+
+
+def test_comparer_repertoires_contenu_meme_date(tmp_path):
+    """Avec contenu=True, meme taille et meme date n'evitent pas la comparaison."""
+    import os
+
+    from mon_mcp.tools.hachage import comparer_repertoires
+
+    a, b = tmp_path / "a", tmp_path / "b"
+    for root, text in ((a, "avant"), (b, "apres")):
+        root.mkdir()
+        (root / "f.txt").write_text(text)
+        os.utime(root / "f.txt", (1_000_000, 1_000_000))
+
+    assert json.loads(comparer_repertoires(str(a), str(b)))["identiques"] == 1
+    data = json.loads(comparer_repertoires(str(a), str(b), contenu=True))
+    assert data["modifies"] == [["f.txt", "contenu"]]
@@ -0,0 +1,84 @@
+"""Tests pour la recherche floue de fichiers par nom."""
+
+import json
+import os
+import time
+
+from mon_mcp import config
+from mon_mcp.tools import index_chemins
+
+
+def _arbre(tmp_path):
+    docs = tmp_path / "docs"
+    (docs / "finances" / "2024").mkdir(parents=True)
+    (docs / "finances" / "2024" / "rapport_budget.xlsx").write_text("x")
+    (docs / "compte_rendu_reunion.docx").write_text("x")
+    (docs / "budget_notes.txt").write_text("x")
+    (docs / "node_modules").mkdir()
+    (docs / "node_modules" / "rapport_budget.js").write_text("x")
+    return docs
+
+
+def test_trouver_fichier(tmp_path, monkeypatch):
+    """Mots dans le chemin, sous-sequences, dossiers lourds ignores."""
+    monkeypatch.setattr(config, "INDEX_DIR", str(tmp_path / "index"))
+    monkeypatch.setattr(index_chemins, "_path_indexes", {})
+    docs = _arbre(tmp_path)
+
+    data = json.loads(index_chemins.trouver_fichier("rapport budget 2024", racines=str(docs)))
+    assert data["index"][0]["construit"] is True
+    assert [os.path.basename(r["chemin"]) for r in data["resultats"]] == ["rapport_budget.xlsx"]
+
+    data = json.loads(index_chemins.trouver_fichier("cptrendu", racines=str(docs)))
+    assert os.path.basename(data["resultats"][0]["chemin"]) == "compte_rendu_reunion.docx"
+
+    data = json.loads(index_chemins.trouver_fichier("budget", racines=str(docs), extensions=".txt"))
+    assert [os.path.basename(r["chemin"]) for r in data["resultats"]] == ["budget_notes.txt"]
+
+
+def test_trouver_fichier_rafraichi(tmp_path, monkeypatch):
+    """Les dossiers modifies sont relus et l'index est recharge depuis le disque."""
+    monkeypatch.setattr(config, "INDEX_DIR", str(tmp_path / "index"))
+    monkeypatch.setattr(index_chemins, "_path_indexes", {})
+    docs = _arbre(tmp_path)
+    index_chemins.trouver_fichier("budget", racines=str(docs))
+
+    nouveau = docs / "finances" / "nouveau"
+    nouveau.mkdir()
+    (nouveau / "facture_mars.pdf").write_text("x")
+    os.utime(docs / "finances", ns=(time.time_ns(), time.time_ns() + 10**9))
+    (docs / "budget_notes.txt").unlink()
+
+    data = json.loads(index_chemins.trouver_fichier("facture", racines=str(docs), rafraichir=True))
+    assert os.path.basename(data["resultats"][0]["chemin"]) == "facture_mars.pdf"
+    data = json.loads(index_chemins.trouver_fichier("notes", racines=str(docs)))
+    assert data["resultats"] == []
+
+    # Nouveau processus: l'index sauvegarde est recharge sans reconstruction
+    monkeypatch.setattr(index_chemins, "_path_indexes", {})
+    data = json.loads(index_chemins.trouver_fichier("facture", racines=str(docs)))
+    assert "construit" not in data["index"][0]
+    assert data["correspondances"] == 1
+
+
+def test_trouver_fichier_requete_vide(tmp_path):
+    """Une requete vide est refusee."""
+    assert "erreur" in json.loads(index_chemins.trouver_fichier("  ", racines=str(tmp_path)))
+
+
+def test_instantane_index_immuable(tmp_path, monkeypatch):
+    """Un rafraichissement remplace l'instantane sans modifier celui deja lu."""
+    monkeypatch.setattr(config, "INDEX_DIR", str(tmp_path / "index"))
+    monkeypatch.setattr(index_chemins, "_path_indexes", {})
+    docs = _arbre(tmp_path)
+    root = os.path.normcase(os.path.abspath(docs))
+    avant, _ = index_chemins._get_index(root, False)
+    paths, blob, offsets = avant
+
+    (docs / "finances" / "ajout.txt").write_text("x")
+    os.utime(docs / "finances", ns=(time.time_ns(), time.time_ns() + 10**9))
+    apres, _ = index_chemins._get_index(root, True)
+
+    assert apres is not avant and len(apres[0]) == len(paths) + 1
+    assert avant == (paths, blob, offsets) and len(offsets) == len(paths)
+    assert isinstance(paths, tuple) and isinstance(offsets, tuple)
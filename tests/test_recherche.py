@@ -1,6 +1,8 @@
 """Tests pour les outils de recherche de fichiers."""
 
 import json
+import os
+import time
 
 from mon_mcp.tools.recherche import rechercher_fichiers
 
@@ -53,3 +55,238 @@ def test_recherche_dossier_inexistant():
     """Test avec un dossier qui n'existe pas."""
     result = rechercher_fichiers("C:\\dossier_inexistant_xyz")
     assert "n'existe pas" in result
+
+
+def test_recherche_filtres_metadonnees_et_tri(tmp_path):
+    """Taille, date, categorie et tri appliques pendant le parcours."""
+    now = time.time()
+    for name, size, age_days in [("petit.txt", 10, 1), ("moyen.pdf", 5000, 3),
+                                 ("gros.pdf", 200_000, 30), ("photo.jpg", 80_000, 2)]:
+        path = tmp_path / name
+        path.write_bytes(b"a" * size)
+        os.utime(path, (now - age_days * 86400, now - age_days * 86400))
+
+    data = json.loads(rechercher_fichiers(str(tmp_path), taille_min="4 Ko", tri="plus_gros"))
+    assert [r["nom"] for r in data["resultats"]] == ["gros.pdf", "photo.jpg", "moyen.pdf"]
+
+    data = json.loads(rechercher_fichiers(str(tmp_path), modifie_apres="7j", categorie="document",
+                                          tri="plus_recent"))
+    assert [r["nom"] for r in data["resultats"]] == ["petit.txt", "moyen.pdf"]
+
+    data = json.loads(rechercher_fichiers(str(tmp_path), tri="nom", max_resultats=2))
+    assert [r["nom"] for r in data["resultats"]] == ["gros.pdf", "moyen.pdf"]
+    assert data["limite_atteinte"] is True
+
+    assert "taille invalide" in rechercher_fichiers(str(tmp_path), taille_max="beaucoup")
+    assert "tri inconnu" in rechercher_fichiers(str(tmp_path), tri="hasard")
+
+
+def test_recherche_avec_index(tmp_path, monkeypatch):
+    """L'index restreint les fichiers lus et reste exact apres modification."""
+    from mon_mcp import config
+    from mon_mcp.tools import index_recherche
+
+    monkeypatch.setattr(config, "INDEX_DIR", str(tmp_path / "index"))
+    docs = tmp_path / "docs"
+    (docs / "sous").mkdir(parents=True)
+    (docs / "a.txt").write_text("Budget previsionnel 2024")
+    (docs / "sous" / "b.txt").write_text("Compte rendu de reunion")
+    (docs / "c.txt").write_text("rien")
+
+    data = json.loads(index_recherche.indexer_dossier(str(docs)))
+    assert data["ajoutes"] == 3
+
+    data = json.loads(rechercher_fichiers(str(docs), contenu="BUDGET"))
+    assert data["index_utilise"] is not None
+    assert [r["nom"] for r in data["resultats"]] == ["a.txt"]
+
+    # Fichier modifie apres indexation: relu malgre l'index
+    (docs / "c.txt").write_text("budget revu")
+    os.utime(docs / "c.txt", (1, 1))
+    data = json.loads(rechercher_fichiers(str(docs), contenu="budget"))
+    assert sorted(r["nom"] for r in data["resultats"]) == ["a.txt", "c.txt"]
+
+    data = json.loads(index_recherche.indexer_dossier(str(docs)))
+    assert (data["ajoutes"], data["mis_a_jour"], data["supprimes"]) == (0, 1, 0)
+
+    etat = json.loads(index_recherche.etat_index(str(docs / "sous")))
+    assert etat["indexe"] is True and etat["fichiers"] == 3
+    assert json.loads(index_recherche.supprimer_index(str(docs)))["supprime"] is True
+    assert json.loads(index_recherche.etat_index(str(docs)))["indexe"] is False
+
+
+def test_index_binaires_et_sous_dossier(tmp_path, monkeypatch):
+    """Les binaires sont indexes sans trigrammes; un sous-dossier ne charge que ses fichiers."""
+    from mon_mcp import config
+    from mon_mcp.tools import index_recherche
+
+    monkeypatch.setattr(config, "INDEX_DIR", str(tmp_path / "index"))
+    docs = tmp_path / "docs"
+    (docs / "sous").mkdir(parents=True)
+    (docs / "sous-dossier").mkdir()
+    (docs / "image.bin").write_bytes(b"\x00budget" * 100)
+    (docs / "sous" / "a.txt").write_text("budget")
+    (docs / "sous-dossier" / "b.txt").write_text("budget")
+    index_recherche.indexer_dossier(str(docs))
+
+    lookup = index_recherche._index_candidates(str(docs), ["budget", "ab"])
+    assert str(docs / "image.bin") in lookup["indexes"]
+    assert str(docs / "image.bin") not in lookup["candidats"][0]
+    assert lookup["candidats"][1] is None
+
+    lookup = index_recherche._index_candidates(str(docs / "sous"), ["budget"])
+    assert list(lookup["indexes"]) == [str(docs / "sous" / "a.txt")]
+    data = json.loads(rechercher_fichiers(str(docs / "sous"), contenu="budget"))
+    assert [r["nom"] for r in data["resultats"]] == ["a.txt"]
+
+
+def test_trigrammes_par_blocs(monkeypatch):
+    """Les trigrammes a cheval sur deux blocs ne sont pas perdus."""
+    from mon_mcp.tools import index_recherche
+
+    monkeypatch.setattr(index_recherche, "TRIGRAM_CHUNK_SIZE", 4)
+    data = b"abcdefghijklm"
+    attendu = {data[i:i + 3] for i in range(len(data) - 2)}
+    assert index_recherche._trigrams(data) == attendu
+    assert index_recherche._trigrams(b"ab") == set()
+    assert index_recherche._trigrams(b"abc") == {b"abc"}
+
+
+def test_recherche_contenu_parallele_ordonnee(tmp_path):
+    """Resultats dans l'ordre du parcours, binaires ignores, arret a la limite."""
+    for i in range(40):
+        (tmp_path / f"f{i:02d}.txt").write_text(f"ligne 1\nligne 2\nCLE numero {i}\n")
+    (tmp_path / "binaire.bin").write_bytes(b"\x00\x01cle")
+    (tmp_path / "accent.txt").write_text("Déjà vu\nÉTÉ indien\n")
+
+    data = json.loads(rechercher_fichiers(str(tmp_path), contenu="cle", max_resultats=100,
+                                          threads=4))
+    noms = [r["nom"] for r in data["resultats"]]
+    assert len(noms) == 40 and "binaire.bin" not in noms
+    assert {r["ligne_trouvee"] for r in data["resultats"]} == {3}
+    data = json.loads(rechercher_fichiers(str(tmp_path), contenu="cle", max_resultats=100))
+    assert [r["nom"] for r in data["resultats"]] == noms
+
+    data = json.loads(rechercher_fichiers(str(tmp_path), contenu="cle", max_resultats=5))
+    assert data["nombre_resultats"] == 5 and data["limite_atteinte"] is True
+
+    data = json.loads(rechercher_fichiers(str(tmp_path), contenu="été"))
+    assert [(r["nom"], r["ligne_trouvee"]) for r in data["resultats"]] == [("accent.txt", 2)]
+
+
+def test_recherche_multi_termes(tmp_path):
+    """Termes combines en et/ou, avec exclusion."""
+    (tmp_path / "a.txt").write_text("budget 2024\nvalide")
+    (tmp_path / "b.txt").write_text("budget 2023")
+    (tmp_path / "c.txt").write_text("bilan 2024 brouillon")
+
+    def noms(**kwargs):
+        data = json.loads(rechercher_fichiers(str(tmp_path), **kwargs))
+        return sorted(r["nom"] for r in data["resultats"])
+
+    assert noms(termes='["budget", "2024"]') == ["a.txt"]
+    assert noms(termes='["budget", "bilan"]', operateur="ou") == ["a.txt", "b.txt", "c.txt"]
+    assert noms(contenu="2024", exclure='["brouillon"]') == ["a.txt"]
+    assert noms(contenu=r"budget 20\d\d", regex=True) == ["a.txt", "b.txt"]
+
+
+def test_recherche_occurrences_contexte(tmp_path):
+    """Toutes les lignes trouvees, comptage et lignes de contexte."""
+    (tmp_path / "log.txt").write_text(
+        "debut\nERREUR disque\nok\nok\nerreur reseau, erreur dns\nfin\n"
+    )
+
+    data = json.loads(rechercher_fichiers(str(tmp_path), contenu="erreur", contexte=1))
+    result = data["resultats"][0]
+    assert result["nb_occurrences"] == 3
+    assert [o["ligne"] for o in result["occurrences"]] == [2, 5]
+    assert result["occurrences"][0] == {
+        "ligne": 2, "texte": "ERREUR disque", "avant": ["debut"], "apres": ["ok"],
+    }
+    assert result["occurrences"][1]["apres"] == ["fin"]
+
+
+def test_recherche_regex_invalide(tmp_path):
+    result = rechercher_fichiers(str(tmp_path), contenu="(", regex=True)
+    assert result.startswith("Erreur")
+
+
+def test_session_recherche(tmp_path):
+    """Recherche en arriere-plan lue par pages avec un curseur."""
+    from mon_mcp.tools.recherche import annuler_recherche, demarrer_recherche, resultats_recherche
+    for i in range(25):
+        (tmp_path / f"f{i:02d}.txt").write_text("cible" if i % 2 == 0 else "autre")
+
+    session = json.loads(demarrer_recherche(str(tmp_path), contenu="cible"))["session"]
+    noms, curseur = [], 0
+    while True:
+        page = json.loads(resultats_recherche(session, curseur=curseur, limite=5, attente=5))
+        noms += [r["nom"] for r in page["resultats"]]
+        curseur = page["curseur_suivant"]
+        if page["termine"] and curseur >= page["nombre_trouves"]:
+            break
+    assert sorted(noms) == [f"f{i:02d}.txt" for i in range(0, 25, 2)]
+
+    assert json.loads(annuler_recherche(session))["annulee"] is True
+    assert "erreur" in json.loads(resultats_recherche(session))
+    assert "erreur" in json.loads(demarrer_recherche(str(tmp_path / "absent")))
+
+
+def test_annuler_recherche_abandonne_lectures(tmp_path, monkeypatch):
+    """Apres annulation, les lectures en attente ne sont pas executees."""
+    import threading
+    import time
+
+    from mon_mcp.tools import recherche
+    for i in range(200):
+        (tmp_path / f"f{i:03d}.txt").write_text("cible")
+    lues = []
+    debloque = threading.Event()
+    scan_file = recherche._scan_file
+
+    def scan_lent(filepath, *args):
+        lues.append(filepath)
+        debloque.wait(5)
+        return scan_file(filepath, *args)
+
+    monkeypatch.setattr(recherche, "_scan_file", scan_lent)
+    session = json.loads(recherche.demarrer_recherche(str(tmp_path), contenu="cible",
+                                                      threads=2))["session"]
+    time.sleep(0.2)
+    recherche.annuler_recherche(session)
+    debloque.set()
+    time.sleep(0.3)
+    assert len(lues) <= 4
+
+
+def test_annuler_recherche_arrete_parcours(tmp_path, monkeypatch):
+    """Apres annulation, le parcours de l'arborescence s'arrete aussi."""
+    import threading
+
+    from mon_mcp.tools import recherche
+    for i in range(20):
+        (tmp_path / f"d{i:02d}").mkdir()
+        for j in range(50):
+            (tmp_path / f"d{i:02d}" / f"f{j:02d}.txt").write_text("cible")
+    walk = recherche.walk
+
+    for criteres in ({"motif": "*.txt"}, {"contenu": "cible"}):
+        parcourus = []
+        annulee = threading.Event()
+
+        def walk_compte(*args, **kwargs):
+            for item in walk(*args, **kwargs):
+                parcourus.append(item)
+                if len(parcourus) == 10:
+                    annulee.wait(5)
+                yield item
+
+        monkeypatch.setattr(recherche, "walk", walk_compte)
+        session = json.loads(recherche.demarrer_recherche(str(tmp_path), **criteres))["session"]
+        debut = time.time()
+        while len(parcourus) < 10 and time.time() - debut < 5:
+            time.sleep(0.01)
+        recherche.annuler_recherche(session)
+        annulee.set()
+        time.sleep(0.3)
+        assert len(parcourus) <= 11
@@ -11,7 +11,7 @@ def test_ping():
 
 
 def test_all_tools_registered():
-    """Verifie que tous les 58 outils sont enregistres."""
+    """Verifie que tous les 84 outils sont enregistres."""
     tools = list(mcp._tool_manager._tools.keys())
     expected = [
         "ping",
@@ -22,10 +22,13 @@ def test_all_tools_registered():
         # Clavier
         "ecrire_texte", "touche_clavier",
         # Fenetres
-        "liste_fenetres", "focus_fenetre",
+        "liste_fenetres", "focus_fenetre", "chercher_fenetres", "attendre_fenetre",
         # Fichiers
-        "lire_fichier", "ecrire_fichier", "copier_fichier", "deplacer_fichier",
-        "supprimer_fichier", "lister_repertoire", "info_fichier", "creer_repertoire",
+        "lire_fichier", "suivre_fichier", "lire_binaire", "ecrire_fichier", "ouvrir_ecriture",
+        "ajouter_ecriture", "valider_ecriture", "annuler_ecriture", "copier_fichier",
+        "deplacer_fichier",
+        "supprimer_fichier", "operations_fichiers_lot", "lister_repertoire", "info_fichier",
+        "creer_repertoire",
         # Systeme
         "liste_processus", "info_systeme", "tuer_processus",
         # Notification
@@ -35,7 +38,10 @@ def test_all_tools_registered():
         # Lanceur
         "lancer_app", "ouvrir_url",
         # Recherche
-        "rechercher_fichiers",
+        "rechercher_fichiers", "demarrer_recherche", "resultats_recherche", "annuler_recherche",
+        "indexer_dossier", "etat_index", "supprimer_index", "trouver_fichier",
+        # Hachage
+        "hacher_fichiers", "trouver_doublons", "comparer_repertoires",
         # OCR
         "ocr_image", "ocr_ecran",
         # Excel/CSV
@@ -52,7 +58,12 @@ def test_all_tools_registered():
         "creer_word", "creer_powerpoint", "creer_pdf",
         # Context
         "definir_contexte", "obtenir_contexte", "supprimer_contexte", "sauvegarder_contexte",
+        # Enregistrement
+        "demarrer_enregistrement", "point_controle_enregistrement",
+        "arreter_enregistrement", "rejouer_enregistrement",
+        # Attente
+        "attendre_pixel", "attendre_changement", "attendre_texte_ecran",
     ]
     for name in expected:
         assert name in tools, f"Outil manquant: {name}"
-    assert len(tools) == 58
+    assert len(tools) == 84
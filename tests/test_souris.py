@@ -0,0 +1,57 @@
+"""Tests pour le moteur de deplacement de la souris."""
+
+import time
+
+import pytest
+
+from mon_mcp.tools import souris
+
+
+@pytest.fixture
+def curseur(monkeypatch):
+    """Remplace le curseur systeme par une position simulee."""
+    state = {"pos": (0, 0), "moves": []}
+
+    def set_pos(x, y):
+        state["pos"] = (x, y)
+        state["moves"].append((x, y))
+
+    monkeypatch.setattr(souris, "get_cursor_pos", lambda: state["pos"])
+    monkeypatch.setattr(souris, "set_cursor_pos", set_pos)
+    return state
+
+
+@pytest.mark.parametrize("courbe", list(souris.EASING_CURVES))
+def test_courbes_bornes(courbe):
+    """Chaque courbe part de 0 et arrive a 1."""
+    ease = souris.EASING_CURVES[courbe]
+    assert ease(0.0) == pytest.approx(0.0)
+    assert ease(1.0) == pytest.approx(1.0)
+
+
+def test_deplacement_atteint_la_cible(curseur):
+    """Le mouvement se termine exactement sur la cible."""
+    result = souris.deplacer_souris(300, 150, duree=0.1, courbe="douce")
+    assert "deplacee" in result
+    assert curseur["pos"] == (300, 150)
+
+
+def test_deplacement_duree_respectee(curseur):
+    """La duree reelle ne derive pas avec le nombre d'etapes."""
+    start = time.monotonic()
+    souris._smooth_move(1000, 0, 0.2)
+    elapsed = time.monotonic() - start
+    assert 0.19 <= elapsed < 0.35
+
+
+def test_deplacement_evenements_regroupes(curseur):
+    """Pas plus d'un evenement par pixel parcouru, aucun doublon."""
+    events = souris._smooth_move(5, 0, 0.1)
+    assert events <= 5
+    assert len(set(curseur["moves"])) == len(curseur["moves"])
+
+
+def test_courbe_inconnue(curseur):
+    """Une courbe inconnue est refusee."""
+    result = souris.deplacer_souris(10, 10, courbe="rebond")
+    assert "inconnue" in result
@@ -0,0 +1,54 @@
+"""Tests pour le parcours d'arborescences partage (walker)."""
+
+from mon_mcp.walker import compile_rules, is_ignored, walk
+
+
+def _files(root, **kwargs):
+    """Chemins relatifs tries produits par walk()."""
+    return sorted(rel for _, rel in walk(str(root), **kwargs))
+
+
+def _tree(root, paths):
+    for rel in paths:
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x")
+
+
+def test_regles_gitignore():
+    """Ancrage, dossiers seuls, jokers et negation."""
+    rules = compile_rules(["*.log", "!garder.log", "/dist", "cache/", "docs/**/brouillon*"])
+    assert is_ignored("a/b/app.log", False, rules)
+    assert not is_ignored("a/garder.log", False, rules)
+    assert is_ignored("dist", True, rules)
+    assert not is_ignored("src/dist", True, rules)
+    assert is_ignored("src/cache", True, rules)
+    assert not is_ignored("src/cache", False, rules)
+    assert is_ignored("docs/2024/q1/brouillon_v2.txt", False, rules)
+
+
+def test_walk_gitignore_et_dossiers_lourds(tmp_path):
+    _tree(tmp_path, [
+        "main.py", "debug.log", "node_modules/lib/index.js", "build/out.o",
+        "sous/.gitignore", "sous/secret.txt", "sous/ok.txt", ".cache/x",
+    ])
+    (tmp_path / ".gitignore").write_text("*.log\n")
+    (tmp_path / "sous" / ".gitignore").write_text("secret.txt\n")
+
+    assert _files(tmp_path) == [".gitignore", "main.py", "sous/.gitignore", "sous/ok.txt"]
+    assert _files(tmp_path, exclure=["sous/", ".*"]) == ["main.py"]
+    assert "node_modules/lib/index.js" in _files(tmp_path, filtrer_ignores=False)
+    assert "debug.log" in _files(tmp_path, filtrer_ignores=False)
+
+
+def test_recherche_respecte_gitignore(tmp_path):
+    import json
+
+    from mon_mcp.tools.recherche import rechercher_fichiers
+
+    _tree(tmp_path, ["src/app.txt", "node_modules/pkg/app.txt", "logs/app.txt"])
+    (tmp_path / ".gitignore").write_text("logs/\n")
+    data = json.loads(rechercher_fichiers(str(tmp_path), motif="app*"))
+    assert [r["nom"] for r in data["resultats"]] == ["app.txt"]
+    data = json.loads(rechercher_fichiers(str(tmp_path), motif="app*", ignorer="src/"))
+    assert data["nombre_resultats"] == 0